@@ -0,0 +1,151 @@
+"""Fetch just enough Git history in a shallow clone to reach the Graylint baseline
+
+``actions/checkout`` fetches only the latest commit by default. Graylint needs the
+baseline revision, and for ``rev1...rev2`` ranges the merge base of the two revisions,
+in local history. Instead of requiring ``fetch-depth: 0`` to fetch the whole history,
+the shallow clone is deepened step by step, doubling the depth each time, until the
+baseline is found.
+
+In a partial clone, e.g. with ``filter: blob:none`` in ``actions/checkout``, fetching
+only adds commits and trees. File contents are then downloaded only for the paths which
+Graylint checks out for the baseline.
+
+"""
+
+from __future__ import annotations
+
+import re
+from subprocess import CompletedProcess, run  # nosec
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+INITIAL_DEPTH = 16
+MAX_STEPS = 16
+COMMIT_HASH_RE = re.compile(r"[0-9a-f]{7,40}")
+RELATIVE_SUFFIX_RE = re.compile(r"[~^].*$")
+
+
+def _git(args: list[str], cwd: Path) -> CompletedProcess[str]:
+    """Run a Git command, capturing its output
+
+    :param args: The Git command and arguments, without ``git``
+    :param cwd: The working directory for Git
+    :return: The completed process
+
+    """
+    return run(  # noqa: S603  # nosec
+        ["git", *args],  # noqa: S607
+        cwd=cwd,
+        check=False,
+        capture_output=True,
+        encoding="utf-8",
+    )
+
+
+def split_revision_range(revision: str) -> tuple[str, str, bool]:
+    """Split a Graylint revision range into the baseline and the compared revision
+
+    >>> split_revision_range("main...")
+    ('main', 'HEAD', True)
+    >>> split_revision_range("v1.0..feature")
+    ('v1.0', 'feature', False)
+    >>> split_revision_range("HEAD^")
+    ('HEAD^', 'HEAD', False)
+
+    :param revision: The ``-r`` / ``--revision`` option value for Graylint
+    :return: The baseline revision, the compared revision, and ``True`` if the merge
+             base of the two is used as the baseline
+
+    """
+    for separator, use_merge_base in [("...", True), ("..", False)]:
+        rev1, found, rev2 = revision.partition(separator)
+        if found:
+            return rev1 or "HEAD", rev2 or "HEAD", use_merge_base
+    return revision, "HEAD", False
+
+
+def has_baseline(revision: str, cwd: Path) -> bool:
+    """Return ``True`` if the baseline of a revision range is in local history
+
+    :param revision: The ``-r`` / ``--revision`` option value for Graylint
+    :param cwd: The root of the Git repository
+    :return: ``True`` if the baseline commit, or the merge base, can be found
+
+    """
+    rev1, rev2, use_merge_base = split_revision_range(revision)
+    if use_merge_base:
+        return _git(["merge-base", rev1, rev2], cwd).returncode == 0
+    return (
+        _git(["rev-parse", "--verify", "--quiet", f"{rev1}^{{commit}}"], cwd).returncode
+        == 0
+    )
+
+
+def is_shallow(cwd: Path) -> bool:
+    """Return ``True`` if the Git repository is a shallow clone
+
+    :param cwd: The root of the Git repository
+    :return: ``True`` if some history is missing from the clone
+
+    """
+    output = _git(["rev-parse", "--is-shallow-repository"], cwd).stdout
+    return output.strip() == "true"
+
+
+def _make_refspec(revision: str) -> str:
+    """Make a refspec for fetching a revision from the remote under the same name
+
+    :param revision: A commit hash, a branch name, or a remote branch name like
+                     ``origin/main``
+    :return: The refspec
+
+    """
+    if COMMIT_HASH_RE.fullmatch(revision):
+        return revision
+    if revision.startswith("origin/"):
+        branch = revision.removeprefix("origin/")
+        return f"+refs/heads/{branch}:refs/remotes/origin/{branch}"
+    return f"+refs/heads/{revision}:refs/heads/{revision}"
+
+
+def deepen_to_baseline(revision: str, cwd: Path, remote: str = "origin") -> bool:
+    """Deepen a shallow clone until the baseline of a revision range is reachable
+
+    Baseline branches which don't exist locally are fetched from the remote with a
+    limited depth, and the history of branches which do exist is deepened. The depth
+    is doubled on each step until the baseline commit or the merge base is found, or
+    the clone isn't shallow any more.
+
+    :param revision: The ``-r`` / ``--revision`` option value for Graylint
+    :param cwd: The root of the Git repository
+    :param remote: The name of the remote to fetch from
+    :return: ``True`` if the baseline is in local history
+
+    """
+    rev1, rev2, use_merge_base = split_revision_range(revision)
+    # e.g. for ``HEAD~2``, the history of ``HEAD`` is deepened
+    names = [RELATIVE_SUFFIX_RE.sub("", rev) for rev in [rev1, rev2]]
+    depth = INITIAL_DEPTH
+    for _step in range(MAX_STEPS):
+        if has_baseline(revision, cwd) or not is_shallow(cwd):
+            break
+        print(  # noqa: T201
+            f"Fetching {depth} more commits to find the baseline of {revision}",
+            flush=True,
+        )
+        for name in names if use_merge_base else names[:1]:
+            commit = _git(
+                ["rev-parse", "--verify", "--quiet", f"{name}^{{commit}}"], cwd
+            ).stdout.strip()
+            if commit:
+                fetch_args = [f"--deepen={depth}", remote, commit]
+            else:
+                fetch_args = [f"--depth={depth}", remote, _make_refspec(name)]
+            fetch = _git(["fetch", "--no-tags", *fetch_args], cwd)
+            if fetch.returncode:
+                print(fetch.stderr, end="")  # noqa: T201
+                return False
+        depth *= 2
+    return has_baseline(revision, cwd)
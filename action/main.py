@@ -2,14 +2,18 @@
 
 from __future__ import annotations
 
+import hashlib
+import json
 import os
 import re
 import shlex
+import shutil
 import sys
 from pathlib import Path
 from subprocess import PIPE, STDOUT, run  # nosec
 from typing import TYPE_CHECKING
 
+from git_history import deepen_to_baseline
 from pip_requirements_parser import parse_reqparts_from_string
 
 if TYPE_CHECKING:
@@ -20,6 +24,8 @@ LINTER_WHITELIST = {"flake8", "pylint", "mypy", "ruff"}
 ACTION_PATH = Path(os.environ["GITHUB_ACTION_PATH"])
 ENV_PATH = ACTION_PATH / ".graylint-env"
 ENV_BIN = ENV_PATH / ("Scripts" if sys.platform == "win32" else "bin")
+ENV_HASH_PATH = ENV_PATH / "requirements.sha256"
+GRAYLINT_REPO = "https://github.com/akaihola/graylint"
 OPTIONS = os.getenv("INPUT_OPTIONS", default="")
 SRC = os.getenv("INPUT_SRC", default="")
 VERSION = os.getenv("INPUT_VERSION", default="")
@@ -27,12 +33,32 @@ LINT = os.getenv("INPUT_LINT", default="")
 WITH = os.getenv("INPUT_WITH", default="")
 REVISION = os.getenv("INPUT_REVISION") or os.getenv("INPUT_COMMIT_RANGE") or "HEAD^"
 
-run([sys.executable, "-m", "venv", str(ENV_PATH)], check=True)  # nosec
+
+def resolve_git_ref(ref: str) -> str:
+    """Resolve a branch or tag of the Graylint repository into a commit hash
+
+    :param ref: The branch, tag or commit hash
+    :return: The commit hash, or ``ref`` unchanged if it can't be resolved, e.g. because
+             it already is a commit hash
+
+    """
+    ls_remote = run(  # noqa: S603  # nosec
+        ["git", "ls-remote", GRAYLINT_REPO, ref, f"{ref}^{{}}"],  # noqa: S607
+        check=False,
+        stdout=PIPE,
+        encoding="utf-8",
+    )
+    # For annotated tags, the peeled ``<tag>^{}`` line with the commit hash comes last
+    commits = [line.split()[0] for line in ls_remote.stdout.splitlines() if line]
+    return commits[-1] if ls_remote.returncode == 0 and commits else ref
+
 
 req = ["graylint[color]"]
 if VERSION:
     if VERSION.startswith("@"):
-        req[0] = f"git+https://github.com/akaihola/graylint{VERSION}#egg={req[0]}"
+        # Pin the branch or tag to a commit so the environment is keyed on it
+        commit = resolve_git_ref(VERSION[1:])
+        req[0] = f"git+{GRAYLINT_REPO}@{commit}#egg={req[0]}"
     elif VERSION.startswith(("~", "=", "<", ">")):
         req[0] += VERSION
     else:
@@ -59,18 +85,49 @@ for linter_requirement in split_requirements_string(LINT):
     linter_options.extend(["--lint", linter])
 req.extend(str(r) for r in split_requirements_string(WITH))
 
-pip_proc = run(  # nosec
-    [str(ENV_BIN / "python"), "-m", "pip", "install"] + req,
-    check=False,
-    stdout=PIPE,
-    stderr=STDOUT,
-    encoding="utf-8",
-)
-print(pip_proc.stdout, end="")
-if pip_proc.returncode:
-    print(f"::error::Failed to install {' '.join(req)}.", flush=True)
-    sys.exit(pip_proc.returncode)
-
+# The environment is keyed on the requirements and the Python interpreter, and reused
+# on later runs on the same runner if neither has changed
+REQUIREMENTS_HASH = hashlib.sha256(
+    json.dumps([sys.version, sys.platform, req]).encode("utf-8")
+).hexdigest()
+if ENV_HASH_PATH.is_file() and ENV_HASH_PATH.read_text().strip() == REQUIREMENTS_HASH:
+    print(  # noqa: T201
+        f"Reusing the Graylint environment for {' '.join(req)}", flush=True
+    )
+else:
+    if ENV_PATH.exists():
+        shutil.rmtree(ENV_PATH)
+    # Install with uv if it's available since it's much faster than pip
+    uv = shutil.which("uv")
+    if uv:
+        run(  # noqa: S603  # nosec
+            [uv, "venv", "--python", sys.executable, str(ENV_PATH)], check=True
+        )
+        install_cmd = [uv, "pip", "install", "--python", str(ENV_BIN / "python")]
+    else:
+        run(  # noqa: S603  # nosec
+            [sys.executable, "-m", "venv", str(ENV_PATH)], check=True
+        )
+        install_cmd = [str(ENV_BIN / "python"), "-m", "pip", "install"]
+    pip_proc = run(  # noqa: S603  # nosec
+        [*install_cmd, *req],
+        check=False,
+        stdout=PIPE,
+        stderr=STDOUT,
+        encoding="utf-8",
+    )
+    print(pip_proc.stdout, end="")  # noqa: T201
+    if pip_proc.returncode:
+        print(f"::error::Failed to install {' '.join(req)}.", flush=True)  # noqa: T201
+        sys.exit(pip_proc.returncode)
+    ENV_HASH_PATH.write_text(REQUIREMENTS_HASH)
+
+# ``actions/checkout`` makes a shallow clone by default, so fetch more history if needed
+if not deepen_to_baseline(REVISION, Path.cwd()):
+    print(  # noqa: T201
+        f"::warning::Unable to find the baseline of {REVISION} in Git history.",
+        flush=True,
+    )
 
 base_cmd = [str(ENV_BIN / "graylint")]
 proc = run(  # nosec
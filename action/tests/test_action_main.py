@@ -2,6 +2,8 @@
 
 # pylint: disable=use-dict-literal
 
+from __future__ import annotations
+
 import re
 import sys
 from contextlib import contextmanager
@@ -31,31 +33,50 @@ def run_main_env() -> Dict[str, str]:
 
 
 @contextmanager
-def patch_main(
+def patch_main(  # noqa: PLR0913  # pylint: disable=too-many-arguments
     tmp_path: Path,
     run_main_env: Dict[str, str],
+    *,
     pip_returncode: int = 0,
+    uv: str | None = None,
+    ls_remote_stdout: str = "",
+    has_baseline: bool = True,
 ) -> Generator[SimpleNamespace, None, None]:
     """Patch `subprocess.run`, `sys.exit` and environment variables
 
     :param tmp_path: Path to use for the `GITHUB_ACTION_PATH` environment variable
     :param run_main_env: Additional environment for running ``main.py``
-    :yield: An object with `.subprocess.run` and `.sys.exit` mock objects
+    :param pip_returncode: The return code of the package installation command
+    :param uv: The path of the ``uv`` executable, or ``None`` if it's not available
+    :param ls_remote_stdout: The output of ``git ls-remote``
+    :param has_baseline: The return value of `git_history.deepen_to_baseline`
+    :yield: An object with `.subprocess.run`, `.sys.exit` and `.deepen_to_baseline`
+            mock objects
 
     """
 
     def run(args, **kwargs):
-        returncode = pip_returncode if args[1:3] == ["-m", "pip"] else 0
-        return CompletedProcess(args, returncode, stdout="", stderr="")
+        if args[1:3] == ["-m", "venv"] or args[1:2] == ["venv"]:
+            Path(args[-1]).mkdir(parents=True)
+        is_install = args[1:3] == ["-m", "pip"] or args[1:3] == ["pip", "install"]
+        returncode = pip_returncode if is_install else 0
+        stdout = ls_remote_stdout if args[1:2] == ["ls-remote"] else ""
+        return CompletedProcess(args, returncode, stdout=stdout, stderr="")
 
     run_mock = Mock(wraps=run)
     exit_ = Mock(side_effect=SysExitCalled)
-    with patch("subprocess.run", run_mock), patch("sys.exit", exit_), patch.dict(
-        "os.environ", {"GITHUB_ACTION_PATH": str(tmp_path), **run_main_env}
+    deepen = Mock(return_value=has_baseline)
+    with (
+        patch("subprocess.run", run_mock),
+        patch("sys.exit", exit_),
+        patch("shutil.which", return_value=uv),
+        patch("git_history.deepen_to_baseline", deepen),
+        patch.dict("os.environ", {"GITHUB_ACTION_PATH": str(tmp_path), **run_main_env}),
     ):
-
         yield SimpleNamespace(
-            subprocess=SimpleNamespace(run=run_mock), sys=SimpleNamespace(exit=exit_)
+            subprocess=SimpleNamespace(run=run_mock),
+            sys=SimpleNamespace(exit=exit_),
+            deepen_to_baseline=deepen,
         )
 
 
@@ -77,7 +98,6 @@ def main_patch(
 def test_creates_virtualenv(tmp_path, main_patch):
     """The GitHub action creates a virtualenv for Graylint"""
     with pytest.raises(SysExitCalled):
-
         run_module("main")
 
     assert main_patch.subprocess.run.call_args_list[0] == call(
@@ -138,10 +158,10 @@ def test_creates_virtualenv(tmp_path, main_patch):
 def test_installs_packages(tmp_path, main_patch, run_main_env, expect):
     """Graylint and linters are installed in the virtualenv using pip"""
     with pytest.raises(SysExitCalled):
-
         run_module("main")
 
-    assert main_patch.subprocess.run.call_args_list[1] == call(
+    # The installation is followed by running Graylint
+    assert main_patch.subprocess.run.call_args_list[-2] == call(
         [
             str(tmp_path / ".graylint-env" / BIN / "python"),
             "-m",
@@ -156,21 +176,105 @@ def test_installs_packages(tmp_path, main_patch, run_main_env, expect):
     )
 
 
+@pytest.mark.kwparametrize(
+    dict(ls_remote_stdout="", expect="main"),
+    dict(ls_remote_stdout="1234abcd\trefs/heads/main\n", expect="1234abcd"),
+    dict(
+        ls_remote_stdout="1234abcd\trefs/tags/main\n5678cdef\trefs/tags/main^{}\n",
+        expect="5678cdef",
+    ),
+)
+def test_resolves_git_ref(tmp_path: Path, ls_remote_stdout: str, expect: str) -> None:
+    """A Graylint branch or tag is pinned to a commit before installing"""
+    with (
+        patch_main(
+            tmp_path, {"INPUT_VERSION": "@main"}, ls_remote_stdout=ls_remote_stdout
+        ) as main_patch,
+        pytest.raises(SysExitCalled),
+    ):
+        run_module("main")
+
+    assert main_patch.subprocess.run.call_args_list[0] == call(
+        ["git", "ls-remote", "https://github.com/akaihola/graylint", "main", "main^{}"],
+        check=False,
+        stdout=PIPE,
+        encoding="utf-8",
+    )
+    assert main_patch.subprocess.run.call_args_list[-2].args[0][-1] == (
+        f"git+https://github.com/akaihola/graylint@{expect}#egg=graylint[color]"
+    )
+
+
+def test_installs_with_uv(tmp_path: Path) -> None:
+    """The environment is created and packages installed with uv if available"""
+    with (
+        patch_main(tmp_path, {}, uv="/bin/uv") as main_patch,
+        pytest.raises(SysExitCalled),
+    ):
+        run_module("main")
+
+    env_path = tmp_path / ".graylint-env"
+    assert main_patch.subprocess.run.call_args_list[:2] == [
+        call(
+            ["/bin/uv", "venv", "--python", sys.executable, str(env_path)], check=True
+        ),
+        call(
+            [
+                "/bin/uv",
+                "pip",
+                "install",
+                "--python",
+                str(env_path / BIN / "python"),
+                "graylint[color]",
+            ],
+            check=False,
+            stdout=PIPE,
+            stderr=STDOUT,
+            encoding="utf-8",
+        ),
+    ]
+
+
+@pytest.mark.kwparametrize(
+    dict(second_env={}, expect_install=False),
+    dict(second_env={"INPUT_LINT": "flake8"}, expect_install=True),
+    dict(second_env={"INPUT_VERSION": "1.5.0"}, expect_install=True),
+)
+def test_reuses_environment(
+    tmp_path: Path,
+    second_env: dict[str, str],
+    expect_install: bool,  # noqa: FBT001
+) -> None:
+    """The environment is reused if the requirements haven't changed"""
+    with patch_main(tmp_path, {}), pytest.raises(SysExitCalled):
+        run_module("main")
+    (tmp_path / ".graylint-env" / "marker").touch()
+
+    with patch_main(tmp_path, second_env) as main_patch, pytest.raises(SysExitCalled):
+        run_module("main")
+
+    commands = [c.args[0][1:3] for c in main_patch.subprocess.run.call_args_list]
+    assert (["-m", "venv"] in commands) == expect_install
+    assert (["-m", "pip"] in commands) == expect_install
+    assert (tmp_path / ".graylint-env" / "marker").exists() != expect_install
+
+
 @pytest.mark.parametrize(
     "linters", ["foo", "  foo  ", "foo==2.0,bar", "  foo>1.0  ,  bar  ", "pylint,foo"]
 )
 def test_wont_install_unknown_packages(tmp_path, linters):
     """Non-whitelisted linters raise an exception"""
-    with patch_main(tmp_path, {"INPUT_LINT": linters}) as main_patch, pytest.raises(
-        RuntimeError,
-        match=re.escape("'foo' is not supported as a linter by the GitHub Action"),
+    with (
+        patch_main(tmp_path, {"INPUT_LINT": linters}) as main_patch,
+        pytest.raises(
+            RuntimeError,
+            match=re.escape("'foo' is not supported as a linter by the GitHub Action"),
+        ),
     ):
-
         run_module("main")
 
-    # only virtualenv `run` called, `pip` and `graylint` not called
-    (venv_create,) = main_patch.subprocess.run.call_args_list
-    assert venv_create == call([ANY, "-m", "venv", ANY], check=True)
+    # virtualenv, `pip` and `graylint` not called
+    main_patch.subprocess.run.assert_not_called()
     assert not main_patch.sys.exit.called
 
 
@@ -232,7 +336,6 @@ def test_wont_install_unknown_packages(tmp_path, linters):
 def test_runs_graylint(tmp_path, env, expect):
     """Configuration translates correctly into a Graylint command line"""
     with patch_main(tmp_path, env) as main_patch, pytest.raises(SysExitCalled):
-
         run_module("main")
 
     graylint = str(tmp_path / ".graylint-env" / BIN / "graylint")
@@ -240,12 +343,36 @@ def test_runs_graylint(tmp_path, env, expect):
     assert graylint in [c.args[0][0] for c in main_patch.subprocess.run.call_args_list]
 
 
+@pytest.mark.kwparametrize(
+    dict(has_baseline=True, expect_warning=False),
+    dict(has_baseline=False, expect_warning=True),
+)
+def test_deepens_shallow_clone(
+    tmp_path: Path,
+    capsys: pytest.CaptureFixture[str],
+    has_baseline: bool,  # noqa: FBT001
+    expect_warning: bool,  # noqa: FBT001
+) -> None:
+    """History is fetched up to the baseline, with a warning if it isn't found"""
+    with (
+        patch_main(
+            tmp_path, {"INPUT_REVISION": "main..."}, has_baseline=has_baseline
+        ) as main_patch,
+        pytest.raises(SysExitCalled),
+    ):
+        run_module("main")
+
+    main_patch.deepen_to_baseline.assert_called_once_with("main...", Path.cwd())
+    warning = "::warning::Unable to find the baseline of main... in Git history."
+    assert (warning in capsys.readouterr().out) == expect_warning
+
+
 def test_error_if_pip_fails(tmp_path, capsys):
     """Returns an error and the pip error code if pip fails"""
-    with patch_main(tmp_path, {}, pip_returncode=42) as main_patch, pytest.raises(
-        SysExitCalled
+    with (
+        patch_main(tmp_path, {}, pip_returncode=42) as main_patch,
+        pytest.raises(SysExitCalled),
     ):
-
         run_module("main")
 
     assert main_patch.subprocess.run.call_args_list[-1] == call(
@@ -265,7 +392,6 @@ def test_error_if_pip_fails(tmp_path, capsys):
 def test_exits(main_patch):
     """A successful run exits with a zero return code"""
     with pytest.raises(SysExitCalled):
-
         run_module("main")
 
     main_patch.sys.exit.assert_called_once_with(0)
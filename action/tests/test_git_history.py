@@ -0,0 +1,120 @@
+"""Tests for the GitHub Action ``git_history`` module, using a local bare remote"""
+
+# pylint: disable=use-dict-literal
+
+from __future__ import annotations
+
+from subprocess import PIPE, run  # nosec
+from typing import TYPE_CHECKING
+
+import pytest
+from git_history import deepen_to_baseline, has_baseline, is_shallow
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+# pylint: disable=redefined-outer-name
+
+
+def git(cwd: Path, *args: str) -> str:
+    """Run a Git command and return its output
+
+    :param cwd: The working directory for Git
+    :param args: The Git command and arguments
+    :return: The standard output of Git
+
+    """
+    return run(  # noqa: S603  # nosec
+        ["git", "-c", "protocol.file.allow=always", *args],  # noqa: S607
+        cwd=cwd,
+        check=True,
+        stdout=PIPE,
+        encoding="utf-8",
+    ).stdout
+
+
+def commit(cwd: Path, message: str) -> None:
+    """Modify a file and commit it
+
+    :param cwd: The root of the Git repository
+    :param message: The commit message, also used as the new content of the file
+
+    """
+    (cwd / "file.py").write_text(f"{message}\n")
+    git(cwd, "add", "file.py")
+    git(cwd, "commit", "-q", "-m", message)
+
+
+@pytest.fixture(scope="module")
+def remote(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Create a bare repository with 40 commits on ``main`` and 3 on ``feature``"""
+    origin = tmp_path_factory.mktemp("origin")
+    git(origin, "init", "-q", "-b", "main")
+    git(origin, "config", "user.email", "ci@example.com")
+    git(origin, "config", "user.name", "CI")
+    for index in range(20):
+        commit(origin, f"main {index}")
+    git(origin, "checkout", "-q", "-b", "feature")
+    for index in range(3):
+        commit(origin, f"feature {index}")
+    git(origin, "checkout", "-q", "main")
+    for index in range(20, 40):
+        commit(origin, f"main {index}")
+    bare = tmp_path_factory.mktemp("remote") / "remote.git"
+    git(origin, "clone", "-q", "--bare", str(origin), str(bare))
+    return bare
+
+
+@pytest.fixture
+def shallow_clone(tmp_path: Path, remote: Path) -> Path:
+    """Clone the ``feature`` branch with only its latest commit, like in a workflow"""
+    work = tmp_path / "work"
+    git(
+        tmp_path,
+        "clone",
+        "-q",
+        "--depth=1",
+        "--branch=feature",
+        f"file://{remote}",
+        str(work),
+    )
+    return work
+
+
+@pytest.mark.kwparametrize(
+    dict(revision="main..."),
+    dict(revision="origin/main..."),
+    dict(revision="main...feature"),
+    dict(revision="HEAD~2"),
+    dict(revision="HEAD^"),
+    dict(revision="main"),
+)
+def test_deepen_to_baseline(shallow_clone: Path, revision: str) -> None:
+    """A shallow clone is deepened until the baseline is found, but not fully"""
+    assert not has_baseline(revision, shallow_clone)
+
+    result = deepen_to_baseline(revision, shallow_clone)
+
+    assert result
+    assert has_baseline(revision, shallow_clone)
+    assert is_shallow(shallow_clone)
+
+
+def test_deepen_to_baseline_found(
+    shallow_clone: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    """Nothing is fetched if the baseline is already in local history"""
+    result = deepen_to_baseline("HEAD", shallow_clone)
+
+    assert result
+    assert capsys.readouterr().out == ""
+
+
+def test_deepen_to_baseline_missing(
+    shallow_clone: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    """A baseline which doesn't exist on the remote isn't found"""
+    result = deepen_to_baseline("nonexistent...", shallow_clone)
+
+    assert not result
+    assert "couldn't find remote ref" in capsys.readouterr().out
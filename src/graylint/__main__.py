@@ -5,6 +5,7 @@ from __future__ import annotations
 import logging
 import sys
 from argparse import ArgumentError
+from typing import TYPE_CHECKING
 
 from darkgraylib.command_line import (
     EXIT_CODE_CMDLINE_ERROR,
@@ -12,13 +13,18 @@ from darkgraylib.command_line import (
     parse_command_line,
 )
 from darkgraylib.config import show_config_if_debug
-from darkgraylib.git import RevisionRange
-from darkgraylib.highlighting import should_use_color
 from darkgraylib.log import setup_logging
-from darkgraylib.main import resolve_paths
-from graylint.command_line import make_argument_parser, shlex_split
+from graylint.command_line import (
+    make_argument_parser,
+    parse_linter_limit_args,
+    shlex_split,
+    validate_linter_output_specs,
+    validate_revision_args,
+)
 from graylint.config import GraylintConfig
-from graylint.linting import run_linters
+
+if TYPE_CHECKING:
+    from pathlib import Path
 
 logger = logging.getLogger(__name__)
 
@@ -35,34 +41,132 @@ def main_with_error_handling(argv: list[str] | None = None) -> int:
         return EXIT_CODE_UNKNOWN
 
 
-def main(argv: list[str] | None = None) -> int:
-    """Parse the command line and lint each source file
+def main(argv: list[str] | None = None) -> int:  # pylint: disable=too-many-locals
+    """Parse the command line and lint each source file, or run ``graylint cache``
 
     :return: Total number of linting errors found on modified lines
 
     """
+    if argv is None:
+        argv = sys.argv[1:]
+    if argv[:1] == ["cache"]:
+        # ``graylint cache`` subcommands have a command line parser of their own
+        # pylint: disable-next=import-outside-toplevel
+        from graylint.cache import main as cache_main  # noqa: PLC0415
+
+        return cache_main(argv[1:])
     args, config, config_nondefault = parse_command_line(
         make_argument_parser, argv, "graylint", GraylintConfig
     )
+    # The linting engine, Git helpers and syntax highlighting are imported only after
+    # the command line has been parsed. This keeps ``--version`` and ``--help`` fast,
+    # which matters since e.g. pre-commit hooks invoke Graylint very often.
+    # pylint: disable=import-outside-toplevel
+    from darkgraylib.git import RevisionRange, git_get_root  # noqa: PLC0415
+    from darkgraylib.highlighting import should_use_color  # noqa: PLC0415
+    from darkgraylib.main import resolve_paths  # noqa: PLC0415
+    from graylint.baseline import make_baseline_getter  # noqa: PLC0415
+    from graylint.cache import make_cache_storage  # noqa: PLC0415
+    from graylint.commits import run_linters_for_each_commit  # noqa: PLC0415
+    from graylint.cpu_budget import set_cpu_budget  # noqa: PLC0415
+    from graylint.durations import duration_history  # noqa: PLC0415
+    from graylint.linting import linter_servers, run_linters  # noqa: PLC0415
+    from graylint.multibaseline import run_linters_for_baselines  # noqa: PLC0415
+    from graylint.profiles import load_linter_profiles  # noqa: PLC0415
+    from graylint.staged import make_staged_revrange  # noqa: PLC0415
+    from graylint.time_budget import (  # noqa: PLC0415
+        EXIT_CODE_TIME_BUDGET_EXPIRED,
+        run_linters_within_time_budget,
+    )
+
     setup_logging(args.log_level)
+    validate_linter_output_specs(args.linter_output + args.baseline_linter_output)
+    validate_revision_args(args)
+    linter_limits = parse_linter_limit_args(
+        args.timeout, args.cpu_limit, args.memory_limit
+    )
     show_config_if_debug(config, config_nondefault, args.log_level, "graylint")
+    load_linter_profiles(config.get("linter_profiles") or {})
+    set_cpu_budget(args.workers)
     paths, root = resolve_paths(args.stdin_filename, args.src)
-    revrange = RevisionRange.parse_with_common_ancestor(
-        args.revision, root, args.stdin_filename is not None
-    )
+    revranges = {
+        revision: RevisionRange.parse_with_common_ancestor(
+            revision, root, args.stdin_filename is not None
+        )
+        for revision in args.revisions or [args.revision]
+    }
+    revrange = next(iter(revranges.values()))
+    if args.staged:
+        revrange = make_staged_revrange(revrange)
     output_formats = [
         output.with_color(use_color=should_use_color(config["color"]))
         for output in args.output_format
     ]
-    linter_failures_on_modified_lines = run_linters(
-        [shlex_split(one_linter) for one_linter in args.lint],
-        root,
-        # paths to lint are not limited to modified files or just Python files:
-        {p.resolve().relative_to(root) for p in paths},
-        revrange,
-        output_formats,
-    )
-    return 1 if linter_failures_on_modified_lines else 0
+    linter_cmdlines = [shlex_split(one_linter) for one_linter in args.lint]
+    # paths to lint are not limited to modified files or just Python files:
+    relative_paths = {p.resolve().relative_to(root) for p in paths}
+    unchecked: dict[str, list[Path]] = {}
+    with (
+        linter_servers(keep_daemons=args.keep_daemons),
+        duration_history(git_get_root(root) or root),
+    ):
+        if args.each_commit:
+            linter_failures = run_linters_for_each_commit(
+                linter_cmdlines,
+                root,
+                relative_paths,
+                revrange,
+                output_formats,
+                linter_limits=linter_limits,
+            )
+        elif len(revranges) > 1:
+            linter_failures = run_linters_for_baselines(
+                linter_cmdlines,
+                root,
+                relative_paths,
+                revranges,
+                output_formats,
+                linter_limits=linter_limits,
+            )
+        elif args.time_budget is not None:
+            linter_failures, unchecked = run_linters_within_time_budget(
+                linter_cmdlines,
+                root,
+                relative_paths,
+                revrange,
+                output_formats,
+                time_budget=args.time_budget,
+                linter_limits=linter_limits,
+            )
+        else:
+            linter_failures = run_linters(
+                linter_cmdlines,
+                root,
+                relative_paths,
+                revrange,
+                output_formats,
+                get_baseline=make_baseline_getter(
+                    args.save_baseline,
+                    args.load_baseline,
+                    linter_limits,
+                    cache=(
+                        make_cache_storage(args.cache_backend, args.cache_location)
+                        if args.cache
+                        else None
+                    ),
+                ),
+                linter_outputs=args.linter_output,
+                baseline_linter_outputs=args.baseline_linter_output,
+                max_messages=args.max_messages,
+                linter_limits=linter_limits,
+                import_depth=args.import_depth,
+                expand_directories=args.expand_directories,
+            )
+    if linter_failures:
+        # New messages in the files which were checked take precedence over an expired
+        # time budget
+        return 1
+    return EXIT_CODE_TIME_BUDGET_EXPIRED if unchecked else 0
 
 
 if __name__ == "__main__":
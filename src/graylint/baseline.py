@@ -0,0 +1,518 @@
+"""Save and load linter baselines as portable artifact files.
+
+Linting the ``rev1`` baseline requires a temporary checkout of the revision and running
+all linters on it. In CI, the same baseline is typically needed by many jobs, e.g. each
+pull request job compares against the tip of ``main``. With ``--save-baseline``, the
+baseline messages are written into a file which can be stored as a build artifact. Later
+runs can use ``--load-baseline`` to skip the checkout and linting of ``rev1`` entirely.
+
+The file records the commit hash of the baseline revision, the linter command lines,
+the versions of the linters and the paths linted. A baseline is only loaded if all of
+them match the current run, so a stale, incompatible or partial baseline is never
+silently used.
+
+Baselines of large repositories can hold millions of messages, so a compact binary
+format is used. The file is memory-mapped when loaded, and messages for a location are
+looked up by binary search without reading the whole file into memory.
+
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import struct
+from collections.abc import Mapping
+from dataclasses import asdict, dataclass, field
+from functools import partial
+from mmap import ACCESS_READ, mmap
+from pathlib import Path
+from subprocess import PIPE, STDOUT, run  # nosec
+from typing import TYPE_CHECKING, cast
+
+from darkgraylib.git import git_rev_parse
+from graylint.linting import (
+    LinterMessage,
+    MessageLocation,
+    _get_messages_from_linters_for_baseline,
+    _transform_linter_command,
+)
+from graylint.lsp import LSP
+from graylint.version import __version__
+
+if TYPE_CHECKING:
+    from collections.abc import Collection, Iterable, Iterator
+
+    from graylint.cache_storage.base import CacheStorage
+    from graylint.limits import LinterLimits
+    from graylint.linting import BaselineGetter
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"GLBL"
+BASELINE_FORMAT_VERSION = 2
+# magic, format version, metadata size, path count, string count, record count
+HEADER = struct.Struct("<4sIIIII")
+# offset of a string from the start of string data
+STRING_OFFSET = struct.Struct("<Q")
+# offsets of the start and end of a string, i.e. two consecutive string offsets
+STRING_RANGE = struct.Struct("<QQ")
+# path string index, line, column, linter string index, description string index
+RECORD = struct.Struct("<IIIII")
+
+
+class BaselineMismatchError(Exception):
+    """Raised when a baseline file doesn't match the current Graylint run."""
+
+
+@dataclass(frozen=True)
+class BaselineMetadata:
+    """Information needed to decide whether a stored baseline can be reused."""
+
+    commit: str
+    linter_cmdlines: list[list[str]]
+    linter_versions: list[str]
+    paths: list[str] = field(default_factory=list)
+    graylint_version: str = __version__
+
+    def mismatches(self, other: BaselineMetadata) -> list[str]:
+        """List the differences between two sets of baseline metadata.
+
+        :param other: The metadata to compare against
+        :return: Human readable descriptions of differing fields, or an empty list if
+                 the metadata is identical
+
+        """
+        return [
+            f"{name}: {value!r} != {getattr(other, name)!r}"
+            for name, value in asdict(self).items()
+            if getattr(other, name) != value
+        ]
+
+    def cache_key(self) -> str:
+        """Return a key for storing the baseline in a cache.
+
+        :return: A hash of the metadata
+
+        """
+        return hashlib.sha256(
+            json.dumps(asdict(self), sort_keys=True).encode("utf-8")
+        ).hexdigest()
+
+
+def get_linter_version(cmdline: list[str]) -> str:
+    """Return the version string of a linter.
+
+    The linter executable is run with the ``--version`` option, and the first non-empty
+    line of its output is returned. If the linter can't be run, an empty string is
+    returned instead.
+
+    :param cmdline: The command line for running the linter
+    :return: The version string reported by the linter
+
+    """
+    executable = _transform_linter_command(cmdline)[0]
+    if executable == LSP:
+        # For language servers, the server executable follows ``lsp``
+        executable = cmdline[1]
+    try:
+        result = run(  # noqa: S603  # nosec
+            [executable, "--version"],
+            stdout=PIPE,
+            stderr=STDOUT,
+            encoding="utf-8",
+            check=False,
+        )
+    except OSError:
+        logger.warning("Unable to get the version of %s", executable)
+        return ""
+    return next((line.strip() for line in result.stdout.splitlines() if line), "")
+
+
+def make_baseline_metadata(
+    linter_cmdlines: list[list[str]], commit: str, paths: Collection[Path]
+) -> BaselineMetadata:
+    """Collect metadata for a baseline from the linters and the baseline revision.
+
+    :param linter_cmdlines: The command lines for linter tools to run on the files
+    :param commit: The commit hash of the baseline revision
+    :param paths: The files and directories linted for the baseline
+    :return: The metadata to store with or compare against a baseline file
+
+    """
+    return BaselineMetadata(
+        commit,
+        [list(cmdline) for cmdline in linter_cmdlines],
+        [get_linter_version(cmdline) for cmdline in linter_cmdlines],
+        sorted({path.as_posix() for path in paths}),
+    )
+
+
+class MappedBaseline(  # pylint: disable=too-many-instance-attributes
+    Mapping[MessageLocation, list[LinterMessage]]
+):
+    """Read-only, memory-mapped view of the linter messages in a baseline file.
+
+    Opening the file only reads and verifies the header. Messages at a given location
+    are found by binary search of the sorted location records, and only the strings
+    needed for the result are decoded. This makes opening and querying a baseline fast
+    regardless of its size.
+
+    """
+
+    def __init__(self, path: Path) -> None:
+        """Memory-map the baseline file and read its header.
+
+        :param path: The path of the baseline file to read
+        :raises BaselineMismatchError: if the file isn't a baseline file of a supported
+                                       version, or it's truncated or corrupt
+
+        """
+        with path.open("rb") as baseline_file:
+            if baseline_file.read(len(MAGIC)) != MAGIC:
+                message = f"{path} is not a Graylint baseline file"
+                raise BaselineMismatchError(message)
+            self._data = mmap(baseline_file.fileno(), 0, access=ACCESS_READ)
+        try:
+            self._read_header(path)
+        except (struct.error, ValueError, TypeError) as exc:
+            # `json.JSONDecodeError` and `UnicodeDecodeError` are `ValueError`s
+            message = f"{path} is a truncated or corrupt Graylint baseline file"
+            raise BaselineMismatchError(message) from exc
+        self._len: int | None = None
+
+    def _read_header(self, path: Path) -> None:
+        """Read the header and metadata, and check that the file isn't truncated.
+
+        :param path: The path of the baseline file, for error messages
+        :raises BaselineMismatchError: if the file is of an unsupported version
+        :raises struct.error: if the file is too short for its header
+        :raises ValueError: if the metadata isn't valid JSON or the file is too short
+                            for its string table
+        :raises TypeError: if the metadata has the wrong fields
+
+        """
+        (
+            _magic,
+            version,
+            metadata_size,
+            self._path_count,
+            self._string_count,
+            self._record_count,
+        ) = HEADER.unpack_from(self._data)
+        if version != BASELINE_FORMAT_VERSION:
+            message = f"{path} is a Graylint baseline file of an unsupported version"
+            raise BaselineMismatchError(message)
+        metadata_start = HEADER.size
+        metadata_end = metadata_start + metadata_size
+        self.metadata = BaselineMetadata(
+            **json.loads(self._data[metadata_start:metadata_end])
+        )
+        self._offsets_start = metadata_end
+        self._records_start = self._offsets_start + (self._string_count + 1) * (
+            STRING_OFFSET.size
+        )
+        self._strings_start = self._records_start + self._record_count * RECORD.size
+        # The last string offset is the end of the string data
+        (strings_size,) = STRING_OFFSET.unpack_from(
+            self._data, self._offsets_start + self._string_count * STRING_OFFSET.size
+        )
+        if len(self._data) < self._strings_start + strings_size:
+            message = "The file is shorter than its string table"
+            raise ValueError(message)
+
+    def _string(self, index: int) -> str:
+        """Decode a string from the string table.
+
+        :param index: The index of the string in the string table
+        :return: The decoded string
+
+        """
+        start, end = STRING_RANGE.unpack_from(
+            self._data, self._offsets_start + index * STRING_OFFSET.size
+        )
+        start += self._strings_start
+        end += self._strings_start
+        return self._data[start:end].decode("utf-8")
+
+    def _record(self, index: int) -> tuple[int, int, int, int, int]:
+        """Read a location record.
+
+        :param index: The index of the record
+        :return: String index of the path, line, column, string index of the linter name
+                 and string index of the description
+
+        """
+        return cast(
+            "tuple[int, int, int, int, int]",
+            RECORD.unpack_from(self._data, self._records_start + index * RECORD.size),
+        )
+
+    def _find_path(self, path: Path) -> int | None:
+        """Binary search for the string index of a path.
+
+        :param path: The path to find
+        :return: The string index of the path, or ``None`` if there are no messages for
+                 the path in the baseline
+
+        """
+        path_str = path.as_posix()
+        low, high = 0, self._path_count
+        while low < high:
+            middle = (low + high) // 2
+            if self._string(middle) < path_str:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self._path_count and self._string(low) == path_str:
+            return low
+        return None
+
+    def __getitem__(self, location: MessageLocation) -> list[LinterMessage]:
+        """Return the baseline messages at the given location.
+
+        :param location: The path, line and column to get messages for
+        :raises KeyError: if there are no messages at the location
+        :return: Linter messages at the location
+
+        """
+        path_index = self._find_path(location.path)
+        if path_index is None:
+            raise KeyError(location)
+        key = (path_index, location.line, location.column)
+        low, high = 0, self._record_count
+        while low < high:
+            middle = (low + high) // 2
+            if self._record(middle)[:3] < key:
+                low = middle + 1
+            else:
+                high = middle
+        result = []
+        for index in range(low, self._record_count):
+            record = self._record(index)
+            if record[:3] != key:
+                break
+            result.append(
+                LinterMessage(self._string(record[3]), self._string(record[4]))
+            )
+        if not result:
+            raise KeyError(location)
+        return result
+
+    def __iter__(self) -> Iterator[MessageLocation]:
+        """Iterate over all message locations in the baseline, in sorted order.
+
+        :return: An iterator of message locations
+
+        """
+        previous = None
+        for index in range(self._record_count):
+            key = self._record(index)[:3]
+            if key != previous:
+                previous = key
+                yield MessageLocation(Path(self._string(key[0])), key[1], key[2])
+
+    def __len__(self) -> int:
+        """Return the number of distinct message locations in the baseline.
+
+        :return: The number of locations with messages
+
+        """
+        if self._len is None:
+            self._len = sum(1 for _ in self)
+        return self._len
+
+
+def _make_string_table_and_records(
+    baseline: Mapping[MessageLocation, Iterable[LinterMessage]],
+) -> tuple[list[str], list[str], list[tuple[int, int, int, int, int]]]:
+    """Convert baseline messages to a string table and sorted location records.
+
+    :param baseline: The linter messages for the baseline revision
+    :return: The sorted paths, all strings with the paths first, and the location
+             records sorted by path, line and column
+
+    """
+    path_strs = sorted({location.path.as_posix() for location in baseline})
+    string_indices = {path_str: index for index, path_str in enumerate(path_strs)}
+    records = []
+    for location, messages in baseline.items():
+        path_index = string_indices[location.path.as_posix()]
+        for message in messages:
+            linter_index = string_indices.setdefault(
+                message.linter, len(string_indices)
+            )
+            description_index = string_indices.setdefault(
+                message.description, len(string_indices)
+            )
+            records.append(
+                (
+                    path_index,
+                    location.line,
+                    location.column,
+                    linter_index,
+                    description_index,
+                )
+            )
+    records.sort()
+    return path_strs, list(string_indices), records
+
+
+def save_baseline(
+    path: Path,
+    metadata: BaselineMetadata,
+    baseline: Mapping[MessageLocation, Iterable[LinterMessage]],
+) -> None:
+    """Write baseline linter messages and their metadata into a file.
+
+    The file starts with a header and the metadata as JSON, followed by a table of
+    string offsets, the location records and the string data. Paths come first in the
+    string table in sorted order, and the location records are sorted by path, line and
+    column. This allows `MappedBaseline` to binary search both.
+
+    :param path: The path of the baseline file to write
+    :param metadata: The commit, linter command lines, versions and paths of the
+                     baseline
+    :param baseline: The linter messages for the baseline revision
+
+    """
+    path_strs, strings, records = _make_string_table_and_records(baseline)
+    metadata_json = json.dumps(asdict(metadata)).encode("utf-8")
+    encoded_strings = [string.encode("utf-8") for string in strings]
+    with path.open("wb") as baseline_file:
+        baseline_file.write(
+            HEADER.pack(
+                MAGIC,
+                BASELINE_FORMAT_VERSION,
+                len(metadata_json),
+                len(path_strs),
+                len(encoded_strings),
+                len(records),
+            )
+        )
+        baseline_file.write(metadata_json)
+        offset = 0
+        baseline_file.write(STRING_OFFSET.pack(offset))
+        for encoded_string in encoded_strings:
+            offset += len(encoded_string)
+            baseline_file.write(STRING_OFFSET.pack(offset))
+        for record in records:
+            baseline_file.write(RECORD.pack(*record))
+        for encoded_string in encoded_strings:
+            baseline_file.write(encoded_string)
+    logger.info("Saved baseline for %s into %s", metadata.commit, path)
+
+
+def load_baseline(path: Path, expect_metadata: BaselineMetadata) -> MappedBaseline:
+    """Open a baseline file for reading, verifying its metadata.
+
+    :param path: The path of the baseline file to read
+    :param expect_metadata: The metadata of the current run which the baseline must
+                            match
+    :raises BaselineMismatchError: if the file isn't a valid baseline file, or it was
+                                   created for a different commit, linters, linter
+                                   versions or paths
+    :return: The linter messages for the baseline revision
+
+    """
+    baseline = MappedBaseline(path)
+    mismatches = baseline.metadata.mismatches(expect_metadata)
+    if mismatches:
+        message = f"Baseline in {path} doesn't match: {', '.join(mismatches)}"
+        raise BaselineMismatchError(message)
+    logger.info("Loaded baseline for %s from %s", baseline.metadata.commit, path)
+    return baseline
+
+
+def get_baseline(  # noqa: PLR0913  # pylint: disable=too-many-arguments
+    linter_cmdlines: list[list[str]],
+    root: Path,
+    paths: Collection[Path],
+    revision: str,
+    *,
+    save_path: Path | None = None,
+    load_path: Path | None = None,
+    cache: CacheStorage | None = None,
+    linter_limits: Mapping[str, LinterLimits] | None = None,
+) -> Mapping[MessageLocation, list[LinterMessage]]:
+    """Load the baseline from a file or cache, or lint the baseline revision.
+
+    :param linter_cmdlines: The command lines for linter tools to run on the files
+    :param root: The root of the Git repository
+    :param paths: The files and directories to check, relative to ``root``
+    :param revision: The baseline revision
+    :param save_path: The path of the file to save the baseline into, or ``None``
+    :param load_path: The path of the file to load the baseline from, or ``None`` to
+                      run the linters on a temporary checkout of ``revision``
+    :param cache: The cache to look up the baseline from before linting it, and to
+                  store the linted baseline into
+    :param linter_limits: Time and resource limits by linter name
+    :return: Linter messages for the baseline revision
+
+    """
+    metadata = make_baseline_metadata(
+        linter_cmdlines, git_rev_parse(revision, root), paths
+    )
+    if load_path:
+        return load_baseline(load_path, metadata)
+    cache_key = metadata.cache_key()
+    if cache:
+        cached = cache.get(cache_key, partial(_load_cached_baseline, metadata))
+        if cached is not None:
+            return cached
+    baseline = _get_messages_from_linters_for_baseline(
+        linter_cmdlines, root, paths, revision, linter_limits=linter_limits
+    )
+    if save_path:
+        save_baseline(save_path, metadata, baseline)
+    if cache:
+        cache.put(
+            cache_key, partial(save_baseline, metadata=metadata, baseline=baseline)
+        )
+    return baseline
+
+
+def _load_cached_baseline(
+    expect_metadata: BaselineMetadata, path: Path
+) -> MappedBaseline | None:
+    """Load a baseline file from the cache, ignoring it if it's invalid.
+
+    :param expect_metadata: The metadata of the current run
+    :param path: The path of the cached baseline file
+    :return: The linter messages for the baseline revision, or ``None`` if the file
+             doesn't match the current run
+
+    """
+    try:
+        return load_baseline(path, expect_metadata)
+    except BaselineMismatchError as exc:
+        logger.warning("Ignoring cached baseline: %s", exc)
+        return None
+
+
+def make_baseline_getter(
+    save_path: str | None,
+    load_path: str | None,
+    linter_limits: Mapping[str, LinterLimits] | None = None,
+    cache: CacheStorage | None = None,
+) -> BaselineGetter | None:
+    """Create a callback for `run_linters` to save, load or cache the baseline.
+
+    :param save_path: The ``--save-baseline`` command line option value
+    :param load_path: The ``--load-baseline`` command line option value
+    :param linter_limits: Time and resource limits by linter name
+    :param cache: The baseline cache to use, or ``None`` if ``--cache`` wasn't given
+    :return: A callback for getting the baseline, or ``None`` if none of the options
+             were given and the baseline should be linted normally
+
+    """
+    if not save_path and not load_path and not cache:
+        return None
+    return partial(
+        get_baseline,
+        save_path=Path(save_path) if save_path else None,
+        load_path=Path(load_path) if load_path else None,
+        cache=cache,
+        linter_limits=linter_limits,
+    )
@@ -0,0 +1,244 @@
+"""Cache linter baselines, and manage the cache from the command line.
+
+With ``--cache``, the linter messages for a baseline revision are stored in a cache,
+keyed by the commit hash, linter command lines, linter versions and the paths to lint.
+Later runs with the same baseline reuse the cached messages instead of checking out and
+linting the baseline revision again.
+
+The cache is stored by a backend plugin from the ``graylint.cache_storage`` entry point
+group, chosen with ``--cache-backend``. The built-in ``local`` backend stores entries in
+a local directory, and the ``http`` backend on a remote cache server shared e.g. by
+ephemeral CI runners.
+
+The cache is managed with the ``graylint cache`` command:
+
+- ``graylint cache warm --rev main`` lints a baseline revision and stores it in the
+  cache, e.g. from a ``post-merge`` Git hook
+- ``graylint cache stats`` shows the number and total size of cache entries
+- ``graylint cache gc`` removes entries not used for a while, and evicts least recently
+  used entries until the cache fits in the given size
+
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+from argparse import ArgumentError, ArgumentParser
+from typing import TYPE_CHECKING, TextIO
+
+from darkgraylib.command_line import parse_command_line
+from darkgraylib.git import RevisionRange, git_get_root
+from darkgraylib.log import setup_logging
+from darkgraylib.main import resolve_paths
+from graylint import help as hlp
+from graylint.baseline import get_baseline
+from graylint.cache_storage.plugin_helpers import (
+    DEFAULT_CACHE_STORAGE,
+    create_cache_storage,
+)
+from graylint.command_line import (
+    make_argument_parser,
+    parse_linter_limit_args,
+    shlex_split,
+)
+from graylint.config import GraylintConfig
+from graylint.limits import parse_memory_size
+from graylint.linting import linter_servers
+
+if TYPE_CHECKING:
+    from graylint.cache_storage.base import CacheStorage
+
+DEFAULT_MAX_SIZE = "1G"
+DEFAULT_MAX_AGE_DAYS = 30.0
+SECONDS_PER_DAY = 24 * 60 * 60
+KIBIBYTE = 1024
+
+
+def make_cache_storage(backend: str, location: str | None) -> CacheStorage:
+    """Create the cache storage backend chosen on the command line.
+
+    :param backend: The ``--cache-backend`` option value
+    :param location: The ``--cache-location`` option value
+    :raises ArgumentError: if the backend doesn't exist or needs a location
+    :return: The cache storage backend object
+
+    """
+    try:
+        return create_cache_storage(backend, location)
+    except ValueError as exc:
+        raise ArgumentError(None, str(exc)) from exc
+
+
+def _format_size(size: float) -> str:
+    """Format a size in bytes in human readable form.
+
+    >>> _format_size(1023)
+    '1023 B'
+    >>> _format_size(1536)
+    '1.5 KiB'
+
+    :param size: The size in bytes
+    :return: The size with a binary unit suffix
+
+    """
+    if size < KIBIBYTE:
+        return f"{size:.0f} B"
+    for unit in ["KiB", "MiB", "GiB"]:
+        size /= KIBIBYTE
+        if size < KIBIBYTE:
+            return f"{size:.1f} {unit}"
+    return f"{size / KIBIBYTE:.1f} TiB"
+
+
+def warm(argv: list[str]) -> int:
+    """Lint a baseline revision and store its linter messages in the cache.
+
+    The same options and paths as for a normal Graylint run are accepted, and the
+    baseline revision is the first revision of the ``-r`` / ``--revision`` option.
+    Later runs with ``--cache`` and the same baseline, linters and paths use the cached
+    baseline.
+
+    :param argv: Graylint command line arguments
+    :raises ValueError: if the paths aren't in a Git repository
+    :return: The exit code
+
+    """
+    args, _config, _config_nondefault = parse_command_line(
+        make_argument_parser, argv, "graylint", GraylintConfig
+    )
+    setup_logging(args.log_level)
+    linter_limits = parse_linter_limit_args(
+        args.timeout, args.cpu_limit, args.memory_limit
+    )
+    paths, root = resolve_paths(None, args.src)
+    git_root = git_get_root(root)
+    if not git_root:
+        message = f"Warming the cache requires a Git repository, {root} isn't one"
+        raise ValueError(message)
+    revrange = RevisionRange.parse_with_common_ancestor(
+        args.revision, root, stdin_mode=False
+    )
+    with linter_servers(keep_daemons=args.keep_daemons):
+        get_baseline(
+            [shlex_split(one_linter) for one_linter in args.lint],
+            git_root,
+            {path.resolve().relative_to(git_root) for path in paths},
+            revrange.rev1,
+            cache=make_cache_storage(args.cache_backend, args.cache_location),
+            linter_limits=linter_limits,
+        )
+    return 0
+
+
+def stats(cache: CacheStorage, stream: TextIO) -> int:
+    """Print the number, total size and age of cache entries.
+
+    :param cache: The cache to describe
+    :param stream: The stream to print statistics to
+    :return: The exit code
+
+    """
+    entries = cache.entries()
+    print(f"Cache location: {cache.location}", file=stream)
+    print(f"Entries: {len(entries)}", file=stream)
+    total_size = _format_size(sum(entry.size for entry in entries))
+    print(f"Total size: {total_size}", file=stream)
+    if entries:
+        now = time.time()
+        for label, entry in [("Least", entries[0]), ("Most", entries[-1])]:
+            days = (now - entry.last_used) / SECONDS_PER_DAY
+            print(f"{label} recently used: {days:.1f} days ago", file=stream)
+    return 0
+
+
+def gc(cache: CacheStorage, max_size: str, max_age_days: float, stream: TextIO) -> int:
+    """Remove old and least recently used entries from the cache.
+
+    :param cache: The cache to clean up
+    :param max_size: The maximum total size of the cache, e.g. ``500M``
+    :param max_age_days: Remove entries not used in this many days
+    :param stream: The stream to print a summary to
+    :return: The exit code
+
+    """
+    removed = cache.gc(parse_memory_size(max_size), max_age_days * SECONDS_PER_DAY)
+    freed = _format_size(sum(entry.size for entry in removed))
+    print(f"Removed {len(removed)} entries, freed {freed}", file=stream)
+    return 0
+
+
+def make_cache_argument_parser() -> ArgumentParser:
+    """Create the argument parser for the ``graylint cache`` command.
+
+    :return: The argument parser
+
+    """
+    parser = ArgumentParser(
+        prog="graylint cache", description="Manage the Graylint baseline cache."
+    )
+    storage_parser = ArgumentParser(add_help=False)
+    storage_parser.add_argument(
+        "--cache-backend",
+        default=DEFAULT_CACHE_STORAGE,
+        metavar="NAME",
+        help=hlp.CACHE_BACKEND,
+    )
+    storage_parser.add_argument(
+        "--cache-location", metavar="LOCATION", help=hlp.CACHE_LOCATION
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser(
+        "warm",
+        help="Lint a baseline revision and store it in the cache",
+        description="Lint a baseline revision and store it in the cache. Accepts the"
+        " same options and paths as Graylint, e.g."
+        " `graylint cache warm --rev main -L mypy src`.",
+    )
+    subparsers.add_parser(
+        "stats", parents=[storage_parser], help="Show cache statistics"
+    )
+    gc_parser = subparsers.add_parser(
+        "gc",
+        parents=[storage_parser],
+        help="Remove old and least recently used cache entries",
+    )
+    gc_parser.add_argument(
+        "--max-size",
+        default=DEFAULT_MAX_SIZE,
+        metavar="SIZE",
+        help="Evict least recently used entries until the cache is at most `SIZE`"
+        " bytes. A `K`, `M`, `G` or `T` suffix can be used.",
+    )
+    gc_parser.add_argument(
+        "--max-age",
+        type=float,
+        default=DEFAULT_MAX_AGE_DAYS,
+        metavar="DAYS",
+        help="Remove entries not used in `DAYS` days",
+    )
+    return parser
+
+
+def main(argv: list[str]) -> int:
+    """Run a ``graylint cache`` subcommand.
+
+    :param argv: The command line arguments after ``graylint cache``
+    :return: The exit code
+
+    """
+    parser = make_cache_argument_parser()
+    args, remaining = parser.parse_known_args(argv)
+    if args.command == "warm":
+        return warm(remaining)
+    if remaining:
+        parser.error(f"unrecognized arguments: {' '.join(remaining)}")
+    cache = make_cache_storage(args.cache_backend, args.cache_location)
+    if not cache.supports_listing:
+        parser.error(
+            f"graylint cache {args.command} isn't supported by the"
+            f" {args.cache_backend} cache backend"
+        )
+    if args.command == "stats":
+        return stats(cache, sys.stdout)
+    return gc(cache, args.max_size, args.max_age, sys.stdout)
@@ -0,0 +1 @@
+"""Built-in cache storage backend plugins."""
@@ -0,0 +1,100 @@
+"""Base class for cache storage backend plugins."""
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable, ClassVar, TypeVar
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class CacheEntry:
+    """A stored cache entry, with its size and the time it was last used."""
+
+    key: str
+    path: Path
+    size: int
+    last_used: float
+
+
+class CacheStorage(ABC):
+    """Base class for cache storage backends.
+
+    A backend stores files by a cache key. Entries are passed to and from the backend
+    as files, so e.g. baselines can be memory-mapped directly from a local cache.
+
+    """
+
+    #: ``True`` if the backend implements `entries` and `gc`
+    supports_listing: ClassVar[bool] = False
+
+    def __init__(self, location: str) -> None:
+        """Use the storage at the given location.
+
+        :param location: The backend specific location, e.g. a directory or a URL
+
+        """
+        self.location = location
+
+    @classmethod
+    def get_default_location(cls) -> str | None:
+        """Return the location to use if none is given.
+
+        :return: The default location, or ``None`` if a location must be given
+
+        """
+        return None
+
+    @abstractmethod
+    def get(self, key: str, read: Callable[[Path], T]) -> T | None:
+        """Read a cache entry.
+
+        :param key: The cache key
+        :param read: A function which reads the entry from the given file
+        :return: The return value of ``read``, or ``None`` if the entry isn't cached
+
+        """
+
+    @abstractmethod
+    def put(self, key: str, write: Callable[[Path], object]) -> None:
+        """Store a cache entry, replacing an existing entry with the same key.
+
+        :param key: The cache key
+        :param write: A function which writes the entry into the given file
+
+        """
+
+    def entries(self) -> list[CacheEntry]:
+        """List all entries in the cache.
+
+        Only supported if `supports_listing` is ``True``.
+
+        :raises NotImplementedError: if the backend can't list its entries
+        :return: The cache entries, least recently used first
+
+        """
+        message = f"Listing entries isn't supported by {type(self).__name__}"
+        raise NotImplementedError(message)
+
+    def gc(
+        self,
+        max_size: int,  # pylint: disable=unused-argument
+        max_age: float,  # pylint: disable=unused-argument
+    ) -> list[CacheEntry]:
+        """Remove old entries, and least recently used ones until the cache fits.
+
+        Only supported if `supports_listing` is ``True``.
+
+        :param max_size: The maximum total size of the cache entries in bytes
+        :param max_age: Remove entries last used more than this many seconds ago
+        :raises NotImplementedError: if the backend doesn't support garbage collection
+        :return: The removed entries
+
+        """
+        message = f"Garbage collection isn't supported by {type(self).__name__}"
+        raise NotImplementedError(message)
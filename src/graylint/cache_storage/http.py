@@ -0,0 +1,190 @@
+"""Cache storage backend for a remote server speaking a simple HTTP protocol.
+
+The protocol is the content-addressed HTTP cache protocol of e.g. ``bazel-remote``. The
+content of an entry is stored with ``PUT /cas/<sha256>``, where ``<sha256>`` is the
+SHA-256 hash of the content. The hash is then stored with ``PUT /ac/<key>`` under the
+cache key. Reading an entry fetches both in the same order with ``GET`` requests, and
+verifies the hash of the content. ``bazel-remote`` needs to be run with the
+``--disable_http_ac_validation`` option, since the entries under ``/ac/`` aren't Bazel
+action results.
+
+Any error in communicating with the server is logged as a warning and treated like a
+cache miss, so an unavailable cache server never prevents linting.
+
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+from contextlib import suppress
+from http import HTTPStatus
+from io import BytesIO
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+from typing import TYPE_CHECKING, Callable, TypeVar
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+
+from graylint.cache_storage.base import CacheStorage
+
+if TYPE_CHECKING:
+    from typing import IO, BinaryIO
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+TIMEOUT = 60.0
+CHUNK_SIZE = 1024 * 1024
+
+
+class HttpCacheStorage(CacheStorage):
+    """Cache entries on a remote HTTP server, e.g. ``bazel-remote``.
+
+    The server manages the size of the cache itself, so entries can't be listed or
+    garbage collected from Graylint.
+
+    """
+
+    def __init__(self, location: str) -> None:
+        """Use the cache server at the given base URL.
+
+        :param location: The base URL of the cache server, e.g.
+                         ``http://cache.example.com:8080``
+
+        """
+        super().__init__(location)
+        self._base_url = location.rstrip("/")
+
+    def _request(
+        self, method: str, path: str, data: bytes | BinaryIO | None = None
+    ) -> Request:
+        """Create a request to the cache server.
+
+        :param method: The HTTP method
+        :param path: The path of the resource relative to the base URL
+        :param data: The request body for ``PUT`` requests
+        :return: The request object
+
+        """
+        return Request(  # noqa: S310
+            f"{self._base_url}/{path}", data=data, method=method
+        )
+
+    def _download(self, path: str, destination: IO[bytes]) -> str | None:
+        """Download a resource into a file, calculating its SHA-256 hash on the fly.
+
+        :param path: The path of the resource relative to the base URL
+        :param destination: The file to write the content into
+        :raises HTTPError: if the server responds with an error other than 404
+        :return: The SHA-256 hash of the content, or ``None`` if it doesn't exist
+
+        """
+        digest = hashlib.sha256()
+        try:
+            with urlopen(  # noqa: S310  # nosec
+                self._request("GET", path), timeout=TIMEOUT
+            ) as response:
+                while chunk := response.read(CHUNK_SIZE):
+                    digest.update(chunk)
+                    destination.write(chunk)
+        except HTTPError as exc:
+            if exc.code == HTTPStatus.NOT_FOUND:
+                return None
+            raise
+        return digest.hexdigest()
+
+    def _upload(self, path: str, data: bytes | BinaryIO, size: int) -> None:
+        """Upload content to the cache server.
+
+        :param path: The path of the resource relative to the base URL
+        :param data: The content to upload
+        :param size: The size of the content in bytes
+
+        """
+        request = self._request("PUT", path, data)
+        request.add_header("Content-Length", str(size))
+        with urlopen(request, timeout=TIMEOUT):  # noqa: S310  # nosec
+            pass
+
+    def get(self, key: str, read: Callable[[Path], T]) -> T | None:
+        """Download a cache entry into a temporary file and read it.
+
+        :param key: The cache key
+        :param read: A function which reads the entry from the given file
+        :return: The return value of ``read``, or ``None`` if the entry isn't cached or
+                 can't be downloaded
+
+        """
+        with NamedTemporaryFile(delete=False) as temp_file:
+            temp_path = Path(temp_file.name)
+            try:
+                content_hash = self._get_content_hash(key)
+                actual_hash = (
+                    self._download(f"cas/{content_hash}", temp_file)
+                    if content_hash
+                    else None
+                )
+            except OSError as exc:
+                logger.warning("Unable to read %s from %s: %s", key, self.location, exc)
+                content_hash = actual_hash = None
+        try:
+            if actual_hash is None:
+                logger.debug("Cache miss for %s", key)
+                return None
+            if actual_hash != content_hash:
+                logger.warning("Ignoring corrupted cache entry %s", key)
+                return None
+            logger.debug("Cache hit for %s", key)
+            return read(temp_path)
+        finally:
+            # On Windows, the file can't be removed if ``read`` memory-mapped it
+            with suppress(OSError):
+                temp_path.unlink()
+
+    def _get_content_hash(self, key: str) -> str | None:
+        """Look up the SHA-256 hash of the content of a cache entry.
+
+        :param key: The cache key
+        :return: The content hash, or ``None`` if the key isn't in the cache or the
+                 stored hash is invalid
+
+        """
+        hash_data = BytesIO()
+        if not self._download(f"ac/{key}", hash_data):
+            return None
+        try:
+            return hash_data.getvalue().decode("ascii").strip()
+        except ValueError:
+            # Also catches `UnicodeDecodeError`
+            logger.warning("Ignoring invalid content hash for cache entry %s", key)
+            return None
+
+    def put(self, key: str, write: Callable[[Path], object]) -> None:
+        """Write a cache entry into a temporary file and upload it.
+
+        :param key: The cache key
+        :param write: A function which writes the entry into the given file
+
+        """
+        with NamedTemporaryFile(delete=False) as temp_file:
+            temp_path = Path(temp_file.name)
+        try:
+            write(temp_path)
+            digest = hashlib.sha256()
+            with temp_path.open("rb") as entry_file:
+                while chunk := entry_file.read(CHUNK_SIZE):
+                    digest.update(chunk)
+                entry_file.seek(0)
+                content_hash = digest.hexdigest()
+                self._upload(
+                    f"cas/{content_hash}", entry_file, temp_path.stat().st_size
+                )
+            self._upload(f"ac/{key}", content_hash.encode("ascii"), len(content_hash))
+        except OSError as exc:
+            logger.warning("Unable to store %s in %s: %s", key, self.location, exc)
+        else:
+            logger.debug("Stored %s in %s", key, self.location)
+        finally:
+            temp_path.unlink(missing_ok=True)
@@ -0,0 +1,213 @@
+"""Cache storage backend for a directory on the local file system.
+
+Many Graylint processes can use the same cache directory concurrently. Entries are
+written into temporary files and atomically renamed into place, and reads, writes and
+garbage collection are serialized using a lock file.
+
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+from typing import TYPE_CHECKING, Callable, TypeVar
+
+from graylint.cache_storage.base import CacheEntry, CacheStorage
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+CACHE_DIR_ENV = "GRAYLINT_CACHE_DIR"
+LOCK_FILE_NAME = "lock"
+TEMP_FILE_PREFIX = ".tmp-"
+
+
+def get_cache_dir() -> Path:
+    """Return the directory for the Graylint cache.
+
+    The ``GRAYLINT_CACHE_DIR`` environment variable can be used to choose the
+    directory. The default is ``graylint`` in the user cache directory.
+
+    :return: The path of the cache directory
+
+    """
+    if os.environ.get(CACHE_DIR_ENV):
+        return Path(os.environ[CACHE_DIR_ENV])
+    if sys.platform == "win32":
+        user_cache = Path(os.environ.get("LOCALAPPDATA", Path.home() / "AppData/Local"))
+    elif os.environ.get("XDG_CACHE_HOME"):
+        user_cache = Path(os.environ["XDG_CACHE_HOME"])
+    else:
+        user_cache = Path.home() / ".cache"
+    return user_cache / "graylint"
+
+
+@contextmanager
+def lock_file(path: Path, *, exclusive: bool, blocking: bool = True) -> Iterator[None]:
+    """Hold a lock on a file while in the context.
+
+    On Windows, all locks are exclusive.
+
+    :param path: The path of the lock file, created if it doesn't exist
+    :param exclusive: ``True`` for an exclusive lock, ``False`` for a shared lock
+    :param blocking: ``False`` to fail instead of waiting if the file is already locked
+    :raises OSError: if ``blocking`` is ``False`` and the file is already locked
+    :return: A context manager which holds the lock
+
+    """
+    with path.open("a+b") as handle:
+        if sys.platform == "win32":
+            # pylint: disable-next=import-outside-toplevel,import-error
+            import msvcrt  # noqa: PLC0415
+
+            mode = msvcrt.LK_LOCK if blocking else msvcrt.LK_NBLCK
+            msvcrt.locking(handle.fileno(), mode, 1)
+            try:
+                yield
+            finally:
+                handle.seek(0)
+                msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl  # noqa: PLC0415  # pylint: disable=import-outside-toplevel
+
+            operation = fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH
+            fcntl.flock(handle, operation if blocking else operation | fcntl.LOCK_NB)
+            try:
+                yield
+            finally:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+
+
+class LocalCacheStorage(CacheStorage):
+    """Cache entries as files in a local directory.
+
+    The modification time of an entry is updated each time it's used, so garbage
+    collection can evict least recently used entries first.
+
+    """
+
+    supports_listing = True
+
+    def __init__(self, location: str) -> None:
+        """Use the given cache directory, creating it if needed.
+
+        :param location: The root directory of the cache
+
+        """
+        super().__init__(location)
+        self.directory = Path(location)
+        self._entries_dir = self.directory / "baselines"
+        self._entries_dir.mkdir(parents=True, exist_ok=True)
+        self._lock_path = self.directory / LOCK_FILE_NAME
+
+    @classmethod
+    def get_default_location(cls) -> str:
+        """Return the user cache directory, or ``GRAYLINT_CACHE_DIR`` if set.
+
+        :return: The path of the default cache directory
+
+        """
+        return str(get_cache_dir())
+
+    def _path(self, key: str) -> Path:
+        """Return the path of the file for a cache entry.
+
+        :param key: The cache key
+        :return: The path of the entry, in a subdirectory named after the key prefix
+
+        """
+        return self._entries_dir / key[:2] / key
+
+    def get(self, key: str, read: Callable[[Path], T]) -> T | None:
+        """Read a cache entry and mark it as used.
+
+        :param key: The cache key
+        :param read: A function which reads the entry from the given file
+        :return: The return value of ``read``, or ``None`` if the entry isn't cached
+
+        """
+        path = self._path(key)
+        with lock_file(self._lock_path, exclusive=False):
+            if not path.is_file():
+                logger.debug("Cache miss for %s", key)
+                return None
+            os.utime(path)
+            logger.debug("Cache hit for %s", key)
+            return read(path)
+
+    def put(self, key: str, write: Callable[[Path], object]) -> None:
+        """Store a cache entry, replacing an existing entry with the same key.
+
+        The entry is first written into a temporary file which is renamed into place
+        only when complete. This way, other processes never see partially written
+        entries.
+
+        :param key: The cache key
+        :param write: A function which writes the entry into the given file
+
+        """
+        path = self._path(key)
+        path.parent.mkdir(exist_ok=True)
+        with NamedTemporaryFile(
+            dir=path.parent, prefix=TEMP_FILE_PREFIX, delete=False
+        ) as temp_file:
+            temp_path = Path(temp_file.name)
+        try:
+            write(temp_path)
+            with lock_file(self._lock_path, exclusive=True):
+                temp_path.replace(path)
+        finally:
+            temp_path.unlink(missing_ok=True)
+        logger.debug("Stored %s in the cache", key)
+
+    def entries(self) -> list[CacheEntry]:
+        """List all complete entries in the cache.
+
+        :return: The cache entries, least recently used first
+
+        """
+        result = []
+        for path in self._entries_dir.glob("*/*"):
+            if path.name.startswith(TEMP_FILE_PREFIX):
+                continue
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue  # removed by another process
+            result.append(CacheEntry(path.name, path, stat.st_size, stat.st_mtime))
+        return sorted(result, key=lambda entry: entry.last_used)
+
+    def gc(self, max_size: int, max_age: float) -> list[CacheEntry]:
+        """Remove old entries, and least recently used ones until the cache fits.
+
+        :param max_size: The maximum total size of the cache entries in bytes
+        :param max_age: Remove entries last used more than this many seconds ago
+        :return: The removed entries
+
+        """
+        removed = []
+        with lock_file(self._lock_path, exclusive=True):
+            entries = self.entries()
+            total_size = sum(entry.size for entry in entries)
+            oldest_allowed = time.time() - max_age
+            for entry in entries:
+                if entry.last_used >= oldest_allowed and total_size <= max_size:
+                    break
+                try:
+                    entry.path.unlink()
+                except OSError as exc:
+                    # e.g. on Windows, an entry memory-mapped by another process
+                    logger.warning("Unable to remove %s: %s", entry.path, exc)
+                    continue
+                total_size -= entry.size
+                removed.append(entry)
+        return removed
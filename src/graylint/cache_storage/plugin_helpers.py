@@ -0,0 +1,38 @@
+"""Helpers for using cache storage backend plugins."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, cast
+
+from darkgraylib.plugins import get_entry_point_names, get_plugin_class
+
+if TYPE_CHECKING:
+    from graylint.cache_storage.base import CacheStorage
+
+CACHE_STORAGE_GROUP = "graylint.cache_storage"
+DEFAULT_CACHE_STORAGE = "local"
+
+
+def create_cache_storage(name: str, location: str | None) -> CacheStorage:
+    """Create a cache storage backend plugin.
+
+    :param name: The name of the cache storage entry point
+    :param location: The location of the cache, or ``None`` to use the default location
+                     of the backend
+    :raises ValueError: if there's no backend with the given name, or the backend has no
+                        default location and none was given
+    :return: The cache storage backend object
+
+    """
+    names = get_entry_point_names(CACHE_STORAGE_GROUP)
+    if name not in names:
+        message = f"Unknown cache backend {name!r}, choose from {', '.join(names)}"
+        raise ValueError(message)
+    storage_class = cast(
+        "type[CacheStorage]", get_plugin_class(CACHE_STORAGE_GROUP, name)
+    )
+    location = location or storage_class.get_default_location()
+    if not location:
+        message = f"The {name!r} cache backend requires a cache location"
+        raise ValueError(message)
+    return storage_class(location)
@@ -3,17 +3,18 @@
 from __future__ import annotations
 
 import shlex
-from argparse import Action, ArgumentParser, Namespace
+from argparse import Action, ArgumentError, ArgumentParser, Namespace
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any, Sequence
 
 import darkgraylib.command_line
-from darkgraylib.plugins import get_entry_point_names
 from darkgraylib.utils import WINDOWS
 from graylint import help as hlp
+from graylint.cache_storage.plugin_helpers import DEFAULT_CACHE_STORAGE
+from graylint.limits import LinterLimits, parse_duration, parse_linter_limits
 from graylint.output.destination import OutputDestination
-from graylint.output.plugin_helpers import OUTPUT_FORMAT_GROUP
+from graylint.output.plugin_helpers import get_output_format_names
 from graylint.version import __version__
 
 
@@ -72,7 +73,7 @@ class OutputSpec:
         else:
             fmt, path_str = value, "-"
 
-        if fmt not in get_entry_point_names(OUTPUT_FORMAT_GROUP):
+        if fmt not in get_output_format_names():
             message = f"Unknown output format: {fmt}"
             raise ValueError(message)
 
@@ -83,6 +84,125 @@ class OutputSpec:
         return OutputSpec(self.format, self.path, use_color)
 
 
+@dataclass
+class LinterOutputSpec:
+    """Specification for reading saved output of a linter instead of running it."""
+
+    linter: str
+    path: Path
+
+    @classmethod
+    def parse(cls, value: str) -> LinterOutputSpec:
+        """Parse a ``LINTER=PATH`` string into a `LinterOutputSpec` object.
+
+        :param value: The linter name and output file path, separated by ``=``
+        :raises ValueError: if the linter name or path is missing
+        :return: The parsed linter output specification
+
+        """
+        linter, separator, path_str = value.partition("=")
+        if not separator or not linter or not path_str:
+            message = f"Expected LINTER=PATH, got {value!r}"
+            raise ValueError(message)
+        return cls(linter, Path(path_str))
+
+
+def validate_linter_output_specs(specs: Sequence[LinterOutputSpec]) -> None:
+    """Make sure standard input is used for at most one linter output.
+
+    :param specs: All linter output specifications from the command line
+    :raises ArgumentError: if more than one linter output is read from standard input
+
+    """
+    if sum(spec.path == Path("-") for spec in specs) > 1:
+        message = "Only one linter output can be read from standard input"
+        raise ArgumentError(None, message)
+
+
+def parse_linter_limit_args(
+    timeouts: Sequence[str], cpu_limits: Sequence[str], memory_limits: Sequence[str]
+) -> dict[str, LinterLimits]:
+    """Parse ``--timeout``, ``--cpu-limit`` and ``--memory-limit`` values.
+
+    :param timeouts: The ``--timeout`` option values
+    :param cpu_limits: The ``--cpu-limit`` option values
+    :param memory_limits: The ``--memory-limit`` option values
+    :raises ArgumentError: if a limit value is invalid
+    :return: Limits by linter name, with the empty string for limits of all linters
+
+    """
+    try:
+        return parse_linter_limits(timeouts, cpu_limits, memory_limits)
+    except ValueError as exc:
+        message = f"Invalid linter limit: {exc}"
+        raise ArgumentError(None, message) from exc
+
+
+def validate_revision_args(args: Namespace) -> None:
+    """Make sure modes which choose revisions or files only use supported options.
+
+    ``--each-commit`` and multiple revisions lint several baseline revisions in one
+    run, so they can't be combined with each other or with options which assume a
+    single baseline. With ``--time-budget``, Graylint chooses and orders the files to
+    lint itself. ``--staged`` lints scratch trees written from the index, which can't be
+    compared to the full checkouts used in the other modes.
+
+    :param args: The parsed command line arguments
+    :raises ArgumentError: if an unsupported combination of options is used
+
+    """
+    if args.each_commit:
+        mode = "--each-commit"
+    elif len(args.revisions) > 1:
+        mode = "Multiple --revision options"
+    elif args.time_budget is not None:
+        mode = "--time-budget"
+    else:
+        return
+    unsupported = [
+        option
+        for option, value in [
+            ("--each-commit", args.each_commit and len(args.revisions) > 1),
+            ("--time-budget", mode != "--time-budget" and args.time_budget is not None),
+            ("--staged", args.staged),
+            ("--linter-output", args.linter_output),
+            ("--baseline-linter-output", args.baseline_linter_output),
+            ("--save-baseline", args.save_baseline),
+            ("--load-baseline", args.load_baseline),
+            ("--cache", args.cache),
+            ("--max-messages", args.max_messages),
+            ("--import-depth", args.import_depth is not None),
+            ("--expand-directories", args.expand_directories),
+        ]
+        if value
+    ]
+    if unsupported:
+        message = f"{mode} can't be used with {', '.join(unsupported)}"
+        raise ArgumentError(None, message)
+
+
+class AppendRevisionAction(Action):
+    """Action to collect all ``-r`` / ``--revision`` options given on the command line.
+
+    The first revision is stored as ``revision`` like in other Darkgraylib based tools,
+    so it can still be set in the configuration file. All revisions from the command
+    line are collected in ``revisions``.
+
+    """
+
+    def __call__(
+        self,
+        parser: ArgumentParser,  # noqa: ARG002
+        namespace: Namespace,
+        values: str | Sequence[Any] | None,
+        option_string: str | None = None,  # noqa: ARG002
+    ) -> None:
+        """Store the first revision and append each revision to the list."""
+        if not namespace.revisions:
+            setattr(namespace, self.dest, values)
+        namespace.revisions = [*namespace.revisions, values]
+
+
 def parse_format_args(value: str) -> list[OutputSpec]:
     """Parse comma-separated format specifications."""
     return [OutputSpec.parse(v.strip()) for v in value.split(",")]
@@ -95,7 +215,7 @@ def make_argument_parser(require_src: bool) -> ArgumentParser:
                         on the command line. ``False`` to not require on.
 
     """
-    parser = darkgraylib.command_line.make_argument_parser(
+    base_parser = darkgraylib.command_line.make_argument_parser(
         require_src,
         "Graylint",
         hlp.DESCRIPTION,
@@ -103,11 +223,34 @@ def make_argument_parser(require_src: bool) -> ArgumentParser:
         " won't read this configuration file.",
         __version__,
     )
+    # Inherit the Darkgraylib options, but allow replacing the ``-r`` / ``--revision``
+    # option with one which can be repeated to compare the working tree against
+    # multiple baseline revisions
+    parser = ArgumentParser(
+        description=base_parser.description,
+        formatter_class=base_parser.formatter_class,
+        parents=[base_parser],
+        add_help=False,
+        conflict_handler="resolve",
+    )
 
+    parser.add_argument(
+        "-r",
+        "--revision",
+        action=AppendRevisionAction,
+        default="HEAD",
+        metavar="REV",
+        help=hlp.REVISION,
+    )
+    parser.set_defaults(revisions=[])
+    # Replace the ``-W`` / ``--workers`` option to make its default the available cores
+    parser.add_argument(
+        "-W", "--workers", type=int, dest="workers", default=0, help=hlp.WORKERS
+    )
     parser.add_argument(
         "-L", "--lint", action="append", metavar="CMD", default=[], help=hlp.LINT
     )
-    output_formats = get_entry_point_names(OUTPUT_FORMAT_GROUP)
+    output_formats = get_output_format_names()
     default_output_format = output_formats[0]
     output_format_names = ", ".join(
         f"{name} (default)" if name == default_output_format else name
@@ -122,4 +265,69 @@ def make_argument_parser(require_src: bool) -> ArgumentParser:
         default=[OutputSpec("gnu", OutputDestination(Path("-")))],
         help=hlp.FORMAT_TEMPLATE.format(output_format_names=output_format_names),
     )
+    parser.add_argument(
+        "--linter-output",
+        action="append",
+        type=LinterOutputSpec.parse,
+        metavar="LINTER=PATH",
+        default=[],
+        help=hlp.LINTER_OUTPUT,
+    )
+    parser.add_argument(
+        "--baseline-linter-output",
+        action="append",
+        type=LinterOutputSpec.parse,
+        metavar="LINTER=PATH",
+        default=[],
+        help=hlp.BASELINE_LINTER_OUTPUT,
+    )
+    parser.add_argument(
+        "--max-messages", type=int, metavar="N", default=None, help=hlp.MAX_MESSAGES
+    )
+    parser.add_argument(
+        "--fail-fast",
+        action="store_const",
+        dest="max_messages",
+        const=1,
+        help=hlp.FAIL_FAST,
+    )
+    for option, metavar, help_text in [
+        ("--timeout", "[LINTER=]DURATION", hlp.TIMEOUT),
+        ("--cpu-limit", "[LINTER=]SECONDS", hlp.CPU_LIMIT),
+        ("--memory-limit", "[LINTER=]SIZE", hlp.MEMORY_LIMIT),
+    ]:
+        parser.add_argument(
+            option, action="append", metavar=metavar, default=[], help=help_text
+        )
+    parser.add_argument(
+        "--import-depth", type=int, metavar="N", default=None, help=hlp.IMPORT_DEPTH
+    )
+    parser.add_argument(
+        "--expand-directories", action="store_true", help=hlp.EXPAND_DIRECTORIES
+    )
+    parser.add_argument(
+        "--time-budget",
+        type=parse_duration,
+        metavar="DURATION",
+        default=None,
+        help=hlp.TIME_BUDGET,
+    )
+    parser.add_argument("--each-commit", action="store_true", help=hlp.EACH_COMMIT)
+    parser.add_argument("--staged", action="store_true", help=hlp.STAGED)
+    parser.add_argument("--cache", action="store_true", help=hlp.CACHE)
+    parser.add_argument(
+        "--cache-backend",
+        default=DEFAULT_CACHE_STORAGE,
+        metavar="NAME",
+        help=hlp.CACHE_BACKEND,
+    )
+    parser.add_argument("--cache-location", metavar="LOCATION", help=hlp.CACHE_LOCATION)
+    parser.add_argument("--keep-daemons", action="store_true", help=hlp.KEEP_DAEMONS)
+    baseline_file_group = parser.add_mutually_exclusive_group()
+    baseline_file_group.add_argument(
+        "--save-baseline", metavar="PATH", help=hlp.SAVE_BASELINE
+    )
+    baseline_file_group.add_argument(
+        "--load-baseline", metavar="PATH", help=hlp.LOAD_BASELINE
+    )
     return parser
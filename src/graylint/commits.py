@@ -0,0 +1,226 @@
+"""Lint a series of commits, using each commit as the baseline for the next one.
+
+This is used e.g. for checking each commit of a pull request separately, or for finding
+out when a linter message first appeared. Instead of linting both sides of each pair of
+consecutive commits from scratch, each commit is linted only once in a single temporary
+checkout, which is moved from one commit to the next. For linters which check each file
+separately, only files changed in a commit are re-linted, and messages for other files
+are carried over from the previous commit. If a commit changes the configuration file of
+a linter, all files are re-linted with it.
+
+"""
+
+from __future__ import annotations
+
+import logging
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import TYPE_CHECKING
+
+from darkgraylib.git import (
+    WORKTREE,
+    RevisionRange,
+    git_check_output_lines,
+    git_clone_local,
+    git_get_root,
+    git_rev_parse,
+)
+from graylint.limits import get_linter_limits
+from graylint.linting import (
+    _create_line_mapping,
+    _print_new_linter_messages,
+    get_changed_paths,
+    make_linter_env,
+    normalize_whitespace,
+    run_linter,
+)
+from graylint.profiles import get_config_files, get_linter_profile
+
+if TYPE_CHECKING:
+    from collections.abc import Collection, Mapping, Sequence
+
+    from graylint.command_line import OutputSpec
+    from graylint.limits import LinterLimits
+    from graylint.linting import LinterMessage, MessageLocation
+
+logger = logging.getLogger(__name__)
+
+
+def list_revisions(root: Path, revrange: RevisionRange) -> list[str]:
+    """List the revisions to lint one after another, starting from the baseline.
+
+    :param root: The root of the Git repository
+    :param revrange: The first baseline revision and the last revision to lint
+    :return: Commit hashes of ``rev1`` and each commit after it on the first-parent
+             history of ``rev2``, followed by ``WORKTREE`` if ``rev2`` is the working
+             tree
+
+    """
+    rev1_commit = git_rev_parse(revrange.rev1, root)
+    last_commit = revrange.rev2 if revrange.rev2 != WORKTREE else "HEAD"
+    commits = git_check_output_lines(
+        ["rev-list", "--reverse", "--first-parent", f"{rev1_commit}..{last_commit}"],
+        root,
+    )
+    return [rev1_commit, *commits, *([WORKTREE] if revrange.rev2 == WORKTREE else [])]
+
+
+def _lint_revision(  # noqa: PLR0913  # pylint: disable=too-many-arguments
+    linter_cmdlines: list[list[str]],
+    root: Path,
+    paths: Collection[Path],
+    env: dict[str, str],
+    *,
+    previous: Sequence[dict[MessageLocation, LinterMessage]] | None,
+    changed_paths: Collection[Path],
+    linter_limits: Mapping[str, LinterLimits] | None = None,
+) -> list[dict[MessageLocation, LinterMessage]]:
+    """Run linters on one revision, re-linting only changed files where possible.
+
+    :param linter_cmdlines: The command lines for running the linters
+    :param root: The root of the checkout to lint
+    :param paths: Paths of files to check, relative to ``root``
+    :param env: Environment variables to pass to the linters
+    :param previous: Messages of each linter for the previous revision, or ``None`` if
+                     this is the first revision
+    :param changed_paths: Files in the repository changed since the previous revision
+    :param linter_limits: Time and resource limits by linter name
+    :return: Messages of each linter for this revision
+
+    """
+    result = []
+    for index, cmdline in enumerate(linter_cmdlines):
+        limits = get_linter_limits(linter_limits or {}, cmdline[0])
+        config_files = get_config_files([cmdline])
+        changed_configs = sorted(
+            str(path) for path in changed_paths if path.name in config_files
+        )
+        if changed_configs:
+            logger.debug(
+                "Linting all files with %s since its configuration changed in %s",
+                cmdline[0],
+                ", ".join(changed_configs),
+            )
+        if (
+            previous is None
+            or not get_linter_profile(cmdline).per_file
+            or changed_configs
+        ):
+            result.append(run_linter(cmdline, root, paths, env, limits=limits))
+            continue
+        messages = {
+            location: message
+            for location, message in previous[index].items()
+            if location.path not in changed_paths
+        }
+        existing_paths = {
+            path
+            for path in changed_paths
+            if any(path == linted or linted in path.parents for linted in paths)
+            and (root / path).exists()
+        }
+        if existing_paths:
+            messages.update(
+                run_linter(cmdline, root, existing_paths, env, limits=limits)
+            )
+        result.append(messages)
+    return result
+
+
+def _merge_linter_messages(
+    messages_by_linter: Sequence[dict[MessageLocation, LinterMessage]],
+) -> dict[MessageLocation, list[LinterMessage]]:
+    """Merge messages from all linters into lists of messages by location.
+
+    :param messages_by_linter: Messages of each linter
+    :return: Messages of all linters by location
+
+    """
+    result: dict[MessageLocation, list[LinterMessage]] = {}
+    for messages in messages_by_linter:
+        for location, message in messages.items():
+            result.setdefault(location, []).append(message)
+    return result
+
+
+def run_linters_for_each_commit(  # noqa: PLR0913
+    linter_cmdlines: list[list[str]],
+    root: Path,
+    paths: set[Path],
+    revrange: RevisionRange,
+    output_spec: Sequence[OutputSpec],
+    *,
+    linter_limits: Mapping[str, LinterLimits] | None = None,
+) -> int:
+    """Lint each commit in a range and show messages new compared to its parent.
+
+    The ``rev1`` revision is only used as the baseline for the first commit after it.
+    Messages are tagged with the abbreviated hash of the commit in which they appeared.
+
+    :param linter_cmdlines: The command lines for linter tools to run on the files
+    :param root: The root of the relative paths
+    :param paths: The files and directories to check, relative to ``root``
+    :param revrange: The first baseline revision and the last revision to lint
+    :param output_spec: The output formats and destinations for linter messages
+    :param linter_limits: Time and resource limits by linter name
+    :raises ValueError: if ``root`` is not in a Git repository
+    :return: Total number of new linter messages in all commits
+
+    """
+    # pylint: disable=too-many-arguments,too-many-locals
+    git_root = git_get_root(root)
+    if not git_root:
+        message = f"Linting each commit requires a Git repository, {root} isn't one"
+        raise ValueError(message)
+    git_paths = {(root / path).relative_to(git_root) for path in paths}
+    revisions = list_revisions(git_root, revrange)
+    error_count = 0
+    with (
+        TemporaryDirectory() as tmpdir,
+        git_clone_local(
+            git_root, revisions[0], Path(tmpdir) / git_root.name
+        ) as clone_root,
+    ):
+        logger.info("Linting baseline %s", revisions[0][:7])
+        previous = _lint_revision(
+            linter_cmdlines,
+            clone_root,
+            git_paths,
+            make_linter_env(git_root, revisions[0]),
+            previous=None,
+            changed_paths=(),
+            linter_limits=linter_limits,
+        )
+        for old_revision, revision in zip(revisions, revisions[1:]):
+            step = RevisionRange(old_revision, revision)
+            if revision == WORKTREE:
+                tree = git_root
+            else:
+                git_check_output_lines(
+                    ["checkout", "--quiet", "--detach", revision], clone_root
+                )
+                tree = clone_root
+            logger.info("Linting %s", revision[:7])
+            current = _lint_revision(
+                linter_cmdlines,
+                tree,
+                git_paths,
+                make_linter_env(git_root, revision),
+                previous=previous,
+                changed_paths=get_changed_paths(git_root, step, []),
+                linter_limits=linter_limits,
+            )
+            baseline = {
+                location: [normalize_whitespace(message) for message in messages]
+                for location, messages in _merge_linter_messages(previous).items()
+            }
+            messages = _merge_linter_messages(current)
+            error_count += _print_new_linter_messages(
+                baseline,
+                messages,
+                _create_line_mapping(git_root, {loc.path for loc in messages}, step),
+                output_spec,
+                tag="WORKTREE" if revision == WORKTREE else revision[:7],
+            )
+            previous = current
+    return error_count
@@ -13,5 +13,17 @@ if TYPE_CHECKING:
 class GraylintConfig(BaseConfig):
     """Dictionary representing ``[tool.graylint]`` from ``pyproject.toml``"""
 
+    cache: bool
+    cache_backend: str
+    cache_location: str
+    cpu_limit: list[str]
+    expand_directories: bool
+    import_depth: int
+    keep_daemons: bool
     lint: list[str]
+    linter_profiles: dict[str, dict[str, object]]
+    max_messages: int
+    memory_limit: list[str]
     output_format: dict[str, OutputSpec]
+    time_budget: str
+    timeout: list[str]
@@ -0,0 +1,229 @@
+"""Read coverage.py data files as linter output.
+
+Tools like ``cov_to_lint.py`` turn a coverage database into linter output lines::
+
+    src/module.py:42: no coverage: return result
+
+which Graylint then parses back. Instead, a coverage.py data file like ``.coverage`` can
+be given directly with ``--linter-output`` and ``--baseline-linter-output``. It's read
+with the coverage.py data API, and messages are created only for statements which
+weren't executed in the files being linted. The messages match those of the text output
+after whitespace normalization.
+
+Statements are found with the source code parser of coverage.py instead of its public
+analysis API, because the baseline needs to be analyzed using source code from another
+revision than the one on disk. The parser isn't a public API, so the supported
+coverage.py versions are pinned, and a changed parser is reported as a warning.
+
+"""
+
+from __future__ import annotations
+
+import logging
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from darkgraylib.git import git_get_content_at_revision
+
+if TYPE_CHECKING:
+    from collections.abc import Collection, Iterable, Iterator
+
+logger = logging.getLogger(__name__)
+
+SQLITE_HEADER = b"SQLite format 3\x00"
+NO_COVERAGE = "no coverage:"
+# Keep in sync with the ``coverage`` extra in ``pyproject.toml``
+SUPPORTED_COVERAGE_VERSIONS = ">=7.0,<8"
+
+
+def is_coverage_data(path: Path) -> bool:
+    """Check whether a linter output file is a coverage.py SQLite data file.
+
+    :param path: The path to the linter output, or ``-`` for standard input
+    :return: ``True`` for a regular file starting with the SQLite header
+
+    """
+    if not path.is_file():
+        return False
+    with path.open("rb") as data_file:
+        return data_file.read(len(SQLITE_HEADER)) == SQLITE_HEADER
+
+
+def _is_in_paths(path: Path, paths: Collection[Path] | None) -> bool:
+    """Check whether a file is one of the linted paths or inside one of them.
+
+    :param path: The path of the file, relative to the repository root
+    :param paths: The files and directories being linted, or ``None`` for all files
+    :return: ``True`` if the file is linted
+
+    """
+    return paths is None or any(
+        path == linted_path or linted_path in path.parents for linted_path in paths
+    )
+
+
+def _get_relative_path(measured_file: str, root: Path) -> Path | None:
+    """Convert a file path from a coverage data file to one relative to the root.
+
+    :param measured_file: The measured file path, absolute unless coverage.py was
+                          configured with ``relative_files = true``
+    :param root: The root of the repository
+    :return: The relative path, or ``None`` for files outside ``root``
+
+    """
+    path = Path(measured_file)
+    if not path.is_absolute():
+        return path
+    try:
+        return path.relative_to(root.resolve())
+    except ValueError:
+        return None
+
+
+def _read_lines(path: Path, root: Path, revision: str | None) -> tuple[str, ...]:
+    """Read the lines of a source file in a revision or in the given tree.
+
+    :param path: The path of the file, relative to the repository root
+    :param root: The root of the repository
+    :param revision: The revision to read the file from, or ``None`` to read it from
+                     ``root``
+    :return: The lines of the file, or no lines for a missing file
+
+    """
+    if revision:
+        return git_get_content_at_revision(path, revision, root).lines
+    if not (root / path).is_file():
+        return ()
+    return tuple((root / path).read_text(encoding="utf-8").splitlines())
+
+
+def _get_uncovered_linenums(
+    lines: tuple[str, ...], executed: Iterable[int], exclude: str
+) -> list[int]:
+    """Find the statements of a source file which weren't executed.
+
+    :param lines: The lines of the source file
+    :param executed: Numbers of lines recorded as executed in the coverage data
+    :param exclude: The regular expression for lines excluded from coverage
+    :raises ImportError: if the coverage.py source code parser isn't available
+    :raises AttributeError: if the coverage.py source code parser has changed
+    :return: The sorted line numbers of statements which weren't executed
+
+    """
+    # pylint: disable-next=import-outside-toplevel
+    from coverage.parser import PythonParser  # noqa: PLC0415
+
+    parser = PythonParser(text="\n".join(lines), exclude=exclude)
+    parser.parse_source()
+    return sorted(parser.statements - parser.first_lines(executed) - parser.excluded)
+
+
+def _describe_uncovered_lines(
+    path: Path, lines: tuple[str, ...], linenums: Iterable[int]
+) -> Iterator[tuple[Path, int, str]]:
+    """Create ``no coverage`` descriptions for statements which weren't executed.
+
+    :param path: The path of the file, relative to the repository root
+    :param lines: The lines of the source file
+    :param linenums: Line numbers of statements which weren't executed
+    :return: The path, line number and description for each line, skipping line
+             numbers outside the file
+
+    """
+    for linenum in linenums:
+        if not 1 <= linenum <= len(lines):
+            logger.debug("Skipping coverage for %s:%s outside the file", path, linenum)
+            continue
+        yield path, linenum, f"{NO_COVERAGE} {lines[linenum - 1].strip()}"
+
+
+def _warn_unsupported_coverage(data_file: Path) -> None:
+    """Warn about a coverage.py version with an incompatible source code parser.
+
+    :param data_file: The path to the coverage.py data file which can't be read
+
+    """
+    # pylint: disable-next=import-outside-toplevel
+    from coverage import __version__  # noqa: PLC0415
+
+    logger.warning(
+        "Can't read coverage data from %s with coverage.py %s. Supported versions"
+        " are %s.",
+        data_file,
+        __version__,
+        SUPPORTED_COVERAGE_VERSIONS,
+    )
+
+
+def _warn_outside_root(data_file: Path, root: Path, measured_files: list[str]) -> None:
+    """Warn about measured files which aren't inside the repository.
+
+    :param data_file: The path to the coverage.py data file
+    :param root: The root of the repository
+    :param measured_files: The absolute paths of measured files outside ``root``
+
+    """
+    logger.warning(
+        "Ignoring coverage data for %s files outside %s in %s, e.g. %s. Use"
+        " `relative_files = true` in the coverage.py configuration for data files"
+        " measured in another directory.",
+        len(measured_files),
+        root,
+        data_file,
+        measured_files[0],
+    )
+
+
+def iter_uncovered_lines(
+    data_file: Path,
+    root: Path,
+    paths: Collection[Path] | None = None,
+    revision: str | None = None,
+) -> Iterator[tuple[Path, int, str]]:
+    """Find statements not executed according to a coverage.py data file.
+
+    :param data_file: The path to the coverage.py data file
+    :param root: The root of the repository
+    :param paths: The files and directories being linted, or ``None`` for all files
+    :param revision: The revision to read source code from, or ``None`` to read it from
+                     the files in ``root``
+    :raises RuntimeError: if coverage.py isn't installed
+    :return: The relative path, line number and ``no coverage`` description for each
+             statement which wasn't executed. Files measured outside ``root`` are
+             skipped with a warning.
+
+    """
+    try:
+        # pylint: disable=import-outside-toplevel
+        from coverage import Coverage  # noqa: PLC0415
+        from coverage.misc import join_regex  # noqa: PLC0415
+    except ImportError as exc:
+        message = f"coverage.py is required for reading coverage data from {data_file}"
+        raise RuntimeError(message) from exc
+
+    coverage = Coverage(data_file=str(data_file))
+    coverage.load()
+    exclude = join_regex(coverage.config.exclude_list)
+    try:
+        # Fail early if the coverage.py source code parser isn't compatible
+        _get_uncovered_linenums(("pass",), [1], exclude)
+    except (ImportError, AttributeError):
+        _warn_unsupported_coverage(data_file)
+        return
+    data = coverage.get_data()
+    outside_root = []
+    for measured_file in sorted(data.measured_files()):
+        path = _get_relative_path(measured_file, root)
+        if path is None:
+            outside_root.append(measured_file)
+            continue
+        if path.suffix != ".py" or not _is_in_paths(path, paths):
+            continue
+        lines = _read_lines(path, root, revision)
+        yield from _describe_uncovered_lines(
+            path,
+            lines,
+            _get_uncovered_linenums(lines, data.lines(measured_file) or [], exclude),
+        )
+    if outside_root:
+        _warn_outside_root(data_file, root, outside_root)
@@ -0,0 +1,271 @@
+"""Share a CPU budget between linters running at the same time.
+
+Graylint lints ``rev2`` and the baseline concurrently, and linters like Pylint and
+Flake8 start processes of their own. Running two linters with one process per core each
+oversubscribes the machine, while running them with one process each leaves cores idle.
+
+The CPU budget is the number of cores set with ``-W`` / ``--workers``, or by default the
+cores available to Graylint, limited by the cgroup CPU quota in containers. Each thread
+of work, like linting ``rev2`` or the baseline, runs in a *lane*. Every linter gets an
+equal share of the budget between the open lanes when it starts, and its jobs option or
+environment variable from its profile is set to match, unless the command line already
+sets it. A lane is closed as soon as its work is done, so linters started after that get
+a larger share.
+
+Linter subprocesses for the baseline lane run in the background with a lower CPU
+priority, and on Linux also in the idle I/O scheduling class. The priority is lowered by
+running the linter through the ``nice`` and ``ionice`` commands, so processes started by
+the linter inherit it, and no Python code has to run in the forked subprocess while
+other threads are starting linters of their own.
+
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import shutil
+import threading
+from contextlib import contextmanager
+from functools import cache
+from pathlib import Path
+from typing import TYPE_CHECKING, TypeVar
+
+from darkgraylib.utils import WINDOWS
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+
+    from graylint.profiles import LinterProfile
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Niceness added to linter subprocesses linting the baseline in the background
+BACKGROUND_NICENESS = 10
+
+# The idle I/O scheduling class of ``ionice``
+IONICE_CLASS_IDLE = 3
+
+CGROUP_V2_CPU_MAX = Path("/sys/fs/cgroup/cpu.max")
+CGROUP_V1_CPU_DIR = Path("/sys/fs/cgroup/cpu")
+
+
+def _get_cgroup_cpu_quota() -> float | None:
+    """Read the CPU quota of the cgroup Graylint runs in.
+
+    :return: The number of CPUs the quota allows, or ``None`` if there's no quota
+
+    """
+    try:
+        # "<quota> <period>", or "max <period>" for no quota
+        quota, period = CGROUP_V2_CPU_MAX.read_text(encoding="ascii").split()[:2]
+        return None if quota == "max" else int(quota) / int(period)
+    except (OSError, ValueError):
+        pass
+    try:
+        v1_quota = int((CGROUP_V1_CPU_DIR / "cpu.cfs_quota_us").read_text("ascii"))
+        v1_period = int((CGROUP_V1_CPU_DIR / "cpu.cfs_period_us").read_text("ascii"))
+    except (OSError, ValueError):
+        return None
+    return v1_quota / v1_period if v1_quota > 0 else None
+
+
+@cache
+def get_available_cpus() -> int:
+    """Find the number of CPU cores available to Graylint.
+
+    :return: The cores Graylint is allowed to run on, limited by the cgroup CPU quota
+
+    """
+    if hasattr(os, "sched_getaffinity"):
+        cpus = len(os.sched_getaffinity(0))
+    else:
+        cpus = os.cpu_count() or 1
+    quota = _get_cgroup_cpu_quota()
+    if quota is not None:
+        cpus = min(cpus, int(quota))
+    return max(1, cpus)
+
+
+class _Lane:
+    """A thread of work which runs linters concurrently with other lanes."""
+
+    def __init__(self, budget: CpuBudget, *, background: bool) -> None:
+        self.budget = budget
+        self.background = background
+        self.closed = False
+
+    def run(self, function: Callable[[], T]) -> T:
+        """Run a function in this lane in the current thread, and close the lane.
+
+        :param function: The function to run
+        :return: The return value of the function
+
+        """
+        self.budget.local.background = self.background
+        try:
+            return function()
+        finally:
+            self.budget.local.background = False
+            self.close()
+
+    def close(self) -> None:
+        """Give the share of this lane to the remaining lanes."""
+        with self.budget.lock:
+            if not self.closed:
+                self.closed = True
+                self.budget.open_lanes -= 1
+
+
+class CpuBudget:
+    """The number of CPU cores shared by all linters in a Graylint run."""
+
+    def __init__(self, cpus: int) -> None:
+        """Create a CPU budget.
+
+        :param cpus: The number of CPU cores to share between linters
+
+        """
+        self.cpus = cpus
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.open_lanes = 0
+
+    @contextmanager
+    def lane(self, *, background: bool = False) -> Iterator[_Lane]:
+        """Open a lane for running linters concurrently with other lanes.
+
+        :param background: ``True`` to run linter subprocesses with a lower priority
+        :return: A context manager yielding the lane, which is closed on exit
+
+        """
+        lane = _Lane(self, background=background)
+        with self.lock:
+            self.open_lanes += 1
+        try:
+            yield lane
+        finally:
+            lane.close()
+
+    def share(self) -> int:
+        """Return the number of CPU cores for a linter starting now.
+
+        :return: An equal share of the budget between open lanes, at least one
+
+        """
+        with self.lock:
+            return max(1, self.cpus // max(1, self.open_lanes))
+
+    @property
+    def background(self) -> bool:
+        """``True`` if the current thread runs linters in a background lane."""
+        return bool(getattr(self.local, "background", False))
+
+
+# The CPU budget of this Graylint run, created on first use
+_budgets: list[CpuBudget] = []
+
+
+def set_cpu_budget(cpus: int) -> None:
+    """Set the number of CPU cores shared by linters.
+
+    :param cpus: The number of cores, or ``0`` for the cores available to Graylint
+
+    """
+    _budgets[:] = [CpuBudget(cpus or get_available_cpus())]
+    logger.debug("Linters share a CPU budget of %s cores", _budgets[0].cpus)
+
+
+def get_cpu_budget() -> CpuBudget:
+    """Return the CPU budget of this Graylint run.
+
+    :return: The CPU budget, by default for all cores available to Graylint
+
+    """
+    if not _budgets:
+        set_cpu_budget(0)
+    return _budgets[0]
+
+
+def _has_option(cmdline: list[str], option: str) -> bool:
+    """Check whether a command line sets an option.
+
+    >>> _has_option(["pylint", "-j4"], "--jobs")
+    True
+    >>> _has_option(["pylint", "--jobs", "4"], "--jobs")
+    True
+    >>> _has_option(["pylint", "-j", "4"], "--jobs")
+    True
+    >>> _has_option(["pylint", "--jobs-limit=4", "-jx"], "--jobs")
+    False
+
+    :param cmdline: The command line
+    :param option: The long option, e.g. ``--jobs``, which also matches ``-j``
+    :return: ``True`` if the option or its single-letter short form is given
+
+    """
+    short_option = option[1:3]
+    return any(
+        arg in (option, short_option)
+        or arg.startswith(f"{option}=")
+        or (arg.startswith(short_option) and arg.removeprefix(short_option).isdigit())
+        for arg in cmdline[1:]
+    )
+
+
+def apply_cpu_share(
+    cmdline: list[str], env: dict[str, str], profile: LinterProfile, share: int
+) -> tuple[list[str], dict[str, str]]:
+    """Set the number of parallel processes or threads of a linter.
+
+    >>> from graylint.profiles import LinterProfile
+    >>> apply_cpu_share(["pylint"], {}, LinterProfile(jobs_option="--jobs"), 4)
+    (['pylint', '--jobs=4'], {})
+    >>> apply_cpu_share(["pylint"], {}, LinterProfile(jobs_option="--jobs"), 1)
+    (['pylint'], {})
+    >>> apply_cpu_share(["ruff"], {}, LinterProfile(jobs_env_var="THREADS"), 2)
+    (['ruff'], {'THREADS': '2'})
+
+    A jobs option is only added for more than one core, since the default of linters is
+    a single process anyway.
+
+    :param cmdline: The command line for running the linter
+    :param env: Environment variables for the linter
+    :param profile: The profile of the linter
+    :param share: The number of CPU cores for the linter
+    :return: The command line and environment variables for the linter
+
+    """
+    if (
+        share > 1
+        and profile.jobs_option
+        and not _has_option(cmdline, profile.jobs_option)
+    ):
+        cmdline = [*cmdline, f"{profile.jobs_option}={share}"]
+    if profile.jobs_env_var and profile.jobs_env_var not in env:
+        env = {**env, profile.jobs_env_var: str(share)}
+    return cmdline, env
+
+
+@cache
+def get_background_prefix() -> list[str]:
+    """Return a command prefix for running a linter with a lower CPU and I/O priority.
+
+    The niceness is increased by `BACKGROUND_NICENESS`, and if the ``ionice`` command is
+    available, like on Linux, the linter is moved into the idle I/O scheduling class. A
+    failure to change the I/O priority is ignored.
+
+    :return: The ``nice`` and ``ionice`` command lines to put before the linter command,
+             or an empty list if the priority can't be lowered
+
+    """
+    if WINDOWS:
+        return []
+    nice = shutil.which("nice")
+    ionice = shutil.which("ionice")
+    return [
+        *([nice, "-n", str(BACKGROUND_NICENESS)] if nice else []),
+        *([ionice, "-c", str(IONICE_CLASS_IDLE), "-t"] if ionice else []),
+    ]
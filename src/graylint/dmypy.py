@@ -0,0 +1,92 @@
+"""Run Mypy in daemon mode to keep its state warm between runs.
+
+With ``-L dmypy``, Mypy is run through ``dmypy run`` instead of starting a cold ``mypy``
+process for each tree. Each linted tree, i.e. the working tree and the stable worktrees
+of the baseline and ``rev2`` revisions, gets a daemon of its own, identified by a status
+file in the Graylint cache directory. ``dmypy run`` starts the daemon if needed and
+sends it a check request. Only files which changed since the previous check are
+re-analyzed.
+
+Options after ``dmypy`` on the command line are passed to Mypy, e.g.
+``-L "dmypy --strict"``. The daemon output has the same format as Mypy's, so it's parsed
+like the output of any other linter.
+
+Daemons started by Graylint are stopped at the end of the run unless ``--keep-daemons``
+is given. Kept daemons make later runs, e.g. from an editor or a file watcher, fast.
+Daemons for temporary trees, e.g. a temporary worktree used when the stable one is in
+use, are always stopped, since their tree has been deleted by then.
+
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import threading
+from subprocess import DEVNULL, run  # nosec
+from typing import TYPE_CHECKING
+
+from graylint.cache_storage.local import get_cache_dir
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+DMYPY = "dmypy"
+DMYPY_COMMANDS = {"check", "run", "recheck"}
+
+# Status files of daemons started or used during this run, and the trees they check
+_used_status_files: dict[Path, Path] = {}
+_used_status_files_lock = threading.Lock()
+
+
+def get_status_file(root: Path) -> Path:
+    """Return the path of the status file identifying the daemon for a tree.
+
+    :param root: The root of the tree checked by the daemon
+    :return: The path of the status file in the Graylint cache directory
+
+    """
+    tree_hash = hashlib.sha256(str(root.resolve()).encode("utf-8")).hexdigest()
+    return get_cache_dir() / "dmypy" / f"{tree_hash[:16]}.json"
+
+
+def make_dmypy_command(cmdline: list[str], root: Path) -> list[str]:
+    """Turn a ``dmypy`` linter command line into a check request for a tree's daemon.
+
+    :param cmdline: The linter command line, with Mypy options after ``dmypy``
+    :param root: The root of the tree to check
+    :return: The ``dmypy`` command line, to which paths to check can be appended
+
+    """
+    status_file = get_status_file(root)
+    status_file.parent.mkdir(parents=True, exist_ok=True)
+    with _used_status_files_lock:
+        _used_status_files[status_file] = root
+    args = cmdline[1:]
+    if not set(args) & DMYPY_COMMANDS:
+        args = ["run", "--", *args]
+    return [cmdline[0], "--status-file", str(status_file), *args]
+
+
+def stop_daemons(*, keep_daemons: bool = False) -> None:
+    """Stop the Mypy daemons used during this Graylint run.
+
+    :param keep_daemons: ``True`` to leave daemons running for trees which still exist,
+                         i.e. the working tree and the stable worktrees
+
+    """
+    with _used_status_files_lock:
+        status_files = sorted(_used_status_files.items())
+        _used_status_files.clear()
+    for status_file, root in status_files:
+        if not status_file.exists() or (keep_daemons and root.is_dir()):
+            continue
+        logger.debug("Stopping the Mypy daemon for %s", status_file)
+        run(  # noqa: S603  # nosec
+            [DMYPY, "--status-file", str(status_file), "stop"],
+            stdout=DEVNULL,
+            stderr=DEVNULL,
+            check=False,
+        )
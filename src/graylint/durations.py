@@ -0,0 +1,238 @@
+"""Remember how long linters take, to balance and order work by its expected cost.
+
+Graylint records the wall time of each linter command line, and for in-process linter
+adapters the wall time of each shard of files, in ``durations.json`` in the cache
+directory of the repository. Each recorded duration is a decaying average, so it follows
+the code base as it changes.
+
+On later runs, files of sharded in-process linters are split between worker processes
+by their expected cost instead of their count, so no worker is left running alone with
+the slowest files at the end.
+
+Linters of each revision are also started longest first. They still run one after
+another in their lane, so the order doesn't make a lane finish sooner. It only lines up
+the slowest linters of ``rev2`` and the baseline to run while both lanes are open, and
+leaves the quick ones for when a lane has closed and the other one gets the whole CPU
+budget.
+
+"""
+
+from __future__ import annotations
+
+import heapq
+import json
+import logging
+import shlex
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+from typing import TYPE_CHECKING, cast
+
+from graylint.workdirs import get_repo_cache_dir
+
+if TYPE_CHECKING:
+    from collections.abc import Collection, Iterator, Sequence
+
+logger = logging.getLogger(__name__)
+
+HISTORY_FILE_NAME = "durations.json"
+
+# Weight of the latest measurement in the decaying average
+DECAY = 0.3
+
+# Files are forgotten if the history grows larger than this many files for a linter
+MAX_FILES_PER_LINTER = 100_000
+
+
+def _update_average(previous: float | None, seconds: float) -> float:
+    """Add a measurement to a decaying average.
+
+    >>> _update_average(None, 2.0)
+    2.0
+    >>> _update_average(2.0, 12.0)
+    5.0
+
+    :param previous: The previous average, or ``None`` for the first measurement
+    :param seconds: The latest measurement
+    :return: The new average
+
+    """
+    if previous is None:
+        return seconds
+    return previous + DECAY * (seconds - previous)
+
+
+def split_by_cost(
+    paths: Sequence[str], costs: Sequence[float], shard_count: int
+) -> list[list[str]]:
+    """Split files into shards with about the same total expected cost.
+
+    The most expensive files are assigned first, each to the cheapest shard so far.
+
+    >>> split_by_cost(["a", "b", "c", "d"], [1.0, 5.0, 2.0, 2.0], 2)
+    [['b'], ['a', 'c', 'd']]
+
+    :param paths: The files to split
+    :param costs: The expected cost of each file
+    :param shard_count: The number of shards
+    :return: Non-empty shards of files, each in the order of ``paths``
+
+    """
+    shards: list[tuple[float, int, list[int]]] = [
+        (0.0, index, []) for index in range(shard_count)
+    ]
+    for path_index in sorted(range(len(paths)), key=lambda index: -costs[index]):
+        total, shard_index, indices = heapq.heappop(shards)
+        indices.append(path_index)
+        heapq.heappush(shards, (total + costs[path_index], shard_index, indices))
+    return [
+        [paths[index] for index in sorted(indices)]
+        for _, _, indices in sorted(shards, key=lambda shard: shard[1])
+        if indices
+    ]
+
+
+class DurationHistory:
+    """Decaying averages of linter and per-file wall times in a repository."""
+
+    def __init__(self, path: Path | None = None) -> None:
+        """Load the duration history of a repository.
+
+        :param path: The path of the history file, or ``None`` to keep the history in
+                     memory only
+
+        """
+        self.path = path
+        self.lock = threading.Lock()
+        self.linters: dict[str, float] = {}
+        self.files: dict[str, dict[str, float]] = {}
+        if path is None:
+            return
+        try:
+            data = cast("dict[str, dict[str, object]]", json.loads(path.read_bytes()))
+            self.linters = cast("dict[str, float]", data["linters"])
+            self.files = cast("dict[str, dict[str, float]]", data["files"])
+        except (OSError, ValueError, KeyError, TypeError):
+            logger.debug("No valid linter duration history in %s", path)
+
+    def expected_linter_duration(self, cmdline: list[str]) -> float | None:
+        """Return the expected wall time of a linter.
+
+        :param cmdline: The command line for running the linter
+        :return: The expected wall time in seconds, or ``None`` if not known yet
+
+        """
+        with self.lock:
+            return self.linters.get(shlex.join(cmdline))
+
+    def order_longest_first(self, linter_cmdlines: list[list[str]]) -> list[int]:
+        """Order linters by their expected wall time, longest first.
+
+        Linters with no recorded duration yet come first, in their original order.
+
+        :param linter_cmdlines: The command lines for running the linters
+        :return: Indices of the linters in ``linter_cmdlines``
+
+        """
+
+        def expected(index: int) -> float:
+            duration = self.expected_linter_duration(linter_cmdlines[index])
+            return float("inf") if duration is None else duration
+
+        return sorted(range(len(linter_cmdlines)), key=expected, reverse=True)
+
+    def record_linter(self, cmdline: list[str], seconds: float) -> None:
+        """Record the wall time of a linter.
+
+        :param cmdline: The command line for running the linter
+        :param seconds: The wall time of the linter in seconds
+
+        """
+        key = shlex.join(cmdline)
+        with self.lock:
+            self.linters[key] = _update_average(self.linters.get(key), seconds)
+
+    def expected_file_costs(self, linter: str, paths: Sequence[str]) -> list[float]:
+        """Return the expected cost of linting each file with a linter.
+
+        Files with no recorded cost yet are expected to cost the average of known files.
+
+        :param linter: The name of the linter
+        :param paths: Paths of the files
+        :return: The expected wall time in seconds for each file
+
+        """
+        with self.lock:
+            known = self.files.get(linter, {})
+            default = sum(known.values()) / len(known) if known else 1.0
+            return [known.get(path, default) for path in paths]
+
+    def record_shard(self, linter: str, paths: Collection[str], seconds: float) -> None:
+        """Record the wall time of a shard of files, spread evenly over its files.
+
+        :param linter: The name of the linter
+        :param paths: Paths of the files in the shard
+        :param seconds: The wall time of linting the shard in seconds
+
+        """
+        if not paths:
+            return
+        per_file = seconds / len(paths)
+        with self.lock:
+            known = self.files.setdefault(linter, {})
+            if len(known) > MAX_FILES_PER_LINTER:
+                known.clear()
+            for path in paths:
+                known[path] = _update_average(known.get(path), per_file)
+
+    def save(self) -> None:
+        """Write the history to its file, replacing the file atomically."""
+        if self.path is None:
+            return
+        with self.lock:
+            data = json.dumps({"linters": self.linters, "files": self.files})
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # A unique temporary file, since concurrent Graylint runs may save at once
+        with NamedTemporaryFile(
+            dir=self.path.parent, prefix=f"{self.path.name}.", delete=False
+        ) as temporary_file:
+            temporary_path = Path(temporary_file.name)
+        try:
+            temporary_path.write_text(data, encoding="utf-8")
+            temporary_path.replace(self.path)
+        finally:
+            temporary_path.unlink(missing_ok=True)
+
+
+_histories: list[DurationHistory] = []
+
+
+@contextmanager
+def duration_history(root: Path) -> Iterator[DurationHistory]:
+    """Use and update the duration history of a repository in the context.
+
+    :param root: The root of the Git repository
+    :return: A context manager yielding the history, which is saved on exit
+
+    """
+    history = DurationHistory(get_repo_cache_dir(root) / HISTORY_FILE_NAME)
+    _histories.append(history)
+    try:
+        yield history
+    finally:
+        _histories.remove(history)
+        try:
+            history.save()
+        except OSError as exc:
+            logger.warning("Can't save linter durations: %s", exc)
+
+
+def get_duration_history() -> DurationHistory:
+    """Return the duration history in use.
+
+    :return: The history of the innermost `duration_history` context, or an empty
+             in-memory history outside of one
+
+    """
+    return _histories[-1] if _histories else DurationHistory()
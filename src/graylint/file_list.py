@@ -0,0 +1,158 @@
+"""Expand directories to lint into a list of Python files known to Git.
+
+Linters given a directory walk it themselves, and unless each of them is configured
+separately, they may descend into virtualenvs, ``node_modules``, build output or
+generated code. With ``--expand-directories``, Graylint lists the Python files in each
+directory once with ``git ls-files`` or ``git ls-tree``, which skips files ignored by
+``.gitignore``. Files with the ``linguist-generated`` or ``graylint-skip`` Git attribute
+are skipped, too. Every linter is then given the same explicit list of files in both
+revisions.
+
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+from pathlib import Path
+from subprocess import run  # nosec
+from typing import TYPE_CHECKING
+
+from darkgraylib.git import WORKTREE
+from graylint.staged import INDEX
+
+if TYPE_CHECKING:
+    from collections.abc import Collection
+
+logger = logging.getLogger(__name__)
+
+# Files with any of these Git attributes set are not linted
+SKIP_ATTRIBUTES = ("linguist-generated", "graylint-skip")
+
+
+def _git_z(cmd: list[str], root: Path, stdin: str = "") -> list[str]:
+    """Run a Git command which outputs NUL separated fields, and return the fields.
+
+    Pathspecs are matched literally, so file names with glob characters are found.
+
+    :param cmd: The Git command and arguments, without ``git``
+    :param root: The root of the Git repository
+    :param stdin: NUL separated input for the Git command
+    :return: The NUL separated fields in the output of Git
+
+    """
+    logger.debug("[%s]$ git %s", root, " ".join(cmd))
+    output = run(  # noqa: S603  # nosec
+        ["git", *cmd],  # noqa: S607
+        input=stdin,
+        capture_output=True,
+        cwd=root,
+        env={**os.environ, "GIT_LITERAL_PATHSPECS": "1"},
+        encoding="utf-8",
+        check=True,
+    ).stdout
+    return output.split("\0")[:-1]
+
+
+def list_files(root: Path, paths: Collection[Path], revision: str) -> list[Path]:
+    """List files known to Git in the given directories and files in a revision.
+
+    :param root: The root of the Git repository
+    :param paths: Files and directories to list, relative to ``root``
+    :param revision: A commit, ``WORKTREE`` for tracked and untracked files in the
+                     working tree except ignored ones, or ``INDEX`` for the Git index
+    :return: Paths of the files, relative to ``root``
+
+    """
+    pathspecs = ["--", *(str(path) for path in sorted(paths))]
+    if revision == WORKTREE:
+        names = _git_z(
+            [
+                "ls-files",
+                "-z",
+                "--cached",
+                "--others",
+                "--exclude-standard",
+                *pathspecs,
+            ],
+            root,
+        )
+        return [Path(name) for name in names if (root / name).is_file()]
+    if revision == INDEX:
+        names = _git_z(["ls-files", "-z", "--cached", *pathspecs], root)
+    else:
+        names = _git_z(
+            ["ls-tree", "-r", "-z", "--name-only", revision, *pathspecs], root
+        )
+    return [Path(name) for name in names]
+
+
+def keep_existing(
+    root: Path, paths: Collection[Path], revision: str, scope: Collection[Path]
+) -> set[Path]:
+    """Leave out files which don't exist in a revision.
+
+    :param root: The root of the Git repository
+    :param paths: Files and directories to filter, relative to ``root``
+    :param revision: A commit, ``WORKTREE`` or ``INDEX``
+    :param scope: Files and directories containing all of ``paths``, to limit the files
+                  listed from Git
+    :return: Directories in the working tree, and files which exist in the revision
+
+    """
+    existing = set(list_files(root, scope, revision))
+    return {path for path in paths if path in existing or (root / path).is_dir()}
+
+
+def get_skipped_files(root: Path, paths: Collection[Path]) -> set[Path]:
+    """Find files which have a Git attribute marking them as not to be linted.
+
+    The attributes are read from ``.gitattributes`` files in the working tree.
+
+    :param root: The root of the Git repository
+    :param paths: Paths of files to check, relative to ``root``
+    :return: Paths of files with ``linguist-generated`` or ``graylint-skip`` set
+
+    """
+    if not paths:
+        return set()
+    fields = _git_z(
+        ["check-attr", "-z", "--stdin", *SKIP_ATTRIBUTES],
+        root,
+        "".join(f"{path}\0" for path in paths),
+    )
+    # <path> NUL <attribute> NUL <info> NUL
+    return {
+        Path(path)
+        for path, value in zip(fields[::3], fields[2::3])
+        if value in ("set", "true")
+    }
+
+
+def expand_paths(root: Path, paths: Collection[Path], revision: str) -> set[Path]:
+    """Replace directories with the Python files in them, skipping ignored files.
+
+    Directories are expanded to files known to Git, excluding files ignored by
+    ``.gitignore`` and files with the ``linguist-generated`` or ``graylint-skip`` Git
+    attribute. Paths which aren't directories in the working tree are kept as they are.
+
+    :param root: The root of the Git repository
+    :param paths: The files and directories to lint, relative to ``root``
+    :param revision: The revision whose files to list, or ``WORKTREE``
+    :return: Paths of files to lint, relative to ``root``
+
+    """
+    directories = {path for path in paths if (root / path).is_dir()}
+    listed = list_files(root, directories, revision) if directories else []
+    files = [path for path in listed if path.suffix == ".py"]
+    skipped = get_skipped_files(root, files)
+    result = (set(files) - skipped) | (set(paths) - directories)
+    logger.debug(
+        "Expanded %s directories to %s Python files in %s, skipping %s files by Git"
+        " attributes",
+        len(directories),
+        len(result),
+        revision,
+        len(skipped),
+    )
+    return result
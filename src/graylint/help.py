@@ -1,10 +1,25 @@
 """Help and usage instruction texts used for the command line parser"""
 
+import darkgraylib.help
+
 DESCRIPTION = (
     "Run linters on old and new versions of Python source files and hide unchanged"
     " messages"
 )
 
+REVISION = (
+    f"{darkgraylib.help.REVISION.format(application='Graylint')} Can be repeated to"
+    " compare against multiple baselines in one run, e.g. `-r main... -r release...`."
+    " The working tree is linted only once, and messages are tagged with the baseline."
+)
+
+WORKERS = (
+    "How many CPU cores linters may use in total, or `0` for the cores available to"
+    " Graylint, limited by the cgroup CPU quota in containers. Linters running at the"
+    " same time get an equal share, and their jobs option is set to match unless given"
+    " on the command line [default: 0]"
+)
+
 LINT = (
     "Run a linter on changed files. `CMD` can be a name or path of the linter binary,"
     " or a full quoted command line with the command and options. Linters read their"
@@ -19,3 +34,127 @@ FORMAT_TEMPLATE = (
     " e.g. 'gnu:-' for stdout or 'gnu:annotations.txt' for file output. Multiple "
     " formats can be specified with comma separation or by repeating the option."
 )
+
+LINTER_OUTPUT = (
+    "Instead of running a linter, read its output for the working tree from `PATH`."
+    " `LINTER` is the name of the linter to show in messages. `PATH` can be a file, a"
+    " named pipe or `-` for standard input. Paths in the linter output must be relative"
+    " to the root of the repository. `PATH` can also be a coverage.py data file like"
+    " `.coverage`, which is read directly to report lines not covered by tests. Can be"
+    " repeated for multiple linters."
+)
+
+BASELINE_LINTER_OUTPUT = (
+    "Read the output of `LINTER` for the baseline revision from `PATH`. Only messages"
+    " not present in the baseline linter output on corresponding lines are shown for"
+    " the linter output given with `--linter-output`."
+)
+
+SAVE_BASELINE = (
+    "Save linter messages for the baseline revision into `PATH`. The file records the"
+    " commit hash of the baseline, linter command lines, linter versions and the paths"
+    " linted. It can be stored e.g. as a CI build artifact and used later with"
+    " `--load-baseline`."
+)
+
+LOAD_BASELINE = (
+    "Load linter messages for the baseline revision from `PATH` instead of running"
+    " linters on a temporary checkout of the baseline revision. The file must have been"
+    " created with `--save-baseline` for the same commit, linter command lines, linter"
+    " versions and paths."
+)
+
+CACHE = (
+    "Look up linter messages for the baseline revision from the Graylint cache, and"
+    " store them there after linting the baseline. Entries are keyed by the baseline"
+    " commit, linter command lines, linter versions and paths. Use `graylint cache"
+    " warm`, `graylint cache stats` and `graylint cache gc` to manage the cache."
+)
+
+CACHE_BACKEND = (
+    "Store the cache using the `NAME` backend. `local` (the default) uses a local"
+    " directory, and `http` a remote cache server speaking the HTTP protocol of e.g."
+    " `bazel-remote`, which manages the size of the cache itself, so `graylint cache"
+    " stats` and `graylint cache gc` aren't supported with it. More backends can be"
+    " installed as plugins."
+)
+
+CACHE_LOCATION = (
+    "The directory or server URL of the cache. For the `local` backend, the default is"
+    " the `GRAYLINT_CACHE_DIR` environment variable or `graylint` in the user cache"
+    " directory."
+)
+
+KEEP_DAEMONS = (
+    "Leave linter daemons, like the Mypy daemon used with `-L dmypy`, running after"
+    " Graylint exits, so later runs can reuse their state. Daemons for temporary"
+    " checkouts are always stopped."
+)
+
+MAX_MESSAGES = (
+    "Stop linting after `N` new linter messages have been found, terminating any"
+    " linters still running. The exit code is the same as for a full run. Useful e.g."
+    " in Git hooks which only need to know whether there are any new messages."
+)
+
+IMPORT_DEPTH = (
+    "Lint only files changed since the baseline, and files importing them directly or"
+    " through at most `N` levels of other modules. Speeds up linters like Mypy and"
+    " Pylint which check code across modules. Imports are found by parsing Python"
+    " files, and cached by file content. `0` lints only changed files."
+)
+
+EXPAND_DIRECTORIES = (
+    "Expand directories to lint into the Python files known to Git in them, once for"
+    " all linters. Files ignored by `.gitignore` and files with the"
+    " `linguist-generated` or `graylint-skip` Git attribute are skipped, and each"
+    " linter is given the same explicit list of files in both revisions."
+)
+
+TIME_BUDGET = (
+    "Stop linting after `DURATION`, e.g. `10s` or `2m`, and report which files weren't"
+    " checked. Per-file linters are run first on changed files, most modified first,"
+    " and new messages are shown after each batch of files. Other linters are run"
+    " next on all files. Linters are run as subprocesses which can be stopped at the"
+    " deadline, so in-process linter adapters aren't used. Exits with status 5 if the"
+    " budget ran out, unless new messages were found in the files which were checked."
+)
+
+EACH_COMMIT = (
+    "Lint each commit between the revisions given with `-r` / `--revision` on the"
+    " first-parent history, followed by the working tree if no end revision is given."
+    " Show linter messages which are new in each commit compared to its parent,"
+    " tagged with the commit hash. Each commit is linted only once, and linters which"
+    " check files independently only re-lint files changed in each commit, or all"
+    " files if their configuration file changed."
+)
+
+STAGED = (
+    "Lint changes staged in the Git index instead of the working tree, e.g. in a"
+    " pre-commit hook. Only the staged versions of the given files and linter"
+    " configuration files, and their versions in the baseline revision, are written"
+    " into temporary directories and linted. For linters which check code across"
+    " modules, like Mypy and Pylint, all files are written. The working tree and the"
+    " index are left untouched. Can't be used with multiple `-r` options."
+)
+
+FAIL_FAST = "Stop linting at the first new linter message. Same as `--max-messages=1`."
+
+TIMEOUT = (
+    "Stop with an error if a linter runs longer than `DURATION` of wall-clock time on"
+    " either revision, e.g. `30s` or `10m`, in seconds if there's no unit. Applies to"
+    " all linters, or only to `LINTER` if given, e.g. `--timeout=mypy=5m`. Can be"
+    " repeated."
+)
+
+CPU_LIMIT = (
+    "Limit the CPU time of each linter process to `SECONDS`, for all linters or only"
+    " for `LINTER`. Graylint stops with an error if a linter exceeds the limit. Only"
+    " supported on Linux. Can be repeated."
+)
+
+MEMORY_LIMIT = (
+    "Limit the address space of each linter process to `SIZE` bytes, for all linters"
+    " or only for `LINTER`. A `K`, `M`, `G` or `T` suffix can be used, e.g."
+    " `--memory-limit=pylint=2G`. Only supported on Linux. Can be repeated."
+)
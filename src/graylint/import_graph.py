@@ -0,0 +1,334 @@
+"""Find files affected by changes through imports, to limit which files are linted.
+
+Linters like Mypy and Pylint check code across modules, so a change in one module can
+cause new messages in modules which import it. Linting the whole repository finds
+those, but is slow in large repositories. With ``--import-depth``, only files changed
+since the baseline and files importing them, directly or through other modules up to
+the given depth, are linted in both revisions.
+
+The imports of each Python file are found by parsing it with `ast`. They're cached in
+the Graylint cache directory by the Git blob hash of the file content, so only new and
+changed files are parsed again on later runs.
+
+"""
+
+from __future__ import annotations
+
+import ast
+import json
+import logging
+from collections import defaultdict
+from pathlib import Path
+from subprocess import PIPE, run  # nosec
+from tempfile import NamedTemporaryFile
+from typing import TYPE_CHECKING, cast
+
+from darkgraylib.git import WORKTREE, git_check_output_lines
+from graylint.staged import INDEX
+from graylint.workdirs import get_repo_cache_dir
+
+if TYPE_CHECKING:
+    from collections.abc import Collection, Iterable, Iterator, Mapping
+
+    # The level of a relative import, the imported module, and names imported from it
+    ImportRecord = tuple[int, str, list[str]]
+
+logger = logging.getLogger(__name__)
+
+# The cache is cleared when it grows larger than this many files
+MAX_CACHE_ENTRIES = 200_000
+
+
+def get_blob_hashes(root: Path, revision: str) -> dict[Path, str]:
+    """Get the Git blob hashes of Python files in a revision.
+
+    :param root: The root of the Git repository
+    :param revision: A commit, ``WORKTREE`` for the working tree including untracked
+                     files, or ``INDEX`` for the Git index
+    :return: Blob hashes by file path relative to ``root``
+
+    """
+    if revision in (WORKTREE, INDEX):
+        # <mode> SP <object> SP <stage> TAB <file>
+        entries = git_check_output_lines(["ls-files", "--stage"], root)
+        result = {
+            Path(path): entry.split()[1]
+            for entry, _, path in (line.partition("\t") for line in entries)
+        }
+    else:
+        # <mode> SP <type> SP <object> TAB <file>
+        entries = git_check_output_lines(["ls-tree", "-r", revision], root)
+        result = {
+            Path(path): entry.split()[2]
+            for entry, _, path in (line.partition("\t") for line in entries)
+        }
+    if revision == WORKTREE:
+        changed = git_check_output_lines(
+            ["ls-files", "--modified", "--others", "--exclude-standard"], root
+        )
+        existing = sorted({path for path in changed if (root / path).is_file()})
+        for path in set(changed) - set(existing):
+            result.pop(Path(path), None)
+        if existing:
+            hashes = git_check_output_lines(["hash-object", "--", *existing], root)
+            result.update(zip(map(Path, existing), hashes))
+    return {path: blob for path, blob in result.items() if path.suffix == ".py"}
+
+
+def _read_blobs(root: Path, blobs: Collection[str]) -> dict[str, bytes]:
+    """Read the content of Git blobs from the object database.
+
+    :param root: The root of the Git repository
+    :param blobs: Hashes of the blobs to read
+    :return: The content of each blob by its hash
+
+    """
+    output = run(  # nosec
+        ["git", "cat-file", "--batch"],  # noqa: S607
+        input="".join(f"{blob}\n" for blob in blobs).encode("ascii"),
+        stdout=PIPE,
+        cwd=root,
+        check=True,
+    ).stdout
+    result = {}
+    position = 0
+    while position < len(output):
+        # "<object> <type> <size>\n<contents>\n", or "<object> missing\n"
+        header_end = output.index(b"\n", position)
+        header = output[position:header_end].decode("ascii").split()
+        position = header_end + 1
+        if len(header) == 3:  # noqa: PLR2004
+            blob, _, size = header
+            content_end = position + int(size)
+            result[blob] = output[position:content_end]
+            position = content_end + 1
+    return result
+
+
+def parse_imports(source: bytes) -> list[ImportRecord]:
+    """Find the imports in Python source code.
+
+    >>> parse_imports(b"import a.b; from . import c; from ..d import e, f")
+    [(0, 'a.b', []), (1, '', ['c']), (2, 'd', ['e', 'f'])]
+
+    :param source: The Python source code
+    :return: The level, module and imported names of each import statement, or no
+             imports for a file with syntax errors
+
+    """
+    try:
+        tree = ast.parse(source)
+    except (SyntaxError, ValueError):
+        return []
+    result: list[ImportRecord] = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            result.extend((0, alias.name, []) for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            names = [alias.name for alias in node.names]
+            result.append((node.level, node.module or "", names))
+    return result
+
+
+def _load_cache(path: Path) -> dict[str, list[ImportRecord]]:
+    """Load imports cached by blob hash.
+
+    :param path: The path of the cache file
+    :return: Imports by blob hash, or an empty dictionary if there's no valid cache
+
+    """
+    try:
+        cache = cast("dict[str, list[list[object]]]", json.loads(path.read_bytes()))
+    except (OSError, ValueError):
+        return {}
+    return {
+        blob: [
+            (cast("int", level), cast("str", module), cast("list[str]", names))
+            for level, module, names in records
+        ]
+        for blob, records in cache.items()
+    }
+
+
+def _save_cache(
+    path: Path, cache: dict[str, list[ImportRecord]], used_blobs: Collection[str]
+) -> None:
+    """Save imports by blob hash, replacing the cache file atomically.
+
+    :param path: The path of the cache file
+    :param cache: Imports by blob hash
+    :param used_blobs: Hashes of blobs in the linted revisions, which are kept if the
+                       cache has grown too large
+
+    """
+    if len(cache) > MAX_CACHE_ENTRIES:
+        cache = {blob: cache[blob] for blob in used_blobs}
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # A unique temporary file, since concurrent Graylint runs may save at once
+    with NamedTemporaryFile(
+        dir=path.parent, prefix=f"{path.name}.", delete=False
+    ) as temporary_file:
+        temporary_path = Path(temporary_file.name)
+    try:
+        temporary_path.write_text(json.dumps(cache), encoding="utf-8")
+        temporary_path.replace(path)
+    finally:
+        temporary_path.unlink(missing_ok=True)
+
+
+def get_imports(
+    root: Path, revision: str, blobs: Mapping[Path, str]
+) -> dict[Path, list[ImportRecord]]:
+    """Get the imports of Python files, parsing only files not found in the cache.
+
+    :param root: The root of the Git repository
+    :param revision: The revision of the files, or ``WORKTREE`` for the working tree
+    :param blobs: Blob hashes of the files by their paths relative to ``root``
+    :return: The imports of each file
+
+    """
+    cache_path = get_repo_cache_dir(root) / "imports.json"
+    cache = _load_cache(cache_path)
+    missing = {path: blob for path, blob in blobs.items() if blob not in cache}
+    if missing:
+        logger.debug("Parsing imports in %s files", len(missing))
+        if revision == WORKTREE:
+            sources = {
+                blob: (root / path).read_bytes()
+                for path, blob in missing.items()
+                if (root / path).is_file()
+            }
+        else:
+            sources = _read_blobs(root, set(missing.values()))
+        for blob, source in sources.items():
+            cache[blob] = parse_imports(source)
+        _save_cache(cache_path, cache, set(blobs.values()))
+    return {path: cache.get(blob, []) for path, blob in blobs.items()}
+
+
+def _get_module_name(path: Path, package_dirs: Collection[Path]) -> str:
+    """Get the dotted module name of a Python file.
+
+    The module name starts at the topmost directory of the chain of packages, i.e.
+    directories with an ``__init__.py``, containing the file.
+
+    :param path: The path of the file, relative to the repository root
+    :param package_dirs: Directories containing an ``__init__.py``
+    :return: The dotted module name
+
+    """
+    parts = [] if path.name == "__init__.py" else [path.stem]
+    directory = path.parent
+    while directory.name and directory in package_dirs:
+        parts.insert(0, directory.name)
+        directory = directory.parent
+    return ".".join(parts)
+
+
+def _resolve_import(
+    module_name: str, record: ImportRecord, *, is_package: bool
+) -> Iterator[str]:
+    """Find the names of modules possibly imported by an import statement.
+
+    >>> list(_resolve_import("pkg.mod", (1, "sub", ["name"]), is_package=False))
+    ['pkg', 'pkg.sub', 'pkg.sub.name']
+
+    :param module_name: The dotted name of the importing module
+    :param record: The level, module and imported names of the import statement
+    :param is_package: ``True`` if the importing module is an ``__init__.py``
+    :return: The imported module, its parent packages, and possible submodules imported
+             by name
+
+    """
+    level, module, names = record
+    parts = module.split(".") if module else []
+    if level:
+        package = module_name.split(".") if is_package else module_name.split(".")[:-1]
+        if level - 1 > len(package):
+            return
+        parts = package[: len(package) - level + 1] + parts
+    for index in range(1, len(parts) + 1):
+        yield ".".join(parts[:index])
+    for name in names:
+        yield ".".join([*parts, name])
+
+
+def build_reverse_graph(root: Path, revision: str) -> dict[Path, set[Path]]:
+    """Build a graph of which Python files import each file in a revision.
+
+    :param root: The root of the Git repository
+    :param revision: A commit, ``WORKTREE`` or ``INDEX``
+    :return: Paths of importing files by the path of the imported file
+
+    """
+    imports = get_imports(root, revision, get_blob_hashes(root, revision))
+    package_dirs = {path.parent for path in imports if path.name == "__init__.py"}
+    module_names = {path: _get_module_name(path, package_dirs) for path in imports}
+    modules: dict[str, Path] = {}
+    for path, module_name in sorted(module_names.items()):
+        modules.setdefault(module_name, path)
+    result: dict[Path, set[Path]] = defaultdict(set)
+    for path, records in imports.items():
+        for record in records:
+            for name in _resolve_import(
+                module_names[path], record, is_package=path.name == "__init__.py"
+            ):
+                imported = modules.get(name)
+                if imported and imported != path:
+                    result[imported].add(path)
+    return result
+
+
+def find_importers(
+    reverse_graph: Mapping[Path, Collection[Path]], paths: Iterable[Path], depth: int
+) -> set[Path]:
+    """Find files which import the given files, directly or through other modules.
+
+    >>> graph = {Path("a.py"): {Path("b.py")}, Path("b.py"): {Path("c.py")}}
+    >>> sorted(str(path) for path in find_importers(graph, [Path("a.py")], 1))
+    ['b.py']
+    >>> sorted(str(path) for path in find_importers(graph, [Path("a.py")], 5))
+    ['b.py', 'c.py']
+
+    :param reverse_graph: Paths of importing files by the path of the imported file
+    :param paths: The imported files
+    :param depth: The maximum number of import steps from an importer to the file
+    :return: Paths of the importing files, excluding the given files
+
+    """
+    paths = set(paths)
+    result: set[Path] = set()
+    frontier = paths
+    for _ in range(depth):
+        frontier = (
+            {importer for path in frontier for importer in reverse_graph.get(path, ())}
+            - result
+            - paths
+        )
+        if not frontier:
+            break
+        result |= frontier
+    return result
+
+
+def get_affected_paths(
+    root: Path,
+    revisions: Iterable[str],
+    changed_paths: Collection[Path],
+    depth: int,
+) -> set[Path]:
+    """Find changed files and files importing them in any of the given revisions.
+
+    :param root: The root of the Git repository
+    :param revisions: The revisions whose import graphs to use
+    :param changed_paths: Files changed between the revisions
+    :param depth: The maximum number of import steps from an importer to a changed file
+    :return: Paths of changed and importing files, relative to ``root``
+
+    """
+    result = set(changed_paths)
+    for revision in revisions:
+        result |= find_importers(
+            build_reverse_graph(root, revision), changed_paths, depth
+        )
+    return result
@@ -0,0 +1,235 @@
+"""Wall-clock timeouts and CPU time and memory limits for linter subprocesses.
+
+Limits are given on the command line or in ``[tool.graylint]`` either for all linters
+or for a single linter, e.g.::
+
+    graylint --timeout=120 --timeout=mypy=600 --memory-limit=pylint=2G -L mypy -L pylint
+
+The wall-clock timeout is enforced by killing the linter subprocess. CPU time and memory
+limits are set with ``prlimit()`` on the linter subprocess right after it has been
+started, instead of in a ``preexec_fn``, which isn't safe while other threads are
+starting linters, too. They are only supported on Linux.
+
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+import signal
+from dataclasses import dataclass, fields
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Mapping
+
+logger = logging.getLogger(__name__)
+
+ALL_LINTERS = ""
+MEMORY_UNITS = {"": 1, "K": 1024, "M": 1024**2, "G": 1024**3, "T": 1024**4}
+MEMORY_RE = re.compile(r"^(\d+)\s*([KMGT]?)B?$", re.IGNORECASE)
+DURATION_RE = re.compile(r"^(\d+(?:\.\d*)?|\.\d+)\s*(ms|s|m|h)?$", re.IGNORECASE)
+DURATION_UNITS = {"ms": 0.001, "s": 1, "m": 60, "h": 3600}
+
+
+class LinterLimitError(RuntimeError):
+    """Raised when a linter subprocess exceeds its time or resource limits."""
+
+    def __init__(
+        self, message: str, linter: str = "", timeout: float | None = None
+    ) -> None:
+        """Describe the limit the linter exceeded.
+
+        :param message: The error message
+        :param linter: The linter executable name or path
+        :param timeout: The wall-clock timeout the linter exceeded, or ``None`` if it
+                        exceeded another limit
+
+        """
+        super().__init__(message)
+        self.linter = linter
+        self.timeout = timeout
+
+
+@dataclass(frozen=True)
+class LinterLimits:
+    """Wall-clock timeout, CPU time limit and memory limit for a linter subprocess.
+
+    ``None`` means that the limit isn't set.
+
+    """
+
+    timeout: float | None = None
+    cpu_time: int | None = None
+    memory: int | None = None
+
+    def override(self, other: LinterLimits) -> LinterLimits:
+        """Return limits with those set in ``other`` replacing these.
+
+        :param other: The limits which take precedence
+        :return: The combined limits
+
+        """
+        return LinterLimits(
+            **{
+                field.name: (
+                    getattr(self, field.name)
+                    if getattr(other, field.name) is None
+                    else getattr(other, field.name)
+                )
+                for field in fields(self)
+            }
+        )
+
+    def apply(self, pid: int) -> None:
+        """Set the CPU time and memory limits of a running subprocess.
+
+        :param pid: The process ID of the subprocess
+
+        """
+        if self.cpu_time is None and self.memory is None:
+            return
+        try:
+            # pylint: disable=import-outside-toplevel
+            from resource import RLIMIT_AS, RLIMIT_CPU, prlimit  # noqa: PLC0415
+        except ImportError:
+            # ``resource`` is missing on Windows, and ``prlimit()`` outside Linux
+            logger.warning("CPU time and memory limits for linters not supported")
+            return
+        try:
+            if self.cpu_time is not None:
+                prlimit(pid, RLIMIT_CPU, (self.cpu_time, self.cpu_time))
+            if self.memory is not None:
+                prlimit(pid, RLIMIT_AS, (self.memory, self.memory))
+        except ProcessLookupError:
+            # The subprocess has already exited
+            pass
+
+    def describe_exit(self, returncode: int) -> str | None:
+        """Explain a linter exit status which is likely caused by exceeding limits.
+
+        :param returncode: The return code of the linter subprocess
+        :return: A description of the exceeded limit, or ``None`` if the exit status
+                 doesn't indicate that a limit was exceeded
+
+        """
+        if self.cpu_time is not None and returncode in (
+            -getattr(signal, "SIGXCPU", 0),
+            -getattr(signal, "SIGKILL", 0),
+        ):
+            return f"exceeded the CPU time limit of {self.cpu_time} seconds"
+        if self.memory is not None and returncode < 0:
+            return (
+                f"was terminated by signal {-returncode}, possibly by exceeding the"
+                f" memory limit of {self.memory} bytes"
+            )
+        return None
+
+
+def parse_memory_size(value: str) -> int:
+    """Parse a memory size like ``512M`` or ``2G`` into a number of bytes.
+
+    :param value: The memory size, optionally with a ``K``, ``M``, ``G`` or ``T`` suffix
+    :raises ValueError: if the memory size is invalid
+    :return: The number of bytes
+
+    >>> parse_memory_size("2G")
+    2147483648
+    >>> parse_memory_size("512 MB")
+    536870912
+
+    """
+    match = MEMORY_RE.match(value.strip())
+    if not match:
+        message = f"Invalid memory size {value!r}"
+        raise ValueError(message)
+    number, unit = match.groups()
+    return int(number) * MEMORY_UNITS[unit.upper()]
+
+
+def parse_duration(value: str) -> float:
+    """Parse a duration like ``10s``, ``500ms`` or ``2m`` into seconds.
+
+    :param value: The duration, in seconds if there's no unit
+    :raises ValueError: if the duration is invalid
+    :return: The duration in seconds
+
+    >>> parse_duration("10s")
+    10.0
+    >>> parse_duration("1.5m")
+    90.0
+    >>> parse_duration("250ms")
+    0.25
+
+    """
+    match = DURATION_RE.match(value.strip())
+    if not match:
+        message = f"Invalid duration {value!r}"
+        raise ValueError(message)
+    number, unit = match.groups()
+    return float(number) * DURATION_UNITS[(unit or "s").lower()]
+
+
+def _split_linter_limit(value: str | float) -> tuple[str, str]:
+    """Split a ``[LINTER=]LIMIT`` option value into the linter name and the limit.
+
+    :param value: The option value, possibly a number from the configuration file
+    :return: The linter name, or an empty string for all linters, and the limit
+
+    """
+    linter, separator, limit = str(value).rpartition("=")
+    return (linter if separator else ALL_LINTERS), limit
+
+
+def parse_linter_limits(
+    timeouts: Iterable[str | float] = (),
+    cpu_limits: Iterable[str | float] = (),
+    memory_limits: Iterable[str | float] = (),
+) -> dict[str, LinterLimits]:
+    """Parse linter limit option values into limits for each linter.
+
+    Each value is either a plain limit which applies to all linters, or ``LINTER=LIMIT``
+    to set the limit for one linter. Later values override earlier ones.
+
+    :param timeouts: Wall-clock timeouts, in seconds if there's no unit
+    :param cpu_limits: CPU time limits in seconds
+    :param memory_limits: Memory limits in bytes, optionally with a unit suffix
+    :raises ValueError: if a limit value is invalid
+    :return: Limits by linter name, with the empty string for limits of all linters
+
+    >>> parse_linter_limits(["60", "mypy=300"], [], ["pylint=1G"])["mypy"]
+    LinterLimits(timeout=300.0, cpu_time=None, memory=None)
+    >>> parse_linter_limits(["30s", "mypy=10m"])["mypy"]
+    LinterLimits(timeout=600.0, cpu_time=None, memory=None)
+
+    """
+    limits = [
+        (linter, LinterLimits(timeout=parse_duration(limit)))
+        for linter, limit in map(_split_linter_limit, timeouts)
+    ]
+    limits.extend(
+        (linter, LinterLimits(cpu_time=int(limit)))
+        for linter, limit in map(_split_linter_limit, cpu_limits)
+    )
+    limits.extend(
+        (linter, LinterLimits(memory=parse_memory_size(limit)))
+        for linter, limit in map(_split_linter_limit, memory_limits)
+    )
+    result: dict[str, LinterLimits] = {}
+    for linter, linter_limits in limits:
+        result[linter] = result.get(linter, LinterLimits()).override(linter_limits)
+    return result
+
+
+def get_linter_limits(limits: Mapping[str, LinterLimits], linter: str) -> LinterLimits:
+    """Get the effective limits for a linter.
+
+    :param limits: Limits by linter name, with the empty string for all linters
+    :param linter: The linter executable name or path
+    :return: Limits for all linters overridden by limits for the given linter
+
+    """
+    default = limits.get(ALL_LINTERS, LinterLimits())
+    specific = limits.get(linter) or limits.get(Path(linter).name) or LinterLimits()
+    return default.override(specific)
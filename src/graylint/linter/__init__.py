@@ -0,0 +1 @@
+"""Built-in adapters for running linters in-process through their Python APIs."""
@@ -0,0 +1,50 @@
+"""Base class for in-process linter adapter plugins."""
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+
+
+class LinterAdapterError(RuntimeError):
+    """Raised when a linter fails to run in-process, e.g. on invalid options."""
+
+
+@dataclass(frozen=True)
+class AdapterMessage:
+    """A linter message returned by an adapter, as the linter would print it.
+
+    The path is relative to the directory the linter ran in, and the column is the one
+    the linter shows in its text output, or zero if the linter reports no column.
+
+    """
+
+    path: str
+    line: int
+    column: int
+    description: str
+
+
+class LinterAdapter(ABC):  # pylint: disable=too-few-public-methods
+    """Base class for adapters which call the Python API of a linter.
+
+    Adapters are registered in the ``graylint.linter`` entry point group under the name
+    of the linter command, e.g. ``pylint``. They are run in worker processes, with the
+    root of the tree being linted as the current working directory.
+
+    """
+
+    #: Modules imported by the adapter, preloaded once for all worker processes
+    modules: tuple[str, ...] = ()
+
+    @abstractmethod
+    def run(self, args: list[str], paths: list[str]) -> list[AdapterMessage]:
+        """Lint files and return the messages found.
+
+        :param args: Command line options given to the linter
+        :param paths: Paths of files and directories to lint, relative to the current
+                      working directory
+        :raises LinterAdapterError: if the linter can't be run with the given options
+        :return: The linter messages
+
+        """
@@ -0,0 +1,50 @@
+"""Run Flake8 in-process through its ``Application`` class."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from graylint.linter.base import AdapterMessage, LinterAdapter
+
+if TYPE_CHECKING:
+    from flake8.violation import Violation
+
+
+class Flake8Adapter(LinterAdapter):  # pylint: disable=too-few-public-methods
+    """Lint files with Flake8 and collect violations from its formatter."""
+
+    modules = ("flake8.main.application",)
+
+    def run(self, args: list[str], paths: list[str]) -> list[AdapterMessage]:
+        """Lint files with Flake8 and return the violations found.
+
+        :param args: Flake8 command line options
+        :param paths: Paths of files and directories to lint
+        :return: The Flake8 violations
+
+        """
+        # pylint: disable=import-outside-toplevel
+        from flake8.main.application import Application  # noqa: PLC0415
+
+        messages = []
+
+        def handle(violation: Violation) -> None:
+            messages.append(
+                AdapterMessage(
+                    violation.filename,
+                    violation.line_number,
+                    violation.column_number,
+                    f"{violation.code} {violation.text}",
+                )
+            )
+
+        application = Application()
+        # Files are already sharded across worker processes
+        application.initialize(["--jobs=1", *args, *paths])
+        if application.formatter is None:
+            message = "Flake8 formatter not initialized"
+            raise RuntimeError(message)
+        application.formatter.handle = handle
+        application.run_checks()
+        application.report_errors()
+        return messages
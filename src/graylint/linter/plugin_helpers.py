@@ -0,0 +1,55 @@
+"""Helpers for using in-process linter adapter plugins."""
+
+from __future__ import annotations
+
+import shutil
+import sysconfig
+from functools import cache
+from importlib.util import find_spec
+from pathlib import Path
+from typing import TYPE_CHECKING, cast
+
+from darkgraylib.plugins import get_entry_point_names, get_plugin_class
+
+if TYPE_CHECKING:
+    from graylint.linter.base import LinterAdapter
+
+LINTER_GROUP = "graylint.linter"
+
+
+def _is_own_linter(name: str, adapter_class: type[LinterAdapter]) -> bool:
+    """Check whether a linter command runs the same linter the adapter would import.
+
+    :param name: The linter command, e.g. ``pylint``
+    :param adapter_class: The adapter class for the linter
+    :return: ``True`` if the linter is importable, and the command either isn't on the
+             ``PATH`` or is the script installed in Graylint's own environment
+
+    """
+    if not all(find_spec(module.split(".")[0]) for module in adapter_class.modules):
+        return False
+    script = shutil.which(name)
+    return script is None or (
+        Path(script).parent.resolve() == Path(sysconfig.get_path("scripts")).resolve()
+    )
+
+
+@cache
+def get_linter_adapter(name: str) -> LinterAdapter | None:
+    """Return the in-process adapter for a linter command, memoized per process.
+
+    An adapter is used only for a bare linter command name which has an entry point in
+    the ``graylint.linter`` group, and only if the linter is installed in Graylint's own
+    environment. Otherwise, e.g. for a linter in another virtualenv, the linter is run
+    as a subprocess.
+
+    :param name: The linter command, e.g. ``pylint``
+    :return: The adapter, or ``None`` if the linter should be run as a subprocess
+
+    """
+    if name not in get_entry_point_names(LINTER_GROUP):
+        return None
+    adapter_class = cast("type[LinterAdapter]", get_plugin_class(LINTER_GROUP, name))
+    if not _is_own_linter(name, adapter_class):
+        return None
+    return adapter_class()
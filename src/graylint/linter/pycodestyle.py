@@ -0,0 +1,45 @@
+"""Run pycodestyle in-process through its ``StyleGuide`` class."""
+
+from __future__ import annotations
+
+from graylint.linter.base import AdapterMessage, LinterAdapter
+
+
+class PycodestyleAdapter(LinterAdapter):  # pylint: disable=too-few-public-methods
+    """Lint files with pycodestyle and collect errors with a custom report."""
+
+    modules = ("pycodestyle",)
+
+    def run(self, args: list[str], paths: list[str]) -> list[AdapterMessage]:
+        """Lint files with pycodestyle and return the errors found.
+
+        :param args: pycodestyle command line options
+        :param paths: Paths of files and directories to lint
+        :return: The pycodestyle errors
+
+        """
+        # pylint: disable=import-outside-toplevel
+        import pycodestyle  # noqa: PLC0415
+
+        messages = []
+
+        class CollectingReport(pycodestyle.BaseReport):
+            """Collect reported errors instead of printing them."""
+
+            def error(
+                self, line_number: int, offset: int, text: str, check: object
+            ) -> str | None:
+                code: str | None = super().error(line_number, offset, text, check)
+                if code:
+                    messages.append(
+                        AdapterMessage(self.filename, line_number, offset + 1, text)
+                    )
+                return code
+
+        # The paths are parsed along with the options so configuration files are looked
+        # up from them like on the command line, but only the paths are checked
+        style_guide = pycodestyle.StyleGuide(
+            paths=[*args, *paths], reporter=CollectingReport
+        )
+        style_guide.check_files(paths)
+        return messages
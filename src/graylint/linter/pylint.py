@@ -0,0 +1,43 @@
+"""Run Pylint in-process through ``pylint.lint.Run``."""
+
+from __future__ import annotations
+
+from graylint.linter.base import AdapterMessage, LinterAdapter
+
+
+class PylintAdapter(LinterAdapter):  # pylint: disable=too-few-public-methods
+    """Lint files with Pylint and collect its messages with a reporter.
+
+    Pylint checks e.g. duplicate code and cyclic imports across files, so all files are
+    linted in one worker process.
+
+    """
+
+    modules = ("pylint.lint", "pylint.reporters")
+
+    def run(self, args: list[str], paths: list[str]) -> list[AdapterMessage]:
+        """Lint files with Pylint and return the messages found.
+
+        :param args: Pylint command line options
+        :param paths: Paths of files and directories to lint
+        :return: The Pylint messages
+
+        """
+        # pylint: disable=import-outside-toplevel
+        from astroid import MANAGER  # noqa: PLC0415
+        from pylint.lint import Run  # noqa: PLC0415
+        from pylint.reporters import CollectingReporter  # noqa: PLC0415
+
+        # Modules are cached by name, and the worker may have linted another revision
+        MANAGER.clear_cache()
+        reporter = CollectingReporter()
+        Run([*args, *paths], reporter=reporter, exit=False)
+        return [
+            AdapterMessage(
+                message.path,
+                message.line,
+                message.column,
+                f"{message.msg_id}: {message.msg} ({message.symbol})",
+            )
+            for message in reporter.messages
+        ]
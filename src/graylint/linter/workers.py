@@ -0,0 +1,183 @@
+"""Pre-forked worker processes for running linter adapters.
+
+Worker processes are started on first use and kept until the end of the Graylint run, so
+the same workers lint both revisions and all shards of files. Where the platform
+supports it, workers are forked from a ``forkserver`` process which has already imported
+the linter modules of all available adapters. Starting a worker is then cheap, and no
+worker imports a linter from scratch.
+
+Each task changes the working directory and environment variables of the worker to
+those of the tree being linted, just like for a linter subprocess.
+
+"""
+
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import redirect_stdout
+from typing import TYPE_CHECKING
+
+from darkgraylib.plugins import get_entry_point_names
+from graylint.cpu_budget import get_cpu_budget
+from graylint.durations import get_duration_history, split_by_cost
+from graylint.linter.base import LinterAdapterError
+from graylint.linter.plugin_helpers import LINTER_GROUP, get_linter_adapter
+
+if TYPE_CHECKING:
+    from multiprocessing.context import BaseContext
+    from pathlib import Path
+
+    from graylint.linter.base import AdapterMessage
+
+logger = logging.getLogger(__name__)
+
+_pools: dict[int, ProcessPoolExecutor] = {}
+_pools_lock = threading.Lock()
+
+
+def get_worker_count() -> int:
+    """Return the number of worker processes to use for linter adapters.
+
+    :return: The number of CPU cores in the CPU budget
+
+    """
+    return get_cpu_budget().cpus
+
+
+def _make_context() -> BaseContext:
+    """Create the multiprocessing context for starting worker processes.
+
+    :return: A ``forkserver`` context preloading the linter modules of available
+             adapters, or a ``spawn`` context on platforms without ``forkserver``
+
+    """
+    if "forkserver" not in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("spawn")
+    context = multiprocessing.get_context("forkserver")
+    modules = [__name__]
+    for name in get_entry_point_names(LINTER_GROUP):
+        adapter = get_linter_adapter(name)
+        if adapter:
+            modules.extend(adapter.modules)
+    context.set_forkserver_preload(modules)
+    return context
+
+
+def _get_pool(workers: int) -> ProcessPoolExecutor:
+    """Return the pool of worker processes, creating it on first use.
+
+    :param workers: The number of worker processes
+    :return: The worker process pool
+
+    """
+    with _pools_lock:
+        if workers not in _pools:
+            logger.debug("Starting %s linter worker processes", workers)
+            _pools[workers] = ProcessPoolExecutor(workers, mp_context=_make_context())
+        return _pools[workers]
+
+
+def _lint_in_worker(
+    name: str, args: list[str], root: Path, paths: list[str], env: dict[str, str]
+) -> tuple[list[AdapterMessage], float]:
+    """Run a linter adapter in a worker process.
+
+    :param name: The linter command, e.g. ``pylint``
+    :param args: Command line options given to the linter
+    :param root: The common root of all files to lint
+    :param paths: Paths of files and directories to lint, relative to ``root``
+    :param env: Environment variables for the linter
+    :raises LinterAdapterError: if there's no adapter for the linter, or the linter
+                                exited instead of returning messages
+    :return: The linter messages, and the wall time of the linter in seconds
+
+    """
+    start = time.monotonic()
+    adapter = get_linter_adapter(name)
+    if adapter is None:
+        message = f"No in-process adapter for {name}"
+        raise LinterAdapterError(message)
+    os.chdir(root)
+    os.environ.clear()
+    os.environ.update(env)
+    try:
+        # Linter output on stdout would be mixed with Graylint's own output
+        with redirect_stdout(sys.stderr):
+            return adapter.run(args, paths), time.monotonic() - start
+    except SystemExit as exc:
+        message = f"{name} exited with {exc.code} when run in-process"
+        raise LinterAdapterError(message) from exc
+
+
+def _make_shards(name: str, paths: list[str]) -> list[list[str]]:
+    """Split files between worker processes by their expected cost.
+
+    :param name: The linter command, e.g. ``flake8``
+    :param paths: Paths of files to lint
+    :return: One shard of files for each core in the linter's share of the CPU budget
+
+    """
+    shard_count = min(get_cpu_budget().share(), len(paths))
+    costs = get_duration_history().expected_file_costs(name, paths)
+    return split_by_cost(paths, costs, shard_count)
+
+
+def run_adapter(  # noqa: PLR0913  # pylint: disable=too-many-arguments
+    name: str,
+    args: list[str],
+    root: Path,
+    paths: list[str],
+    *,
+    env: dict[str, str],
+    shardable: bool = False,
+) -> list[AdapterMessage]:
+    """Run a linter adapter in worker processes, sharding files if requested.
+
+    Files are split into as many shards as the linter's share of the CPU budget allows,
+    balanced by the expected cost of each file from the duration history.
+
+    :param name: The linter command, e.g. ``pylint``
+    :param args: Command line options given to the linter
+    :param root: The common root of all files to lint
+    :param paths: Paths of files and directories to lint, relative to ``root``
+    :param env: Environment variables for the linter
+    :param shardable: ``True`` to split the files between worker processes, for linters
+                      with no checks which span multiple files
+    :raises LinterAdapterError: if the linter failed to run in a worker process
+    :return: The linter messages
+
+    """
+    if not paths:
+        return []
+    pool = _get_pool(get_worker_count())
+    shards = _make_shards(name, paths) if shardable else [paths]
+    futures = [
+        pool.submit(_lint_in_worker, name, args, root, shard, env) for shard in shards
+    ]
+    try:
+        results = [future.result() for future in futures]
+    except BrokenProcessPool as exc:
+        shutdown_workers()
+        message = f"A worker process died while running {name}"
+        raise LinterAdapterError(message) from exc
+    if shardable:
+        history = get_duration_history()
+        for shard, (_, seconds) in zip(shards, results):
+            history.record_shard(name, shard, seconds)
+    return [message for shard_messages, _ in results for message in shard_messages]
+
+
+def shutdown_workers() -> None:
+    """Stop the worker processes started during this Graylint run."""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.shutdown(cancel_futures=True)
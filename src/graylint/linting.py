@@ -17,20 +17,30 @@ Pylint, on the other hand::
 All such output from the linter will be printed on the standard output
 provided that the ``<linenum>`` falls on a changed line.
 
+Linters with an adapter in the ``graylint.linter`` entry point group, e.g. Pylint, are
+instead run in-process through their Python API in reused worker processes, if they're
+installed in Graylint's own environment.
+
 """
 
+# pylint: disable=too-many-lines
+
 from __future__ import annotations
 
 import logging
 import os
 import re
 import shlex
+import sys
+import threading
+import time
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
 from dataclasses import dataclass
+from functools import partial
 from pathlib import Path
 from subprocess import PIPE, Popen  # nosec
-from tempfile import TemporaryDirectory
 from typing import (
     IO,
     TYPE_CHECKING,
@@ -46,16 +56,55 @@ from darkgraylib.git import (
     STDIN,
     WORKTREE,
     RevisionRange,
-    git_clone_local,
+    git_check_output_lines,
     git_get_content_at_revision,
     git_get_root,
     git_rev_parse,
 )
 from darkgraylib.utils import WINDOWS
+from graylint.coverage_data import is_coverage_data, iter_uncovered_lines
+from graylint.cpu_budget import (
+    apply_cpu_share,
+    get_background_prefix,
+    get_cpu_budget,
+)
+from graylint.dmypy import DMYPY, make_dmypy_command, stop_daemons
+from graylint.durations import get_duration_history
+from graylint.file_list import expand_paths, keep_existing
+from graylint.import_graph import get_affected_paths
+from graylint.limits import LinterLimitError, LinterLimits, get_linter_limits
+from graylint.linter.base import LinterAdapterError
+from graylint.linter.plugin_helpers import get_linter_adapter
+from graylint.linter.workers import run_adapter, shutdown_workers
+from graylint.lsp import (
+    DEFAULT_TIMEOUT,
+    LSP,
+    get_language_server,
+    shutdown_language_servers,
+)
 from graylint.output.plugin_helpers import create_output_plugins
+from graylint.profiles import get_config_files, get_linter_profile
+from graylint.staged import INDEX, git_checkout_index, git_get_content_in_index
+from graylint.workdirs import (
+    BASELINE,
+    REV2,
+    get_linter_cache_env,
+    is_stable_worktree,
+    stable_worktree,
+)
 
 if TYPE_CHECKING:
-    from graylint.command_line import OutputSpec
+    from collections.abc import Iterator, Mapping
+
+    from graylint.command_line import LinterOutputSpec, OutputSpec
+    from graylint.linter.base import AdapterMessage
+    from graylint.lsp import Diagnostic
+    from graylint.output.base import OutputPlugin
+
+    BaselineGetter = Callable[
+        [list[list[str]], Path, Collection[Path], str],
+        Mapping["MessageLocation", list["LinterMessage"]],
+    ]
 
 logger = logging.getLogger(__name__)
 
@@ -135,6 +184,81 @@ class DiffLineMapping:
         return NO_MESSAGE_LOCATION
 
 
+class LazyDiffLineMapping(DiffLineMapping):  # pylint: disable=too-few-public-methods
+    """A diff line mapping which is created for each file only when first needed"""
+
+    def __init__(self, root: Path, revrange: RevisionRange) -> None:
+        """Initialize an empty mapping for the given repository and revisions
+
+        :param root: The root of the repository
+        :param revrange: The revisions to compare
+
+        """
+        super().__init__()
+        self._root = root
+        self._revrange = revrange
+        self._mapped_paths: set[Path] = set()
+
+    def get(self, new_location: MessageLocation) -> MessageLocation:
+        """Get the old location of the message, mapping lines of its file if needed
+
+        :param new_location: The path, line and column number of a linter message in the
+                             new version of a file
+        :return: The path, line and column number of the same message in the old version
+                 of the file
+
+        """
+        if new_location.path not in self._mapped_paths:
+            self._mapped_paths.add(new_location.path)
+            _add_line_mapping(self, self._root, new_location.path, self._revrange)
+        return super().get(new_location)
+
+
+class NewMessageCounter:
+    """Count new linter messages as they are parsed, up to a maximum number
+
+    This is used to stop linting as soon as enough new messages have been found, e.g.
+    when only the presence of any new message matters.
+
+    """
+
+    def __init__(
+        self,
+        max_messages: int,
+        baseline: Mapping[MessageLocation, list[LinterMessage]],
+        diff_line_mapping: DiffLineMapping,
+    ) -> None:
+        """Initialize the counter
+
+        :param max_messages: The number of new messages after which to stop linting
+        :param baseline: Linter messages and their locations for a previous version
+        :param diff_line_mapping: Mapping between unmodified lines in old and new
+                                  versions
+
+        """
+        self.max_messages = max_messages
+        self.count = 0
+        self._baseline = baseline
+        self._diff_line_mapping = diff_line_mapping
+
+    @property
+    def limit_reached(self) -> bool:
+        """Return ``True`` if the maximum number of new messages has been found"""
+        return self.count >= self.max_messages
+
+    def add(self, location: MessageLocation, message: LinterMessage) -> bool:
+        """Count a linter message if it's new compared to the baseline
+
+        :param location: The location of the message in the new version of the file
+        :param message: The linter message
+        :return: ``True`` if the maximum number of new messages has been reached
+
+        """
+        if _is_new_message(self._baseline, self._diff_line_mapping, location, message):
+            self.count += 1
+        return self.limit_reached
+
+
 def normalize_whitespace(message: LinterMessage) -> LinterMessage:
     """Given a line of linter output, shortens runs of whitespace to a single space
 
@@ -157,22 +281,59 @@ def normalize_whitespace(message: LinterMessage) -> LinterMessage:
     )
 
 
-def make_linter_env(root: Path, revision: str) -> dict[str, str]:
+def make_linter_env(
+    root: Path, revision: str, cache_role: str | None = None
+) -> dict[str, str]:
     """Populate environment variables for running linters
 
     :param root: The path to the root of the Git repository
     :param revision: The commit hash of the Git revision being linted, or ``"WORKTREE"``
                      if the working tree is being linted
+    :param cache_role: The revision role, ``baseline`` or ``rev2``, to point linters to
+                       stable cache directories for, or ``None`` to use the linters'
+                       default cache directories
     :return: The environment variables dictionary to pass to the linter
 
     """
     return {
         **os.environ,
+        **(get_linter_cache_env(root, cache_role) if cache_role else {}),
         "GRAYLINT_ORIG_REPO": str(root),
         "GRAYLINT_REV_COMMIT": ("WORKTREE" if revision == "WORKTREE" else revision[:7]),
     }
 
 
+def get_changed_paths(
+    root: Path, revrange: RevisionRange, paths: Collection[Path]
+) -> set[Path]:
+    """Get paths of files which differ between two revisions.
+
+    :param root: The root of the Git repository
+    :param revrange: The revisions to compare. ``rev2`` can be ``WORKTREE``, in which
+                     case untracked files are included as well, or ``INDEX`` to compare
+                     to changes staged in the Git index.
+    :param paths: Files and directories to limit the comparison to
+    :return: Paths of changed, added and deleted files, relative to ``root``
+
+    """
+    pathspecs = ["--", *(str(path) for path in paths)]
+    revisions = [revrange.rev1]
+    if revrange.rev2 == INDEX:
+        revisions.insert(0, "--cached")
+    elif revrange.rev2 != WORKTREE:
+        revisions.append(revrange.rev2)
+    changed = git_check_output_lines(
+        ["diff", "--name-only", "--no-renames", *revisions, *pathspecs], root
+    )
+    if revrange.rev2 == WORKTREE:
+        changed.extend(
+            git_check_output_lines(
+                ["ls-files", "--others", "--exclude-standard", *pathspecs], root
+            )
+        )
+    return {Path(path) for path in changed}
+
+
 def _strict_nonneg_int(text: str) -> int:
     """Strict parsing of strings to non-negative integers
 
@@ -263,27 +424,13 @@ def _parse_linter_line(
     return (MessageLocation(path, linenum, column), LinterMessage(linter, description))
 
 
-def _require_rev2_worktree(rev2: str) -> None:
-    """Exit with an error message if ``rev2`` is not ``WORKTREE``
-
-    This is used when running linters since linting arbitrary commits is not supported.
-
-    :param rev2: The ``rev2`` revision to lint.
-
-    """
-    if rev2 != WORKTREE:
-        raise NotImplementedError(
-            "Linting arbitrary commits is not supported. "
-            "Please use -r {<rev>|<rev>..|<rev>...} instead."
-        )
-
-
 @contextmanager
 def _check_linter_output(
     cmdline: list[str],
     root: Path,
     paths: Collection[Path],
     env: dict[str, str],
+    limits: LinterLimits | None = None,
 ) -> Generator[IO[str]]:
     """Run a linter as a subprocess and return its standard output stream
 
@@ -291,6 +438,8 @@ def _check_linter_output(
     :param root: The common root of all files to lint
     :param paths: Paths of files to check, relative to ``root``
     :param env: Environment variables to pass to the linter
+    :param limits: Wall-clock timeout, CPU time and memory limits for the linter
+    :raises LinterLimitError: if the linter exceeded its time or resource limits
     :return: The standard output stream of the linter subprocess
 
     """
@@ -300,44 +449,184 @@ def _check_linter_output(
     effective_env = env.copy()
     if WINDOWS:
         effective_env["PYTHONIOENCODING"] = "utf-8"
-    with Popen(  # nosec
-        cmdline_and_paths,
+    limits = limits or LinterLimits()
+    prefix = get_background_prefix() if get_cpu_budget().background else []
+    timed_out = threading.Event()
+    with Popen(  # noqa: S603  # nosec
+        prefix + cmdline_and_paths,
         stdout=PIPE,
         encoding="utf-8",
         cwd=root,
         env=effective_env,
     ) as linter_process:
+        limits.apply(linter_process.pid)
         # condition needed for MyPy (see https://stackoverflow.com/q/57350490/15770)
         if linter_process.stdout is None:
             raise RuntimeError("Stdout piping failed")
-        yield linter_process.stdout
+
+        def kill_on_timeout() -> None:
+            timed_out.set()
+            linter_process.kill()
+
+        timer = threading.Timer(limits.timeout or 0, kill_on_timeout)
+        if limits.timeout is not None:
+            timer.start()
+        try:
+            yield linter_process.stdout
+        finally:
+            timer.cancel()
+        if linter_process.stdout.closed and linter_process.poll() is None:
+            # The caller stopped reading linter output early, e.g. because the maximum
+            # number of new messages was reached. Don't wait for the linter to finish.
+            logger.debug("Terminating %s", cmdline[0])
+            linter_process.terminate()
+            return
+        returncode = linter_process.wait()
+    _check_linter_limits(cmdline[0], env, limits, returncode, timed_out.is_set())
+
+
+def _check_linter_limits(
+    linter: str,
+    env: dict[str, str],
+    limits: LinterLimits,
+    returncode: int,
+    timed_out: bool,  # noqa: FBT001
+) -> None:
+    """Raise an exception if a linter was stopped for exceeding its limits
+
+    Partial linter output would give wrong results when compared to the other revision,
+    so linting can't continue if either run was cut short.
+
+    :param linter: The name of the linter
+    :param env: The environment variables passed to the linter, to get the revision
+    :param limits: The time and resource limits of the linter
+    :param returncode: The return code of the linter subprocess
+    :param timed_out: ``True`` if the linter was killed after its wall-clock timeout
+    :raises LinterLimitError: if the linter exceeded its time or resource limits
+
+    """
+    reason = (
+        f"timed out after {limits.timeout} seconds"
+        if timed_out
+        else limits.describe_exit(returncode)
+    )
+    if reason:
+        revision = env.get("GRAYLINT_REV_COMMIT", "WORKTREE")
+        message = f"Linter {linter} {reason} when linting revision {revision}"
+        raise LinterLimitError(message, linter, limits.timeout if timed_out else None)
 
 
 def _transform_linter_command(cmdline: list[str]) -> list[str]:
     """Transform the linter command to ensure required options are in place.
 
     This is done for ergonomics: The user can just specify ``--lint=ruff`` and have
-    ``ruff check --output-format=concise`` run.
+    ``ruff check --output-format=concise`` run. The subcommand and output options to add
+    come from the profile of the linter.
 
     :param cmdline: The command line to transform
     :return: The transformed command line as a list of arguments
 
     """
-    if not cmdline or cmdline[0] != "ruff":
+    if not cmdline:
         return cmdline
+    profile = get_linter_profile(cmdline)
     transformed_cmdline = cmdline.copy()
-    if "check" not in transformed_cmdline:
-        transformed_cmdline.insert(1, "check")
-    if not any(arg.startswith("--output-format") for arg in transformed_cmdline):
-        transformed_cmdline.append("--output-format=concise")
+    if profile.subcommand and profile.subcommand not in transformed_cmdline:
+        transformed_cmdline.insert(1, profile.subcommand)
+    for option in profile.output_options:
+        option_name = option.split("=", 1)[0]
+        if not any(arg.startswith(option_name) for arg in transformed_cmdline):
+            transformed_cmdline.append(option)
     return transformed_cmdline
 
 
-def run_linter(  # pylint: disable=too-many-locals
+def _iter_linter_messages(
+    linter: str, lines: Iterable[str], root: Path, source: str
+) -> Iterator[tuple[MessageLocation, LinterMessage]]:
+    """Parse linter output and yield messages for existing Python files
+
+    :param linter: The name of the linter
+    :param lines: The linter output lines to parse
+    :param root: The directory relative to which paths in the output are returned
+    :param source: The linter command line or output file path, for warning messages
+    :return: An iterator of linter message locations and messages, for files which
+             exist in ``root``
+
+    """
+    return _filter_linter_messages(
+        (_parse_linter_line(linter, line, root) for line in lines), root, source
+    )
+
+
+def _filter_linter_messages(
+    messages: Iterable[tuple[MessageLocation, LinterMessage]], root: Path, source: str
+) -> Iterator[tuple[MessageLocation, LinterMessage]]:
+    """Skip linter messages which aren't for existing Python files
+
+    :param messages: Linter message locations and messages
+    :param root: The directory relative to which message paths are given
+    :param source: The linter command line or output file path, for warning messages
+    :return: An iterator of linter message locations and messages, for files which
+             exist in ``root``
+
+    """
+    missing_files = set()
+    for location, message in messages:
+        if location is NO_MESSAGE_LOCATION or location.path in missing_files:
+            continue
+        if location.path.suffix != ".py":
+            logger.warning(
+                "Linter message for a non-Python file: %s: %s",
+                location,
+                message.description,
+            )
+            continue
+        path = root / location.path
+        if not path.is_file() and not path.is_symlink():
+            logger.warning("Missing file %s from %s", location.path, source)
+            missing_files.add(location.path)
+            continue
+        yield location, message
+
+
+def _parse_linter_output(
+    linter: str,
+    lines: IO[str],
+    root: Path,
+    source: str,
+    message_counter: NewMessageCounter | None = None,
+) -> dict[MessageLocation, LinterMessage]:
+    """Parse linter output and return messages for existing Python files
+
+    If the maximum number of new messages is reached, the rest of the output is skipped
+    and the ``lines`` stream is closed to signal that no more output is needed.
+
+    :param linter: The name of the linter
+    :param lines: The linter output stream to parse
+    :param root: The directory relative to which paths in the output are returned
+    :param source: The linter command line or output file path, for warning messages
+    :param message_counter: Counter for new messages, to stop parsing at a threshold
+    :return: Linter messages and their locations
+
+    """
+    result = {}
+    for location, message in _iter_linter_messages(linter, lines, root, source):
+        result[location] = message
+        if message_counter and message_counter.add(location, message):
+            logger.debug("Maximum number of new messages reached in %s", source)
+            lines.close()
+            break
+    return result
+
+
+def run_linter(  # noqa: PLR0913  # pylint: disable=too-many-arguments
     cmdline: list[str],
     root: Path,
     paths: Collection[Path],
     env: dict[str, str],
+    message_counter: NewMessageCounter | None = None,
+    *,
+    limits: LinterLimits | None = None,
 ) -> dict[MessageLocation, LinterMessage]:
     """Run the given linter and return linting errors falling on changed lines
 
@@ -345,43 +634,311 @@ def run_linter(  # pylint: disable=too-many-locals
     :param root: The common root of all files to lint
     :param paths: Paths of files to check, relative to ``root``
     :param env: Environment variables to pass to the linter
+    :param message_counter: Counter for new messages, to terminate the linter early
+                            when the maximum number of new messages is reached
+    :param limits: Wall-clock timeout, CPU time and memory limits for the linter
     :return: The number of modified lines with linting errors from this linter
 
     """
-    missing_files = set()
-    result = {}
     transformed_cmdline = _transform_linter_command(cmdline)
     linter = transformed_cmdline[0]
+    if linter == LSP:
+        return _run_language_server(
+            transformed_cmdline[1:],
+            root,
+            paths,
+            env,
+            message_counter=message_counter,
+            limits=limits,
+        )
+    adapter = get_linter_adapter(linter)
+    # Time and resource limits can only be enforced for a linter subprocess
+    if adapter and (limits or LinterLimits()) == LinterLimits():
+        try:
+            return _run_linter_adapter(
+                transformed_cmdline,
+                root,
+                paths,
+                env,
+                message_counter=message_counter,
+            )
+        except LinterAdapterError as exc:
+            logger.warning("%s, running it as a subprocess instead", exc)
+    if linter == DMYPY:
+        # Send a check request to a Mypy daemon kept warm for this tree
+        transformed_cmdline = make_dmypy_command(transformed_cmdline, root)
     cmdline_str = shlex.join(transformed_cmdline)
+    if linter != DMYPY:
+        # Let the linter use its share of the CPU budget for parallel processes
+        transformed_cmdline, env = apply_cpu_share(
+            transformed_cmdline,
+            env,
+            get_linter_profile(transformed_cmdline),
+            get_cpu_budget().share(),
+        )
     # 10. run a linter subprocess for files mentioned on the command line which may be
     #     modified or unmodified, to get current linting status in the working tree
     #     (steps 10.-12. are optional)
-    with _check_linter_output(transformed_cmdline, root, paths, env) as linter_stdout:
-        for line in linter_stdout:
-            (location, message) = _parse_linter_line(linter, line, root)
-            if location is NO_MESSAGE_LOCATION or location.path in missing_files:
-                continue
-            if location.path.suffix != ".py":
-                logger.warning(
-                    "Linter message for a non-Python file: %s: %s",
-                    location,
-                    message.description,
-                )
-                continue
-            if not location.path.is_file() and not location.path.is_symlink():
-                logger.warning("Missing file %s from %s", location.path, cmdline_str)
-                missing_files.add(location.path)
-                continue
+    with _check_linter_output(
+        transformed_cmdline, root, paths, env, limits
+    ) as linter_stdout:
+        return _parse_linter_output(
+            linter, linter_stdout, root, cmdline_str, message_counter
+        )
+
+
+def _iter_python_files(root: Path, paths: Collection[Path]) -> Iterator[Path]:
+    """Find Python files in the given files and directories
+
+    :param root: The common root of all files to lint
+    :param paths: Paths of files and directories, relative to ``root``
+    :return: An iterator of Python file paths relative to ``root``, skipping hidden
+             directories
+
+    """
+    for path in sorted(paths):
+        if (root / path).is_dir():
+            for file_path in sorted((root / path).rglob("*.py")):
+                relative_path = file_path.relative_to(root)
+                if not any(part.startswith(".") for part in relative_path.parts):
+                    yield relative_path
+        elif path.suffix == ".py" and (root / path).is_file():
+            yield path
+
+
+def _convert_diagnostic(
+    path: Path, diagnostic: Diagnostic, default_linter: str
+) -> tuple[MessageLocation, LinterMessage]:
+    """Convert a diagnostic from a language server into a linter message
+
+    Only the first line of a multi-line diagnostic message is used.
+
+    :param path: The path of the file the diagnostic is for
+    :param diagnostic: The diagnostic published by the language server
+    :param default_linter: The linter name to use if the diagnostic has no source
+    :return: The location and the linter message
+
+    """
+    start = diagnostic["range"]["start"]
+    code = diagnostic.get("code")
+    # Some servers add hints on following lines, but linter messages are single lines
+    description = diagnostic["message"].strip().split("\n", 1)[0]
+    return (
+        MessageLocation(path, start["line"] + 1, start["character"] + 1),
+        LinterMessage(
+            diagnostic.get("source") or default_linter,
+            f"{code} {description}" if code else description,
+        ),
+    )
+
+
+def _run_language_server(  # noqa: PLR0913  # pylint: disable=too-many-arguments
+    cmdline: list[str],
+    root: Path,
+    paths: Collection[Path],
+    env: dict[str, str],
+    *,
+    message_counter: NewMessageCounter | None = None,
+    limits: LinterLimits | None = None,
+) -> dict[MessageLocation, LinterMessage]:
+    """Get diagnostics for files from a language server kept running for the tree
+
+    :param cmdline: The command line for starting the language server
+    :param root: The common root of all files to lint
+    :param paths: Paths of files and directories to check, relative to ``root``
+    :param env: Environment variables for starting the language server
+    :param message_counter: Counter for new messages, to stop early when the maximum
+                            number of new messages is reached
+    :param limits: The wall-clock timeout is used for waiting for diagnostics
+    :return: Linter messages and their locations
+
+    """
+    timeout = (limits.timeout if limits else None) or DEFAULT_TIMEOUT
+    server = get_language_server(cmdline, root, timeout, env)
+    default_linter = Path(cmdline[0]).name
+    result = {}
+    for path, diagnostics in server.diagnose(
+        _iter_python_files(root, paths), timeout
+    ).items():
+        for diagnostic in diagnostics:
+            location, message = _convert_diagnostic(path, diagnostic, default_linter)
             result[location] = message
+            if message_counter and message_counter.add(location, message):
+                return result
+    return result
+
+
+def _run_linter_adapter(
+    cmdline: list[str],
+    root: Path,
+    paths: Collection[Path],
+    env: dict[str, str],
+    *,
+    message_counter: NewMessageCounter | None = None,
+) -> dict[MessageLocation, LinterMessage]:
+    """Run a linter in-process in worker processes through its adapter
+
+    :param cmdline: The command line for running the linter
+    :param root: The common root of all files to lint
+    :param paths: Paths of files and directories to check, relative to ``root``
+    :param env: Environment variables to pass to the linter
+    :param message_counter: Counter for new messages, to stop early when the maximum
+                            number of new messages is reached
+    :raises LinterAdapterError: if the linter failed to run in-process
+    :return: Linter messages and their locations
+
+    """
+    shardable = get_linter_profile(cmdline).per_file
+    path_strs = sorted(
+        str(path)
+        for path in (
+            # Only per-file linters get a flat list of files to split between workers
+            _iter_python_files(root, paths) if shardable else paths
+        )
+        if (root / path).exists()
+    )
+    linter = cmdline[0]
+    adapter_messages = run_adapter(
+        linter, cmdline[1:], root, path_strs, env=env, shardable=shardable
+    )
+    result = {}
+    for location, message in _filter_linter_messages(
+        (
+            _convert_adapter_message(linter, adapter_message, root)
+            for adapter_message in adapter_messages
+        ),
+        root,
+        shlex.join(cmdline),
+    ):
+        result[location] = message
+        if message_counter and message_counter.add(location, message):
+            break
     return result
 
 
-def run_linters(
+def _convert_adapter_message(
+    linter: str, adapter_message: AdapterMessage, root: Path
+) -> tuple[MessageLocation, LinterMessage]:
+    """Convert a message from an in-process linter adapter into a linter message
+
+    :param linter: The name of the linter
+    :param adapter_message: The message returned by the adapter
+    :param root: The directory the linter ran in, relative to which paths are returned
+    :return: The location and the linter message, or a dummy location for files outside
+             ``root``
+
+    """
+    path = Path(adapter_message.path)
+    if path.is_absolute():
+        try:
+            path = path.relative_to(root)
+        except ValueError:
+            logger.warning(
+                "Linter message for a file %s outside root directory %s", path, root
+            )
+            return (NO_MESSAGE_LOCATION, LinterMessage(linter, ""))
+    return (
+        MessageLocation(path, adapter_message.line, adapter_message.column),
+        LinterMessage(linter, adapter_message.description),
+    )
+
+
+@contextmanager
+def linter_servers(*, keep_daemons: bool) -> Iterator[None]:
+    """Stop language servers, linter workers and daemons started in the context
+
+    :param keep_daemons: ``True`` to leave Mypy daemons of trees which still exist
+                         running for later runs
+    :return: A context manager for running linters
+
+    """
+    try:
+        yield
+    finally:
+        shutdown_language_servers()
+        shutdown_workers()
+        stop_daemons(keep_daemons=keep_daemons)
+
+
+@contextmanager
+def _open_linter_output(path: Path) -> Generator[IO[str]]:
+    """Open a linter output file, named pipe or standard input for streaming
+
+    :param path: The path to the linter output, or ``-`` for standard input
+    :return: The stream to read linter output lines from
+
+    """
+    if path == Path("-"):
+        yield sys.stdin
+        return
+    with path.open(encoding="utf-8") as linter_output:
+        yield linter_output
+
+
+def read_linter_output(  # noqa: PLR0913  # pylint: disable=too-many-arguments
+    linter: str,
+    path: Path,
+    root: Path,
+    message_counter: NewMessageCounter | None = None,
+    *,
+    paths: Collection[Path] | None = None,
+    revision: str | None = None,
+) -> dict[MessageLocation, LinterMessage]:
+    """Read linter messages from the saved output of a linter instead of running it
+
+    The output is parsed line by line as it's read, so e.g. a pipe from a linter still
+    running in parallel can be used, and the whole output is never held in memory.
+
+    A coverage.py data file is read with the coverage.py data API instead, and a ``no
+    coverage`` message is created for each statement which wasn't executed.
+
+    :param linter: The name of the linter which produced the output
+    :param path: The path to the linter output, or ``-`` for standard input
+    :param root: The directory relative to which paths in the output are returned
+    :param message_counter: Counter for new messages, to stop reading early when the
+                            maximum number of new messages is reached
+    :param paths: The files and directories being linted, to limit coverage messages to
+    :param revision: The revision to read source code for coverage messages from, or
+                     ``None`` to read it from files in ``root``
+    :return: Linter messages and their locations
+
+    """
+    if is_coverage_data(path):
+        result = {}
+        for location, message in _filter_linter_messages(
+            (
+                (MessageLocation(file_path, linenum), LinterMessage(linter, text))
+                for file_path, linenum, text in iter_uncovered_lines(
+                    path, root, paths, revision
+                )
+            ),
+            root,
+            str(path),
+        ):
+            result[location] = message
+            if message_counter and message_counter.add(location, message):
+                break
+        return result
+    with _open_linter_output(path) as linter_output:
+        return _parse_linter_output(
+            linter, linter_output, root, str(path), message_counter
+        )
+
+
+def run_linters(  # noqa: PLR0913  # pylint: disable=too-many-arguments,too-many-locals
     linter_cmdlines: list[list[str]],
     root: Path,
     paths: set[Path],
     revrange: RevisionRange,
     output_spec: Sequence[OutputSpec],
+    *,
+    get_baseline: BaselineGetter | None = None,
+    linter_outputs: Sequence[LinterOutputSpec] = (),
+    baseline_linter_outputs: Sequence[LinterOutputSpec] = (),
+    max_messages: int | None = None,
+    linter_limits: Mapping[str, LinterLimits] | None = None,
+    import_depth: int | None = None,
+    expand_directories: bool = False,
 ) -> int:
     """Run the given linters on a set of files in the repository, filter messages
 
@@ -391,6 +948,10 @@ def run_linters(
     - running them again in ``rev2`` to get linter messages after user changes, and
     - printing out only new messages which were not present in the baseline.
 
+    Both revisions are linted in parallel. If ``rev2`` is a commit instead of the
+    working tree, it's checked out in a temporary directory just like ``rev1``, so the
+    working tree is never touched.
+
     If the source tree is not a Git repository, a baseline is not used, and all linter
     messages are printed
 
@@ -399,17 +960,30 @@ def run_linters(
     :param paths: The files and directories to check, relative to ``root``
     :param revrange: The Git revisions to compare
     :param output_spec: The output formats and destinations for linter messages
+    :param get_baseline: A callback for getting linter messages for the ``rev1``
+                         baseline, e.g. by loading them from a file. The default is to
+                         run the linters on a temporary checkout of ``rev1``.
+    :param linter_outputs: Saved linter outputs to read for ``rev2`` in addition to
+                           running the linters in ``linter_cmdlines``
+    :param baseline_linter_outputs: Saved linter outputs to read for ``rev1``
+    :param max_messages: Stop linting and terminate linters after this many new linter
+                         messages have been found
+    :param linter_limits: Wall-clock timeouts, CPU time and memory limits by linter
+                          name, with the empty string for limits of all linters
+    :param import_depth: Lint only changed files and files importing them through at
+                         most this many levels of imports, or ``None`` to lint all files
+    :param expand_directories: Give linters the Python files known to Git in the
+                               directories to lint instead of the directories
     :raises NotImplementedError: if ``--stdin-filename`` is used
     :return: Total number of linting errors found on modified lines
 
     """
-    if not linter_cmdlines:
+    if not linter_cmdlines and not linter_outputs:
         return 0
     if revrange.rev2 == STDIN:
         raise NotImplementedError(
             "The -l/--lint option isn't yet available with --stdin-filename"
         )
-    _require_rev2_worktree(revrange.rev2)
     git_root = git_get_root(root)
     if not git_root:
         # In a non-Git root, don't use a baseline
@@ -418,6 +992,13 @@ def run_linters(
             root,
             paths,
             make_linter_env(root, "WORKTREE"),
+            linter_outputs=linter_outputs,
+            message_counter=(
+                NewMessageCounter(max_messages, {}, DiffLineMapping())
+                if max_messages
+                else None
+            ),
+            linter_limits=linter_limits,
         )
         return _print_new_linter_messages(
             baseline={},
@@ -425,26 +1006,80 @@ def run_linters(
             diff_line_mapping=DiffLineMapping(),
             output_spec=output_spec,
         )
-    git_paths = {(root / path).relative_to(git_root) for path in paths}
+    if (
+        import_depth is None
+        and not linter_outputs
+        and not get_baseline
+        and all(get_linter_profile(cmdline).per_file for cmdline in linter_cmdlines)
+    ):
+        # Per-file linters give the same messages for unchanged files in both revisions.
+        # Saved, loaded and cached baselines cover all the requested files instead.
+        import_depth = 0
+    git_paths, baseline_paths = _select_paths(
+        linter_cmdlines,
+        git_root,
+        {(root / path).relative_to(git_root) for path in paths},
+        revrange,
+        import_depth=import_depth,
+        expand_directories=expand_directories,
+    )
+    if not git_paths and not linter_outputs:
+        return 0
     # 10. first do a temporary checkout at `rev1` and run linter subprocesses once for
     #     all files which are mentioned on the command line to establish a baseline
     #     (steps 10.-12. are optional)
-    baseline = _get_messages_from_linters_for_baseline(
+    #     (or, e.g. load a baseline stored earlier for the same revision and linters)
+    #     (or, read saved linter output for ``rev1``)
+    if revrange.rev2 == INDEX:
+        # In staged mode, write only the requested files from ``rev1`` into a scratch
+        # tree instead of checking out the whole baseline revision
+        default_get_baseline: BaselineGetter = partial(
+            _get_messages_from_linters_for_scratch_tree,
+            line_processor=normalize_whitespace,
+            linter_limits=linter_limits,
+        )
+    else:
+        default_get_baseline = partial(
+            _get_messages_from_linters_for_baseline, linter_limits=linter_limits
+        )
+    get_baseline_messages = partial(
+        _get_baseline_with_linter_outputs,
+        get_baseline or default_get_baseline,
         linter_cmdlines,
         git_root,
-        git_paths,
+        baseline_paths,
         revrange.rev1,
+        linter_outputs=linter_outputs,
+        baseline_linter_outputs=baseline_linter_outputs,
     )
-    messages = _get_messages_from_linters(
+    get_messages = partial(
+        _get_messages_from_linters_for_rev2,
         linter_cmdlines,
         git_root,
         git_paths,
-        make_linter_env(git_root, "WORKTREE"),
+        revrange.rev2,
+        linter_outputs=linter_outputs,
+        linter_limits=linter_limits,
     )
-    files_with_messages = {location.path for location in messages}
-    # 11. create a mapping from line numbers of unmodified lines in the current versions
-    #     to corresponding line numbers in ``rev1``
-    diff_line_mapping = _create_line_mapping(git_root, files_with_messages, revrange)
+    if max_messages:
+        # With a maximum number of messages, the baseline is needed first so new
+        # messages can be counted while linting ``rev2``. Line mappings are created as
+        # soon as a file gets its first linter message.
+        baseline = get_baseline_messages()
+        diff_line_mapping: DiffLineMapping = LazyDiffLineMapping(git_root, revrange)
+        messages = get_messages(
+            message_counter=NewMessageCounter(max_messages, baseline, diff_line_mapping)
+        )
+    else:
+        baseline, messages = lint_baseline_in_background(
+            get_baseline_messages, get_messages
+        )
+        files_with_messages = {location.path for location in messages}
+        # 11. create a mapping from line numbers of unmodified lines in the current
+        #     versions to corresponding line numbers in ``rev1``
+        diff_line_mapping = _create_line_mapping(
+            git_root, files_with_messages, revrange
+        )
     # 12. hide linter messages which appear in the current versions and identically on
     #     corresponding lines in ``rev1``, and show all other linter messages
     return _print_new_linter_messages(
@@ -452,6 +1087,175 @@ def run_linters(
     )
 
 
+def lint_baseline_in_background(
+    get_baseline_messages: Callable[[], Mapping[MessageLocation, list[LinterMessage]]],
+    get_messages: Callable[[], dict[MessageLocation, list[LinterMessage]]],
+) -> tuple[
+    Mapping[MessageLocation, list[LinterMessage]],
+    dict[MessageLocation, list[LinterMessage]],
+]:
+    """Lint the baseline in a background thread while linting ``rev2``
+
+    The two revisions share the CPU budget, and linter subprocesses for the baseline
+    run with a lower priority.
+
+    :param get_baseline_messages: A function for linting the baseline
+    :param get_messages: A function for linting ``rev2``
+    :return: Linter messages for the baseline and for ``rev2``
+
+    """
+    budget = get_cpu_budget()
+    with (
+        budget.lane() as rev2_lane,
+        budget.lane(background=True) as baseline_lane,
+        ThreadPoolExecutor(max_workers=1) as executor,
+    ):
+        baseline_future = executor.submit(baseline_lane.run, get_baseline_messages)
+        messages = rev2_lane.run(get_messages)
+        return baseline_future.result(), messages
+
+
+def _select_paths(  # noqa: PLR0913  # pylint: disable=too-many-arguments
+    linter_cmdlines: list[list[str]],
+    root: Path,
+    paths: set[Path],
+    revrange: RevisionRange,
+    *,
+    import_depth: int | None,
+    expand_directories: bool,
+) -> tuple[set[Path], set[Path]]:
+    """Choose the files and directories to lint in ``rev2`` and in the baseline
+
+    :param linter_cmdlines: The command lines for linter tools to run on the files
+    :param root: The root of the Git repository
+    :param paths: The files and directories to check, relative to ``root``
+    :param revrange: The revisions to compare
+    :param import_depth: Lint only changed files and files importing them through at
+                         most this many levels of imports, or ``None`` to lint all files
+    :param expand_directories: Replace directories with the Python files known to Git
+    :return: Paths to lint in ``rev2`` and in ``rev1``, relative to ``root``
+
+    """
+    if expand_directories:
+        git_paths = expand_paths(root, paths, revrange.rev2)
+    else:
+        git_paths = paths
+    if import_depth is not None:
+        git_paths = _select_affected_paths(
+            root, git_paths, revrange, import_depth, linter_cmdlines
+        )
+    elif not expand_directories:
+        return git_paths, git_paths
+    # Files deleted since ``rev1`` are left out when linting ``rev2``, and files added
+    # since ``rev1`` when linting the baseline
+    return (
+        keep_existing(root, git_paths, revrange.rev2, paths),
+        keep_existing(root, git_paths, revrange.rev1, paths),
+    )
+
+
+def _select_affected_paths(
+    root: Path,
+    paths: Collection[Path],
+    revrange: RevisionRange,
+    depth: int,
+    linter_cmdlines: list[list[str]],
+) -> set[Path]:
+    """Find files which can get new linter messages due to changes between revisions
+
+    Other files are unchanged and import no changed module, so linters which check code
+    across modules, like Mypy and Pylint, give the same messages for them in both
+    revisions. Importers are only looked for if some linter isn't a per-file linter
+    according to its profile. If a linter configuration file has changed, all files are
+    linted.
+
+    :param root: The root of the Git repository
+    :param paths: The files and directories to check, relative to ``root``
+    :param revrange: The revisions to compare
+    :param depth: The maximum number of import levels between a changed file and a file
+                  importing it
+    :param linter_cmdlines: The command lines for linter tools to run on the files
+    :return: Changed files and files importing them, limited to ``paths``
+
+    """
+    changed_paths = get_changed_paths(root, revrange, [])
+    config_files = get_config_files(linter_cmdlines)
+    changed_configs = sorted(
+        str(path) for path in changed_paths if path.name in config_files
+    )
+    if changed_configs:
+        logger.debug(
+            "Linting all files since linter configuration changed in %s",
+            ", ".join(changed_configs),
+        )
+        return set(paths)
+    if all(get_linter_profile(cmdline).per_file for cmdline in linter_cmdlines):
+        depth = 0
+    affected_paths = (
+        get_affected_paths(root, [revrange.rev1, revrange.rev2], changed_paths, depth)
+        if depth
+        else changed_paths
+    )
+    result = {
+        path
+        for path in affected_paths
+        if any(path == linted or linted in path.parents for linted in paths)
+    }
+    logger.debug(
+        "Linting %s changed files and %s importers",
+        len(result & changed_paths),
+        len(result - changed_paths),
+    )
+    return result
+
+
+def _get_baseline_with_linter_outputs(  # noqa: PLR0913
+    get_baseline: BaselineGetter,
+    linter_cmdlines: list[list[str]],
+    root: Path,
+    paths: Collection[Path],
+    revision: str,
+    *,
+    linter_outputs: Sequence[LinterOutputSpec],
+    baseline_linter_outputs: Sequence[LinterOutputSpec],
+) -> Mapping[MessageLocation, list[LinterMessage]]:
+    """Get baseline messages from linters and from saved linter output for ``rev1``
+
+    :param get_baseline: The callback for getting linter messages for the baseline
+    :param linter_cmdlines: The command lines for linter tools to run on the files
+    :param root: The root of the Git repository
+    :param paths: The files and directories to check, relative to ``root``
+    :param revision: The baseline revision
+    :param linter_outputs: Saved linter outputs for ``rev2``
+    :param baseline_linter_outputs: Saved linter outputs for ``rev1``
+    :return: Linter messages for the baseline revision
+
+    """
+    # pylint: disable=too-many-arguments
+    baseline_linters = {spec.linter for spec in baseline_linter_outputs}
+    for spec in linter_outputs:
+        if spec.linter not in baseline_linters:
+            logger.warning(
+                "No baseline output given for %s, showing all its messages",
+                spec.linter,
+            )
+    baseline = (
+        get_baseline(linter_cmdlines, root, paths, revision) if linter_cmdlines else {}
+    )
+    if not baseline_linter_outputs:
+        return baseline
+    result: dict[MessageLocation, list[LinterMessage]] = defaultdict(list)
+    for location, messages_at_location in baseline.items():
+        result[location].extend(messages_at_location)
+    for spec in baseline_linter_outputs:
+        messages = read_linter_output(
+            spec.linter, spec.path, root, paths=paths, revision=revision
+        )
+        for location, message in messages.items():
+            result[location].append(normalize_whitespace(message))
+    return result
+
+
 def _identity_line_processor(message: LinterMessage) -> LinterMessage:
     """Return message unmodified in the default line processor
 
@@ -462,12 +1266,58 @@ def _identity_line_processor(message: LinterMessage) -> LinterMessage:
     return message
 
 
-def _get_messages_from_linters(
+def _run_linters_longest_first(  # noqa: PLR0913  # pylint: disable=too-many-arguments
+    linter_cmdlines: list[list[str]],
+    root: Path,
+    paths: Collection[Path],
+    env: dict[str, str],
+    *,
+    message_counter: NewMessageCounter | None,
+    linter_limits: Mapping[str, LinterLimits] | None,
+) -> list[dict[MessageLocation, LinterMessage]]:
+    """Run linters one by one starting from the slowest, and record how long each took
+
+    The linters run one after another, so the order doesn't change how long this takes.
+    See `graylint.durations` for what the order is good for.
+
+    :param linter_cmdlines: The command lines for running the linters
+    :param root: The common root of all files to lint
+    :param paths: Paths of files to check, relative to ``root``
+    :param env: The environment variables to pass to the linter
+    :param message_counter: Counter for new messages. When its maximum is reached, the
+                            running linter is terminated and remaining linters skipped.
+    :param linter_limits: Time and resource limits by linter name
+    :return: Linter messages from each linter which was run, in the order of
+             ``linter_cmdlines``
+
+    """
+    history = get_duration_history()
+    results: dict[int, dict[MessageLocation, LinterMessage]] = {}
+    for index in history.order_longest_first(linter_cmdlines):
+        if message_counter and message_counter.limit_reached:
+            break
+        cmdline = linter_cmdlines[index]
+        limits = get_linter_limits(linter_limits or {}, cmdline[0])
+        start = time.monotonic()
+        results[index] = run_linter(
+            cmdline, root, paths, env, message_counter, limits=limits
+        )
+        # A linter terminated early doesn't tell how long a full run takes
+        if not (message_counter and message_counter.limit_reached):
+            history.record_linter(cmdline, time.monotonic() - start)
+    return [results[index] for index in sorted(results)]
+
+
+def _get_messages_from_linters(  # noqa: PLR0913  # pylint: disable=too-many-arguments
     linter_cmdlines: Iterable[list[str]],
     root: Path,
     paths: Collection[Path],
     env: dict[str, str],
     line_processor: Callable[[LinterMessage], LinterMessage] = _identity_line_processor,
+    *,
+    linter_outputs: Iterable[LinterOutputSpec] = (),
+    message_counter: NewMessageCounter | None = None,
+    linter_limits: Mapping[str, LinterLimits] | None = None,
 ) -> dict[MessageLocation, list[LinterMessage]]:
     """Run given linters for the given directory and return linting errors
 
@@ -476,18 +1326,36 @@ def _get_messages_from_linters(
     :param paths: Paths of files to check, relative to ``root``
     :param env: The environment variables to pass to the linter
     :param line_processor: Pre-processing callback for linter output lines
+    :param linter_outputs: Saved linter outputs to read instead of running linters
+    :param message_counter: Counter for new messages. When its maximum is reached, the
+                            running linter is terminated and remaining linters skipped.
+    :param linter_limits: Time and resource limits by linter name
     :return: Linter messages
 
     """
-    result = defaultdict(list)
-    for cmdline in linter_cmdlines:
-        for message_location, message in run_linter(cmdline, root, paths, env).items():
+    result: dict[MessageLocation, list[LinterMessage]] = defaultdict(list)
+    for linter_result in _run_linters_longest_first(
+        list(linter_cmdlines),
+        root,
+        paths,
+        env,
+        message_counter=message_counter,
+        linter_limits=linter_limits,
+    ):
+        for message_location, message in linter_result.items():
+            result[message_location].append(line_processor(message))
+    for spec in linter_outputs:
+        if message_counter and message_counter.limit_reached:
+            return result
+        for message_location, message in read_linter_output(
+            spec.linter, spec.path, root, message_counter, paths=paths
+        ).items():
             result[message_location].append(line_processor(message))
     return result
 
 
 def _log_messages(
-    baseline: dict[MessageLocation, list[LinterMessage]],
+    baseline: Mapping[MessageLocation, list[LinterMessage]],
     new_messages: dict[MessageLocation, list[LinterMessage]],
 ) -> None:
     """Output recorded messages at baseline and at rev2 to debug log, no highlighting
@@ -509,11 +1377,37 @@ def _log_messages(
                 )
 
 
+def _is_new_message(
+    baseline: Mapping[MessageLocation, list[LinterMessage]],
+    diff_line_mapping: DiffLineMapping,
+    location: MessageLocation,
+    message: LinterMessage,
+) -> bool:
+    """Return ``True`` unless the message is the same as before on an unmodified line
+
+    :param baseline: Linter messages and their locations for a previous version
+    :param diff_line_mapping: Mapping between unmodified lines in old and new versions
+    :param location: The location of the message in the new version of the file
+    :param message: The linter message in the new version of the file
+    :return: ``False`` if the message should be hidden
+
+    """
+    old_location = diff_line_mapping.get(location)
+    if old_location == NO_MESSAGE_LOCATION:
+        return True
+    # Only hide messages when
+    # - they occurred previously on the corresponding line
+    # - the line hasn't been modified
+    return normalize_whitespace(message) not in baseline.get(old_location, [])
+
+
 def _print_new_linter_messages(
-    baseline: dict[MessageLocation, list[LinterMessage]],
+    baseline: Mapping[MessageLocation, list[LinterMessage]],
     new_messages: dict[MessageLocation, list[LinterMessage]],
     diff_line_mapping: DiffLineMapping,
     output_spec: Sequence[OutputSpec],
+    *,
+    tag: str = "",
 ) -> int:
     """Print all linter messages except those same as before on unmodified lines
 
@@ -521,67 +1415,245 @@ def _print_new_linter_messages(
     :param new_messages: New linter messages in a new version of the source file
     :param diff_line_mapping: Mapping between unmodified lines in old and new versions
     :param output_spec: The output formats and destinations for linter messages
+    :param tag: A tag to append to linter names in the output, e.g. a commit hash to
+                tell apart messages for different revisions
     :return: The number of linter errors displayed
 
+    """
+    with create_output_plugins(output_spec) as outputs:
+        return output_new_linter_messages(
+            outputs, baseline, new_messages, diff_line_mapping, tag=tag
+        )
+
+
+def output_new_linter_messages(
+    outputs: Sequence[OutputPlugin],
+    baseline: Mapping[MessageLocation, list[LinterMessage]],
+    new_messages: dict[MessageLocation, list[LinterMessage]],
+    diff_line_mapping: DiffLineMapping,
+    *,
+    tag: str = "",
+) -> int:
+    """Write linter messages except those same as before on unmodified lines
+
+    This can be called repeatedly for the same outputs to stream messages for batches
+    of files.
+
+    :param outputs: The output plugins to write linter messages to
+    :param baseline: Linter messages and their locations for a previous version
+    :param new_messages: New linter messages in a new version of the source file
+    :param diff_line_mapping: Mapping between unmodified lines in old and new versions
+    :param tag: A tag to append to linter names in the output
+    :return: The number of linter errors written
+
     """
     if logger.getEffectiveLevel() <= logging.DEBUG:
         _log_messages(baseline, new_messages)
     error_count = 0
     prev_location = NO_MESSAGE_LOCATION
-    with create_output_plugins(output_spec) as outputs:
-        for message_location, messages in sorted(new_messages.items()):
-            old_location = diff_line_mapping.get(message_location)
-            is_modified_line = old_location == NO_MESSAGE_LOCATION
-            old_messages: list[LinterMessage] = baseline.get(old_location, [])
-            for message in messages:
-                if (
-                    not is_modified_line
-                    and normalize_whitespace(message) in old_messages
-                ):
-                    # Only hide messages when
-                    # - they occurred previously on the corresponding line
-                    # - the line hasn't been modified
-                    continue
-                group_boundary = (
-                    message_location.path != prev_location.path
-                    or message_location.line > prev_location.line + 1
+    for message_location, messages in sorted(new_messages.items()):
+        for message in messages:
+            if not _is_new_message(
+                baseline, diff_line_mapping, message_location, message
+            ):
+                continue
+            group_boundary = (
+                message_location.path != prev_location.path
+                or message_location.line > prev_location.line + 1
+            )
+            prev_location = message_location
+            if tag:
+                message = LinterMessage(  # noqa: PLW2901
+                    f"{message.linter}@{tag}", message.description
                 )
-                prev_location = message_location
-                for output in outputs:
-                    if group_boundary:
-                        output.group_delimiter()
-                    output.output(message_location, message)
-                error_count += 1
+            for output in outputs:
+                if group_boundary:
+                    output.group_delimiter()
+                output.output(message_location, message)
+            error_count += 1
     return error_count
 
 
+def _get_messages_from_linters_for_rev2(  # noqa: PLR0913
+    linter_cmdlines: list[list[str]],
+    root: Path,
+    paths: Collection[Path],
+    revision: str,
+    *,
+    linter_outputs: Iterable[LinterOutputSpec] = (),
+    message_counter: NewMessageCounter | None = None,
+    linter_limits: Mapping[str, LinterLimits] | None = None,
+) -> dict[MessageLocation, list[LinterMessage]]:
+    """Run linters on the working tree, or on a temporary checkout of a commit
+
+    :param linter_cmdlines: The command lines for linter tools to run on the files
+    :param root: The root of the Git repository
+    :param paths: The files and directories to check, relative to ``root``
+    :param revision: The ``rev2`` revision, ``WORKTREE`` for the working tree, or
+                     ``INDEX`` for changes staged in the Git index
+    :param linter_outputs: Saved linter outputs to read instead of running linters
+    :param message_counter: Counter for new messages, to stop linting at a threshold
+    :param linter_limits: Time and resource limits by linter name
+    :return: Linter messages
+
+    """
+    # pylint: disable=too-many-arguments
+    if revision == INDEX:
+        return _get_messages_from_linters_for_scratch_tree(
+            linter_cmdlines,
+            root,
+            paths,
+            revision,
+            linter_outputs=linter_outputs,
+            message_counter=message_counter,
+            linter_limits=linter_limits,
+        )
+    if revision == WORKTREE:
+        return _get_messages_from_linters(
+            linter_cmdlines,
+            root,
+            paths,
+            make_linter_env(root, "WORKTREE"),
+            linter_outputs=linter_outputs,
+            message_counter=message_counter,
+            linter_limits=linter_limits,
+        )
+    return _get_messages_from_linters_for_revision(
+        linter_cmdlines,
+        root,
+        paths,
+        revision,
+        role=REV2,
+        linter_outputs=linter_outputs,
+        message_counter=message_counter,
+        linter_limits=linter_limits,
+    )
+
+
 def _get_messages_from_linters_for_baseline(
     linter_cmdlines: list[list[str]],
     root: Path,
     paths: Collection[Path],
     revision: str,
+    *,
+    linter_limits: Mapping[str, LinterLimits] | None = None,
+) -> dict[MessageLocation, list[LinterMessage]]:
+    """Clone the Git repository at the baseline revision and run linters against it
+
+    :param linter_cmdlines: The command lines for linter tools to run on the files
+    :param root: The root of the Git repository
+    :param paths: The files and directories to check, relative to ``root``
+    :param revision: The revision to check out
+    :param linter_limits: Time and resource limits by linter name
+    :return: Linter messages with whitespace normalized
+
+    """
+    return _get_messages_from_linters_for_revision(
+        linter_cmdlines,
+        root,
+        paths,
+        revision,
+        normalize_whitespace,
+        linter_limits=linter_limits,
+    )
+
+
+def _get_messages_from_linters_for_revision(  # noqa: PLR0913
+    linter_cmdlines: list[list[str]],
+    root: Path,
+    paths: Collection[Path],
+    revision: str,
+    line_processor: Callable[[LinterMessage], LinterMessage] = _identity_line_processor,
+    *,
+    role: str = BASELINE,
+    linter_outputs: Iterable[LinterOutputSpec] = (),
+    message_counter: NewMessageCounter | None = None,
+    linter_limits: Mapping[str, LinterLimits] | None = None,
 ) -> dict[MessageLocation, list[LinterMessage]]:
-    """Clone the Git repository at a given revision and run linters against it
+    """Check out the Git repository at a given revision and run linters against it
+
+    The revision is checked out in a stable worktree for the revision role, and linters
+    use stable cache directories for it, so caches are reused across Graylint runs. If
+    the stable worktree is in use, a temporary worktree with default linter cache
+    directories is used instead.
 
     :param linter_cmdlines: The command lines for linter tools to run on the files
     :param root: The root of the Git repository
     :param paths: The files and directories to check, relative to ``root``
     :param revision: The revision to check out
+    :param line_processor: Pre-processing callback for linter output lines
+    :param role: The revision role, ``baseline`` or ``rev2``
+    :param linter_outputs: Saved linter outputs to read instead of running linters
+    :param message_counter: Counter for new messages, to stop linting at a threshold
+    :param linter_limits: Time and resource limits by linter name
     :return: Linter messages
 
     """
-    with TemporaryDirectory() as tmpdir:
-        tmp_path = Path(tmpdir) / "baseline-revision" / root.name
-        with git_clone_local(root, revision, tmp_path) as clone_root:
-            rev1_commit = git_rev_parse(revision, root)
-            result = _get_messages_from_linters(
-                linter_cmdlines,
-                clone_root,
-                paths,
-                make_linter_env(root, rev1_commit),
-                normalize_whitespace,
-            )
-    return result
+    # pylint: disable=too-many-arguments
+    with stable_worktree(root, revision, role) as clone_root:
+        commit = git_rev_parse(revision, root)
+        return _get_messages_from_linters(
+            linter_cmdlines,
+            clone_root,
+            paths,
+            make_linter_env(
+                root, commit, role if is_stable_worktree(root, clone_root) else None
+            ),
+            line_processor,
+            linter_outputs=linter_outputs,
+            message_counter=message_counter,
+            linter_limits=linter_limits,
+        )
+
+
+def _get_messages_from_linters_for_scratch_tree(  # noqa: PLR0913
+    linter_cmdlines: list[list[str]],
+    root: Path,
+    paths: Collection[Path],
+    revision: str,
+    *,
+    line_processor: Callable[[LinterMessage], LinterMessage] = _identity_line_processor,
+    linter_outputs: Iterable[LinterOutputSpec] = (),
+    message_counter: NewMessageCounter | None = None,
+    linter_limits: Mapping[str, LinterLimits] | None = None,
+) -> dict[MessageLocation, list[LinterMessage]]:
+    """Write the given files into a scratch tree and run linters against it
+
+    Linter configuration files are written as well. If some linter checks code across
+    modules according to its profile, the whole tree is written so imports resolve.
+
+    :param linter_cmdlines: The command lines for linter tools to run on the files
+    :param root: The root of the Git repository
+    :param paths: The files and directories to check, relative to ``root``
+    :param revision: ``INDEX`` for files staged in the Git index, or a commit
+    :param line_processor: Pre-processing callback for linter output lines
+    :param linter_outputs: Saved linter outputs to read instead of running linters
+    :param message_counter: Counter for new messages, to stop linting at a threshold
+    :param linter_limits: Time and resource limits by linter name
+    :return: Linter messages
+
+    """
+    # pylint: disable=too-many-arguments
+    with git_checkout_index(
+        root,
+        paths,
+        revision,
+        config_files=get_config_files(linter_cmdlines),
+        whole_tree=not all(
+            get_linter_profile(cmdline).per_file for cmdline in linter_cmdlines
+        ),
+    ) as scratch_root:
+        commit = "INDEX" if revision == INDEX else git_rev_parse(revision, root)
+        return _get_messages_from_linters(
+            linter_cmdlines,
+            scratch_root,
+            paths,
+            make_linter_env(root, commit),
+            line_processor,
+            linter_outputs=linter_outputs,
+            message_counter=message_counter,
+            linter_limits=linter_limits,
+        )
 
 
 def _create_line_mapping(
@@ -599,10 +1671,31 @@ def _create_line_mapping(
     """
     diff_line_mapping = DiffLineMapping()
     for path in files_with_messages:
-        doc1 = git_get_content_at_revision(path, revrange.rev1, root)
-        doc2 = git_get_content_at_revision(path, revrange.rev2, root)
-        for linenum2, linenum1 in map_unmodified_lines(doc1, doc2).items():
-            location1 = MessageLocation(path, linenum1)
-            location2 = MessageLocation(path, linenum2)
-            diff_line_mapping[location2] = location1
+        _add_line_mapping(diff_line_mapping, root, path, revrange)
     return diff_line_mapping
+
+
+def _add_line_mapping(
+    diff_line_mapping: DiffLineMapping,
+    root: Path,
+    path: Path,
+    revrange: RevisionRange,
+) -> None:
+    """Add unmodified lines of one file to a line mapping between old and new versions
+
+    :param diff_line_mapping: The mapping to add lines of the file to
+    :param root: The root of the repository
+    :param path: Path to the file, relative to ``root``
+    :param revrange: The revisions to compare
+
+    """
+    doc1 = git_get_content_at_revision(path, revrange.rev1, root)
+    doc2 = (
+        git_get_content_in_index(path, root)
+        if revrange.rev2 == INDEX
+        else git_get_content_at_revision(path, revrange.rev2, root)
+    )
+    for linenum2, linenum1 in map_unmodified_lines(doc1, doc2).items():
+        location1 = MessageLocation(path, linenum1)
+        location2 = MessageLocation(path, linenum2)
+        diff_line_mapping[location2] = location1
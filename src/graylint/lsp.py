@@ -0,0 +1,364 @@
+"""Run language servers as linters using the Language Server Protocol over stdio.
+
+Many linters ship a language server, e.g. ``ruff server``, ``pylsp`` or
+``basedpyright-langserver --stdio``. With ``-L "lsp <server command line>"``, Graylint
+starts the server, opens the files to lint in it and collects the diagnostics it
+publishes, instead of running a linter command line.
+
+Each linted tree gets a server of its own, which is kept running until Graylint exits.
+When a tree is linted again during the same run, e.g. with ``--each-commit``, only files
+whose content changed are sent to the server again.
+
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import threading
+from subprocess import PIPE, Popen, TimeoutExpired  # nosec
+from typing import IO, TYPE_CHECKING, TypedDict, cast
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from pathlib import Path
+
+# JSON-RPC messages are handled as dictionaries decoded from JSON
+JsonObject = dict[str, object]
+
+logger = logging.getLogger(__name__)
+
+LSP = "lsp"
+DEFAULT_TIMEOUT = 60.0
+PUBLISH_DIAGNOSTICS = "textDocument/publishDiagnostics"
+
+_servers: dict[tuple[tuple[str, ...], Path], LanguageServer] = {}
+# Guards `_servers` and `_server_locks`. Servers are started holding only their own lock
+# in `_server_locks`, so servers for different trees start in parallel.
+_servers_lock = threading.Lock()
+_server_locks: dict[tuple[tuple[str, ...], Path], threading.Lock] = {}
+
+
+class LanguageServerError(RuntimeError):
+    """Raised when a language server fails or doesn't respond in time."""
+
+
+class Position(TypedDict):
+    """A zero-based line and character offset in a document."""
+
+    line: int
+    character: int
+
+
+class Range(TypedDict):
+    """The start and end positions of a diagnostic."""
+
+    start: Position
+    end: Position
+
+
+class _RequiredDiagnosticFields(TypedDict):
+    range: Range
+    message: str
+
+
+class Diagnostic(_RequiredDiagnosticFields, total=False):
+    """A diagnostic published by a language server for a document."""
+
+    code: int | str
+    source: str
+
+
+def _read_message(stream: IO[bytes]) -> JsonObject | None:
+    """Read one JSON-RPC message with a ``Content-Length`` header from a stream.
+
+    :param stream: The standard output of the language server
+    :return: The decoded message, or ``None`` at the end of the stream
+
+    """
+    content_length = None
+    while True:
+        line = stream.readline()
+        if not line:
+            return None
+        if line in (b"\r\n", b"\n"):
+            break
+        name, _, value = line.decode("ascii").partition(":")
+        if name.strip().lower() == "content-length":
+            content_length = int(value)
+    if content_length is None:
+        message = "Language server message without a Content-Length header"
+        raise LanguageServerError(message)
+    return cast("JsonObject", json.loads(stream.read(content_length)))
+
+
+class LanguageServer:  # pylint: disable=too-many-instance-attributes
+    """A language server subprocess, and the documents opened in it."""
+
+    def __init__(
+        self,
+        cmdline: list[str],
+        root: Path,
+        timeout: float = DEFAULT_TIMEOUT,
+        env: dict[str, str] | None = None,
+    ) -> None:
+        """Start the language server and initialize it for a tree.
+
+        :param cmdline: The command line for starting the server
+        :param root: The root of the tree to lint
+        :param timeout: Seconds to wait for the server to respond to initialization
+        :param env: Environment variables for the server, or ``None`` to inherit them
+        :raises LanguageServerError: if the server fails to initialize
+
+        """
+        self.cmdline = cmdline
+        self.root = root
+        self._condition = threading.Condition()
+        self._write_lock = threading.Lock()
+        self._diagnose_lock = threading.Lock()
+        self._next_id = 0
+        self._responses: dict[object, JsonObject] = {}
+        self._diagnostics: dict[str, list[Diagnostic]] = {}
+        self._pending: dict[str, int] = {}
+        self._documents: dict[str, tuple[int, str]] = {}
+        self._exited = False
+        logger.debug("[%s]$ %s", root, " ".join(cmdline))
+        # The server is kept running after initialization, until `shutdown` is called
+        # pylint: disable-next=consider-using-with
+        self._process = Popen(  # noqa: S603  # nosec
+            cmdline, stdin=PIPE, stdout=PIPE, cwd=root, env=env
+        )
+        self._reader = threading.Thread(target=self._read_messages, daemon=True)
+        self._reader.start()
+        self._request(
+            "initialize",
+            {
+                "processId": None,
+                "rootUri": root.resolve().as_uri(),
+                "workspaceFolders": [
+                    {"uri": root.resolve().as_uri(), "name": root.name}
+                ],
+                "capabilities": {
+                    "textDocument": {"publishDiagnostics": {"versionSupport": True}}
+                },
+            },
+            timeout,
+        )
+        self._notify("initialized", {})
+
+    def _send(self, payload: JsonObject) -> None:
+        """Send a JSON-RPC message to the server.
+
+        :param payload: The message without the ``jsonrpc`` version field
+
+        """
+        body = json.dumps({"jsonrpc": "2.0", **payload}).encode("utf-8")
+        stdin = self._process.stdin
+        if stdin is None:
+            message = "Stdin piping failed"
+            raise RuntimeError(message)
+        with self._write_lock:
+            stdin.write(f"Content-Length: {len(body)}\r\n\r\n".encode("ascii") + body)
+            stdin.flush()
+
+    def _notify(self, method: str, params: JsonObject) -> None:
+        """Send a notification to the server.
+
+        :param method: The name of the notification
+        :param params: The parameters of the notification
+
+        """
+        self._send({"method": method, "params": params})
+
+    def _request(
+        self, method: str, params: JsonObject | None, timeout: float
+    ) -> object:
+        """Send a request to the server and wait for the response.
+
+        :param method: The name of the request
+        :param params: The parameters of the request
+        :param timeout: Seconds to wait for the response
+        :raises LanguageServerError: if the server returns an error, exits or doesn't
+                                     respond in time
+        :return: The result in the response
+
+        """
+        with self._condition:
+            request_id = self._next_id
+            self._next_id += 1
+        self._send({"id": request_id, "method": method, "params": params})
+        with self._condition:
+            self._condition.wait_for(
+                lambda: request_id in self._responses or self._exited, timeout
+            )
+            response = self._responses.pop(request_id, None)
+        if response is None:
+            message = f"No response to {method} from {self.cmdline[0]}"
+            raise LanguageServerError(message)
+        if "error" in response:
+            error = cast("JsonObject", response["error"]).get("message")
+            message = f"{self.cmdline[0]} failed to handle {method}: {error}"
+            raise LanguageServerError(message)
+        return response.get("result")
+
+    def _handle_message(self, message: JsonObject) -> None:
+        """Handle a response, a request or a notification from the server.
+
+        :param message: The JSON-RPC message from the server
+
+        """
+        method = message.get("method")
+        if method and "id" in message:
+            # Requests from the server, e.g. for configuration, get empty responses
+            params = cast("JsonObject", message.get("params") or {})
+            items = cast("list[object]", params.get("items") or [])
+            result = (
+                [None] * len(items) if method == "workspace/configuration" else None
+            )
+            self._send({"id": message["id"], "result": result})
+        elif "id" in message:
+            with self._condition:
+                self._responses[message["id"]] = message
+                self._condition.notify_all()
+        elif method == PUBLISH_DIAGNOSTICS:
+            params = cast("JsonObject", message["params"])
+            uri = cast("str", params["uri"])
+            version = cast("int | None", params.get("version"))
+            with self._condition:
+                self._diagnostics[uri] = cast("list[Diagnostic]", params["diagnostics"])
+                if version is None or version >= self._pending.get(uri, 0):
+                    self._pending.pop(uri, None)
+                self._condition.notify_all()
+
+    def _read_messages(self) -> None:
+        """Read and handle messages from the server until it exits."""
+        stdout = self._process.stdout
+        try:
+            while stdout and (message := _read_message(stdout)) is not None:
+                self._handle_message(message)
+        except (LanguageServerError, ValueError, OSError):
+            logger.exception("Error reading messages from %s", self.cmdline[0])
+        with self._condition:
+            self._exited = True
+            self._condition.notify_all()
+
+    def _sync_document(self, path: Path) -> str:
+        """Open a file in the server, or send its new content if it has changed.
+
+        :param path: The path of the file relative to the root of the tree
+        :return: The URI of the document
+
+        """
+        absolute_path = (self.root / path).resolve()
+        uri = absolute_path.as_uri()
+        text = absolute_path.read_text(encoding="utf-8", errors="surrogateescape")
+        version, old_text = self._documents.get(uri, (0, None))
+        if text == old_text:
+            return uri
+        version += 1
+        with self._condition:
+            self._documents[uri] = (version, text)
+            self._pending[uri] = version
+        if old_text is None:
+            document = {"uri": uri, "languageId": "python", "version": version}
+            self._notify(
+                "textDocument/didOpen", {"textDocument": {**document, "text": text}}
+            )
+        else:
+            self._notify(
+                "textDocument/didChange",
+                {
+                    "textDocument": {"uri": uri, "version": version},
+                    "contentChanges": [{"text": text}],
+                },
+            )
+        return uri
+
+    def diagnose(
+        self, paths: Iterable[Path], timeout: float = DEFAULT_TIMEOUT
+    ) -> dict[Path, list[Diagnostic]]:
+        """Get diagnostics for files from the server.
+
+        :param paths: Paths of files to check, relative to the root of the tree
+        :param timeout: Seconds to wait for diagnostics of all files
+        :raises LanguageServerError: if the server exits or doesn't publish diagnostics
+                                     for all files in time
+        :return: Diagnostics by file path
+
+        """
+        with self._diagnose_lock:
+            uris = {path: self._sync_document(path) for path in paths}
+        with self._condition:
+            self._condition.wait_for(
+                lambda: self._exited or not self._pending.keys() & uris.values(),
+                timeout,
+            )
+            missing = self._pending.keys() & uris.values()
+            if missing:
+                message = (
+                    f"{self.cmdline[0]} didn't publish diagnostics for"
+                    f" {len(missing)} files within {timeout} seconds"
+                )
+                raise LanguageServerError(message)
+            return {path: self._diagnostics.get(uri, []) for path, uri in uris.items()}
+
+    def shutdown(self, timeout: float = DEFAULT_TIMEOUT) -> None:
+        """Ask the server to shut down and exit, and wait for it.
+
+        :param timeout: Seconds to wait before killing the server
+
+        """
+        try:
+            if not self._exited:
+                self._request("shutdown", None, timeout)
+                self._notify("exit", {})
+            self._process.wait(timeout)
+        except (LanguageServerError, OSError, TimeoutExpired):
+            logger.warning("Killing language server %s", self.cmdline[0])
+            self._process.kill()
+            self._process.wait()
+        self._reader.join()
+        for stream in self._process.stdin, self._process.stdout:
+            if stream:
+                stream.close()
+
+
+def get_language_server(
+    cmdline: list[str],
+    root: Path,
+    timeout: float = DEFAULT_TIMEOUT,
+    env: dict[str, str] | None = None,
+) -> LanguageServer:
+    """Return the running language server for a tree, starting it if needed.
+
+    :param cmdline: The command line for starting the server
+    :param root: The root of the tree to lint
+    :param timeout: Seconds to wait for the server to initialize
+    :param env: Environment variables for a new server, or ``None`` to inherit them
+    :return: The language server
+
+    """
+    key = (tuple(cmdline), root)
+    with _servers_lock:
+        server = _servers.get(key)
+        if server:
+            return server
+        server_lock = _server_locks.setdefault(key, threading.Lock())
+    with server_lock:
+        with _servers_lock:
+            server = _servers.get(key)
+        if not server:
+            server = LanguageServer(cmdline, root, timeout, env)
+            with _servers_lock:
+                _servers[key] = server
+        return server
+
+
+def shutdown_language_servers() -> None:
+    """Shut down all language servers started during this Graylint run."""
+    with _servers_lock:
+        servers = list(_servers.values())
+        _servers.clear()
+        _server_locks.clear()
+    for server in servers:
+        server.shutdown()
@@ -0,0 +1,117 @@
+"""Compare the working tree against multiple baseline revisions in one run.
+
+This is used e.g. for gating pull requests against both the main branch and a release
+branch. The working tree (or ``rev2``) is linted only once, while each baseline revision
+is checked out and linted separately. Messages which are new compared to each baseline
+are shown tagged with the baseline revision.
+
+"""
+
+from __future__ import annotations
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from functools import partial
+from typing import TYPE_CHECKING
+
+from darkgraylib.git import git_get_root
+from graylint.cpu_budget import get_cpu_budget
+from graylint.linting import (
+    _create_line_mapping,
+    _get_messages_from_linters_for_baseline,
+    _get_messages_from_linters_for_rev2,
+    _print_new_linter_messages,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping, Sequence
+    from pathlib import Path
+
+    from darkgraylib.git import RevisionRange
+    from graylint.command_line import OutputSpec
+    from graylint.limits import LinterLimits
+
+logger = logging.getLogger(__name__)
+
+
+def run_linters_for_baselines(  # noqa: PLR0913
+    linter_cmdlines: list[list[str]],
+    root: Path,
+    paths: set[Path],
+    revranges: Mapping[str, RevisionRange],
+    output_spec: Sequence[OutputSpec],
+    *,
+    linter_limits: Mapping[str, LinterLimits] | None = None,
+) -> int:
+    """Run linters once on ``rev2`` and show new messages compared to each baseline.
+
+    Baseline revisions are linted in parallel, up to one per CPU core, while ``rev2`` is
+    being linted.
+
+    :param linter_cmdlines: The command lines for linter tools to run on the files
+    :param root: The root of the relative paths
+    :param paths: The files and directories to check, relative to ``root``
+    :param revranges: The revision ranges to compare, keyed by the revision given on the
+                      command line, which is used to tag messages. All ranges must have
+                      the same ``rev2``.
+    :param output_spec: The output formats and destinations for linter messages
+    :param linter_limits: Time and resource limits by linter name
+    :raises ValueError: if ``root`` is not in a Git repository, or the revision ranges
+                        have different ``rev2`` revisions
+    :return: Total number of new linter messages compared to all baselines
+
+    """
+    # pylint: disable=too-many-arguments,too-many-locals
+    git_root = git_get_root(root)
+    if not git_root:
+        message = f"Multiple baselines require a Git repository, {root} isn't one"
+        raise ValueError(message)
+    rev2s = {revrange.rev2 for revrange in revranges.values()}
+    if len(rev2s) != 1:
+        message = f"All baselines must be compared to the same revision, got {rev2s}"
+        raise ValueError(message)
+    git_paths = {(root / path).relative_to(git_root) for path in paths}
+    lint_baseline = partial(
+        _get_messages_from_linters_for_baseline,
+        linter_cmdlines,
+        git_root,
+        git_paths,
+        linter_limits=linter_limits,
+    )
+    # Each baseline is linted in the background in its own lane of the CPU budget
+    budget = get_cpu_budget()
+    max_workers = min(len(revranges), budget.cpus)
+    with ExitStack() as stack:
+        executor = stack.enter_context(ThreadPoolExecutor(max_workers=max_workers))
+        rev2_lane = stack.enter_context(budget.lane())
+        baseline_futures = {
+            name: executor.submit(
+                stack.enter_context(budget.lane(background=True)).run,
+                partial(lint_baseline, revrange.rev1),
+            )
+            for name, revrange in revranges.items()
+        }
+        messages = rev2_lane.run(
+            partial(
+                _get_messages_from_linters_for_rev2,
+                linter_cmdlines,
+                git_root,
+                git_paths,
+                rev2s.pop(),
+                linter_limits=linter_limits,
+            )
+        )
+        files_with_messages = {location.path for location in messages}
+        error_count = 0
+        for name, revrange in revranges.items():
+            baseline = baseline_futures[name].result()
+            logger.info("Comparing to baseline %s", name)
+            error_count += _print_new_linter_messages(
+                baseline,
+                messages,
+                _create_line_mapping(git_root, files_with_messages, revrange),
+                output_spec,
+                tag=name,
+            )
+    return error_count
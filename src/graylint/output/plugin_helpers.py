@@ -3,9 +3,10 @@
 from __future__ import annotations
 
 from contextlib import ExitStack, contextmanager
+from functools import cache
 from typing import TYPE_CHECKING, cast
 
-from darkgraylib.plugins import create_plugin
+from darkgraylib.plugins import get_entry_point_names, get_plugin_class
 
 if TYPE_CHECKING:
     from collections.abc import Generator, Sequence
@@ -17,12 +18,36 @@ if TYPE_CHECKING:
 OUTPUT_FORMAT_GROUP = "graylint.output_format"
 
 
+@cache
+def get_output_format_names() -> tuple[str, ...]:
+    """Get the names of all output format plugins, the default format first.
+
+    Scanning entry points through ``importlib.metadata`` is slow in large virtualenvs,
+    and the names are needed each time the argument parser is created and each time an
+    output format specification is parsed. The result is memoized for the lifetime of
+    the process.
+
+    :return: Names of installed output format plugins
+
+    """
+    return tuple(get_entry_point_names(OUTPUT_FORMAT_GROUP))
+
+
+@cache
+def get_output_plugin_class(name: str) -> type[OutputPlugin]:
+    """Load the output plugin class for the given format name, memoized per process.
+
+    :param name: The name of the output format entry point
+    :return: The output plugin class
+
+    """
+    return cast("type[OutputPlugin]", get_plugin_class(OUTPUT_FORMAT_GROUP, name))
+
+
 def create_output_plugin(spec: OutputSpec) -> OutputPlugin:
     """Create an output plugin based on the specification."""
-    plugin = create_plugin(
-        OUTPUT_FORMAT_GROUP, spec.format, spec.path, use_color=spec.use_color
-    )
-    return cast("OutputPlugin", plugin)
+    plugin_class = get_output_plugin_class(spec.format)
+    return plugin_class(spec.path, use_color=spec.use_color)
 
 
 @contextmanager
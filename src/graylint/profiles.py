@@ -0,0 +1,202 @@
+"""Profiles describing the capabilities of known linters.
+
+Graylint runs any command as a linter and parses its text output. For well-known
+linters, a profile records what Graylint can do to run the linter faster or more
+reliably:
+
+- ``per_file``: messages for a file only depend on the file itself and the linter
+  configuration, so unchanged files don't need to be linted, and files can be linted in
+  separate shards
+- ``subcommand`` and ``output_options``: arguments which make the linter print one
+  ``path:line:column: description`` line per message
+- ``jobs_option``: the option for choosing the number of parallel processes
+- ``jobs_env_var``: the environment variable for choosing the number of threads
+- ``cache_env_var``: the environment variable for choosing the cache directory
+- ``config_files``: names of configuration files; if any of them changes, all files
+  need to be linted
+
+Profiles for other linters, or changes to the built-in ones, can be configured in the
+``[tool.graylint.linter-profiles]`` table of ``pyproject.toml``, e.g.::
+
+    [tool.graylint.linter-profiles.pyflakes]
+    per-file = true
+
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import TYPE_CHECKING, TypedDict, cast
+
+from darkgraylib.config import ConfigurationError
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Mapping
+
+
+@dataclass(frozen=True)
+class LinterProfile:
+    """Capabilities of a linter, used to choose how Graylint runs it."""
+
+    per_file: bool = False
+    subcommand: str | None = None
+    output_options: tuple[str, ...] = ()
+    jobs_option: str | None = None
+    jobs_env_var: str | None = None
+    cache_env_var: str | None = None
+    config_files: tuple[str, ...] = ()
+
+
+class _ProfileFields(TypedDict, total=False):
+    """Fields of a linter profile given in the configuration file."""
+
+    per_file: bool
+    subcommand: str
+    output_options: tuple[str, ...]
+    jobs_option: str
+    jobs_env_var: str
+    cache_env_var: str
+    config_files: tuple[str, ...]
+
+
+# Linters which check code across modules, like Mypy and Pylint, get the default
+# ``per_file=False``
+BUILTIN_PROFILES = {
+    "flake8": LinterProfile(
+        per_file=True,
+        jobs_option="--jobs",
+        config_files=(".flake8", "setup.cfg", "tox.ini"),
+    ),
+    "mypy": LinterProfile(
+        cache_env_var="MYPY_CACHE_DIR",
+        config_files=("mypy.ini", ".mypy.ini", "pyproject.toml", "setup.cfg"),
+    ),
+    "pycodestyle": LinterProfile(
+        per_file=True, config_files=("setup.cfg", "tox.ini", ".pycodestyle")
+    ),
+    "pydocstyle": LinterProfile(
+        per_file=True,
+        config_files=(
+            ".pydocstyle",
+            ".pydocstylerc",
+            "pyproject.toml",
+            "setup.cfg",
+            "tox.ini",
+        ),
+    ),
+    "pylint": LinterProfile(
+        jobs_option="--jobs",
+        cache_env_var="PYLINTHOME",
+        config_files=(
+            "pylintrc",
+            ".pylintrc",
+            "pyproject.toml",
+            "setup.cfg",
+            "tox.ini",
+        ),
+    ),
+    "ruff": LinterProfile(
+        per_file=True,
+        subcommand="check",
+        output_options=("--output-format=concise",),
+        jobs_env_var="RAYON_NUM_THREADS",
+        cache_env_var="RUFF_CACHE_DIR",
+        config_files=("pyproject.toml", "ruff.toml", ".ruff.toml"),
+    ),
+}
+
+# Types of profile fields, for validating profiles in the configuration file
+_BOOL_FIELDS = {"per_file"}
+_STR_FIELDS = {"subcommand", "jobs_option", "jobs_env_var", "cache_env_var"}
+_LIST_FIELDS = {"output_options", "config_files"}
+
+_profiles = dict(BUILTIN_PROFILES)
+
+
+def _make_profile(
+    name: str, base: LinterProfile, options: Mapping[str, object]
+) -> LinterProfile:
+    """Override fields of a linter profile with options from the configuration file.
+
+    :param name: The name of the linter
+    :param base: The built-in profile of the linter, or an empty profile
+    :param options: Profile fields from ``pyproject.toml``, with hyphens or underscores
+    :raises ConfigurationError: for unknown fields and values of the wrong type
+    :return: The linter profile
+
+    """
+    changes: dict[str, object] = {}
+    for key, value in options.items():
+        field_name = key.replace("-", "_")
+        if (field_name in _BOOL_FIELDS and isinstance(value, bool)) or (
+            field_name in _STR_FIELDS and isinstance(value, str)
+        ):
+            changes[field_name] = value
+        elif field_name in _LIST_FIELDS and isinstance(value, list):
+            changes[field_name] = tuple(
+                str(item) for item in cast("list[object]", value)
+            )
+        else:
+            message = f"Invalid linter profile option {key} = {value!r} for {name}"
+            raise ConfigurationError(message)
+    return replace(base, **cast("_ProfileFields", changes))
+
+
+def load_linter_profiles(config: Mapping[str, Mapping[str, object]]) -> None:
+    """Add or modify linter profiles using the ``linter-profiles`` configuration.
+
+    >>> load_linter_profiles({"pyflakes": {"per-file": True}})
+    >>> get_linter_profile(["pyflakes", "src"]).per_file
+    True
+    >>> load_linter_profiles({})
+    >>> get_linter_profile(["pyflakes", "src"]).per_file
+    False
+
+    :param config: Profile fields by linter name from ``[tool.graylint]``
+    :raises ConfigurationError: for invalid profile options
+
+    """
+    _profiles.clear()
+    _profiles.update(BUILTIN_PROFILES)
+    for name, options in config.items():
+        _profiles[name] = _make_profile(
+            name, BUILTIN_PROFILES.get(name, LinterProfile()), options
+        )
+
+
+def get_linter_profile(cmdline: list[str]) -> LinterProfile:
+    """Find the profile of a linter by the name of its executable.
+
+    :param cmdline: The command line for running the linter
+    :return: The profile of the linter, or a default profile for unknown linters
+
+    """
+    return _profiles.get(Path(cmdline[0]).name, LinterProfile())
+
+
+def get_cache_env_vars() -> dict[str, str]:
+    """Return the cache directory environment variables of all profiled linters.
+
+    :return: The name of each linter by its cache environment variable
+
+    """
+    return {
+        profile.cache_env_var: name
+        for name, profile in sorted(_profiles.items())
+        if profile.cache_env_var
+    }
+
+
+def get_config_files(linter_cmdlines: Iterable[list[str]]) -> set[str]:
+    """Return the names of configuration files of the given linters.
+
+    :param linter_cmdlines: The command lines for running linters
+    :return: File names of linter configuration files
+
+    """
+    return {
+        name
+        for cmdline in linter_cmdlines
+        for name in get_linter_profile(cmdline).config_files
+    }
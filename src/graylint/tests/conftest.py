@@ -0,0 +1,37 @@
+"""Configuration and fixtures for Graylint unit tests."""
+
+from __future__ import annotations
+
+import os
+from typing import TYPE_CHECKING
+from unittest.mock import patch
+
+import pytest
+
+from graylint.cpu_budget import set_cpu_budget
+from graylint.profiles import load_linter_profiles
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+
+@pytest.fixture(autouse=True)
+def _isolated_cache_dir(tmp_path_factory: pytest.TempPathFactory) -> Iterator[None]:
+    """Keep stable worktrees and linter caches out of the user's cache directory."""
+    cache_dir = str(tmp_path_factory.mktemp("cache"))
+    with patch.dict(os.environ, {"GRAYLINT_CACHE_DIR": cache_dir}):
+        yield
+
+
+@pytest.fixture(autouse=True)
+def _builtin_linter_profiles() -> Iterator[None]:
+    """Restore the built-in linter profiles after tests which configure profiles."""
+    yield
+    load_linter_profiles({})
+
+
+@pytest.fixture(autouse=True)
+def _default_cpu_budget() -> Iterator[None]:
+    """Restore the default CPU budget after tests which run Graylint with ``-W``."""
+    yield
+    set_cpu_budget(0)
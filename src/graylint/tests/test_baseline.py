@@ -0,0 +1,214 @@
+"""Unit tests for `graylint.baseline`."""
+
+# pylint: disable=protected-access,use-dict-literal
+
+from __future__ import annotations
+
+import json
+import re
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from darkgraylib.git import RevisionRange
+from darkgraylib.testtools.helpers import raises_if_exception
+from graylint import baseline as baseline_module
+from graylint import linting
+from graylint.baseline import (
+    BaselineMetadata,
+    BaselineMismatchError,
+    get_linter_version,
+    load_baseline,
+    make_baseline_getter,
+    save_baseline,
+)
+from graylint.command_line import OutputSpec
+from graylint.linting import LinterMessage, MessageLocation
+
+BASELINE = {
+    MessageLocation(Path("a.py"), 1): [LinterMessage("mypy", "first")],
+    MessageLocation(Path("sub/b.py"), 2, 5): [
+        LinterMessage("mypy", "second"),
+        LinterMessage("pylint", "third"),
+    ],
+}
+METADATA = BaselineMetadata("0123abc", [["mypy"], ["pylint"]], ["mypy 1.0", "pylint 3"])
+
+
+def test_save_and_load_baseline(tmp_path):
+    """A saved baseline is loaded back identically."""
+    save_baseline(tmp_path / "baseline", METADATA, BASELINE)
+
+    result = load_baseline(tmp_path / "baseline", METADATA)
+
+    assert result == BASELINE
+
+
+@pytest.mark.kwparametrize(
+    dict(expect_metadata=METADATA, expect=None),
+    dict(
+        expect_metadata=BaselineMetadata(
+            "4567def", [["mypy"], ["pylint"]], ["mypy 1.0", "pylint 3"]
+        ),
+        expect=BaselineMismatchError("commit: '0123abc' != '4567def'"),
+    ),
+    dict(
+        expect_metadata=BaselineMetadata("0123abc", [["mypy"]], ["mypy 1.0"]),
+        expect=BaselineMismatchError(
+            "linter_cmdlines: [['mypy'], ['pylint']] != [['mypy']], linter_versions: "
+        ),
+    ),
+    dict(
+        expect_metadata=BaselineMetadata(
+            "0123abc", [["mypy"], ["pylint"]], ["mypy 1.1", "pylint 3"]
+        ),
+        expect=BaselineMismatchError("linter_versions: "),
+    ),
+    dict(
+        expect_metadata=BaselineMetadata(
+            "0123abc", [["mypy"], ["pylint"]], ["mypy 1.0", "pylint 3"], ["src"]
+        ),
+        expect=BaselineMismatchError("paths: [] != ['src']"),
+    ),
+)
+def test_load_baseline_mismatch(tmp_path, expect_metadata, expect):
+    """A baseline is refused if its commit, linters, versions or paths don't match."""
+    save_baseline(tmp_path / "baseline", METADATA, BASELINE)
+
+    with raises_if_exception(expect):
+        load_baseline(tmp_path / "baseline", expect_metadata)
+
+
+@pytest.mark.kwparametrize(
+    dict(location=("a.py", 1, 0), expect=[LinterMessage("mypy", "first")]),
+    dict(location=("a.py", 1, 5), expect=None),
+    dict(location=("a.py", 2, 0), expect=None),
+    dict(
+        location=("sub/b.py", 2, 5),
+        expect=[LinterMessage("mypy", "second"), LinterMessage("pylint", "third")],
+    ),
+    dict(location=("sub/c.py", 2, 5), expect=None),
+    dict(location=("0.py", 1, 0), expect=None),
+)
+def test_mapped_baseline_get(tmp_path, location, expect):
+    """Messages are looked up from a memory-mapped baseline by exact location."""
+    save_baseline(tmp_path / "baseline", METADATA, BASELINE)
+    baseline = load_baseline(tmp_path / "baseline", METADATA)
+
+    result = baseline.get(MessageLocation(Path(location[0]), *location[1:]))
+
+    assert result == expect
+
+
+def test_mapped_baseline_large(tmp_path):
+    """Binary search finds every location in a large baseline with shared strings."""
+    messages = {
+        MessageLocation(Path(f"pkg{path_num}/mod.py"), line, line % 3): [
+            LinterMessage("mypy", f"message {line % 7}"),
+            LinterMessage("pylint", "tämä on viesti"),
+        ]
+        for path_num in range(20)
+        for line in range(1, 200, 3)
+    }
+    save_baseline(tmp_path / "baseline", METADATA, messages)
+
+    result = load_baseline(tmp_path / "baseline", METADATA)
+
+    assert len(result) == len(messages)
+    assert list(result) == sorted(messages, key=lambda loc: loc.path.as_posix())
+    assert all(result[location] == expect for location, expect in messages.items())
+    assert MessageLocation(Path("pkg1/mod.py"), 2, 2) not in result
+
+
+def test_load_baseline_invalid_file(tmp_path):
+    """A file which isn't a Graylint baseline is refused."""
+    (tmp_path / "baseline").write_text(json.dumps({"something": "else"}))
+
+    with pytest.raises(BaselineMismatchError, match="is not a Graylint baseline"):
+        load_baseline(tmp_path / "baseline", METADATA)
+
+
+@pytest.mark.parametrize("size", [4, 12, 40, -1])
+def test_load_baseline_truncated_file(tmp_path, caplog, size):
+    """A truncated baseline file is refused, and is a miss when read from the cache."""
+    path = tmp_path / "baseline"
+    save_baseline(path, METADATA, BASELINE)
+    path.write_bytes(path.read_bytes()[:size])
+
+    with pytest.raises(BaselineMismatchError, match="truncated or corrupt"):
+        load_baseline(path, METADATA)
+    assert baseline_module._load_cached_baseline(METADATA, path) is None
+    assert "Ignoring cached baseline" in caplog.text
+
+
+@pytest.mark.kwparametrize(
+    dict(cmdline=["python", "-c", "pass"], expect=r"^Python 3\."),
+    dict(cmdline=["ruff"], expect=r"^ruff "),
+    dict(cmdline=["non-existent-linter-executable"], expect=r"^$"),
+)
+def test_get_linter_version(cmdline, expect):
+    """The first line of ``<linter> --version`` is used as the linter version."""
+    result = get_linter_version(cmdline)
+
+    assert re.match(expect, result)
+
+
+def test_run_linters_save_and_load_baseline(git_repo, tmp_path, capsys):
+    """A baseline saved by ``run_linters()`` is reused without linting ``rev1``."""
+    git_repo.add({"a.py": "1\n2\n"}, commit="Initial commit")
+    git_repo.root.joinpath("a.py").write_text("1\nchanged\n")
+    cmdlines = [["python", "-c", "print('a.py:1: unchanged\\na.py:2: changed')"]]
+    revrange = RevisionRange("HEAD", ":WORKTREE:")
+    baseline_path = tmp_path / "baseline.json"
+    linting.run_linters(
+        cmdlines,
+        git_repo.root,
+        {Path("a.py")},
+        revrange,
+        [OutputSpec("gnu")],
+        get_baseline=make_baseline_getter(str(baseline_path), None),
+    )
+    saved_output = capsys.readouterr().out
+
+    with patch.object(
+        baseline_module, "_get_messages_from_linters_for_baseline"
+    ) as lint_baseline:
+        result = linting.run_linters(
+            cmdlines,
+            git_repo.root,
+            {Path("a.py")},
+            revrange,
+            [OutputSpec("gnu")],
+            get_baseline=make_baseline_getter(None, str(baseline_path)),
+        )
+
+    lint_baseline.assert_not_called()
+    assert result == 1
+    assert capsys.readouterr().out == saved_output == "\na.py:2: changed [python]\n"
+
+
+def test_run_linters_load_baseline_other_paths(git_repo, tmp_path):
+    """A baseline saved for other paths is refused instead of showing old messages."""
+    git_repo.add({"a.py": "1\n", "b.py": "1\n"}, commit="Initial commit")
+    cmdlines = [["python", "-c", "print('b.py:1: old')"]]
+    revrange = RevisionRange("HEAD", ":WORKTREE:")
+    baseline_path = tmp_path / "baseline"
+    linting.run_linters(
+        cmdlines,
+        git_repo.root,
+        {Path("a.py")},
+        revrange,
+        [OutputSpec("gnu")],
+        get_baseline=make_baseline_getter(str(baseline_path), None),
+    )
+
+    with pytest.raises(BaselineMismatchError, match=r"paths: \['a.py'\] != \['.'\]"):
+        linting.run_linters(
+            cmdlines,
+            git_repo.root,
+            {Path()},
+            revrange,
+            [OutputSpec("gnu")],
+            get_baseline=make_baseline_getter(None, str(baseline_path)),
+        )
@@ -0,0 +1,124 @@
+"""Unit tests for `graylint.cache`."""
+
+# pylint: disable=use-dict-literal
+
+from __future__ import annotations
+
+from argparse import ArgumentError
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from darkgraylib.testtools.helpers import raises_if_exception
+from graylint import baseline as baseline_module
+from graylint.__main__ import main
+from graylint.baseline import get_baseline
+from graylint.cache import make_cache_storage
+from graylint.cache_storage.http import HttpCacheStorage
+from graylint.cache_storage.local import LocalCacheStorage
+from graylint.linting import LinterMessage, MessageLocation
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    """Use a temporary cache directory."""
+    path = tmp_path / "cache"
+    monkeypatch.setenv("GRAYLINT_CACHE_DIR", str(path))
+    return path
+
+
+@pytest.mark.kwparametrize(
+    dict(backend="local", location=None, expect=LocalCacheStorage),
+    dict(backend="local", location="{tmp_path}/other", expect=LocalCacheStorage),
+    dict(backend="http", location="http://localhost:1", expect=HttpCacheStorage),
+    dict(backend="http", location=None, expect=ArgumentError),
+    dict(backend="nonexistent", location=None, expect=ArgumentError),
+)
+def test_make_cache_storage(cache_dir, tmp_path, backend, location, expect):
+    """Cache storage backends are created by entry point name."""
+    if location:
+        location = location.format(tmp_path=tmp_path)
+
+    with raises_if_exception(expect):
+        result = make_cache_storage(backend, location)
+
+        assert isinstance(result, expect)
+        assert result.location == location or str(cache_dir)
+
+
+def test_get_baseline_from_cache(git_repo, tmp_path):
+    """With a cache, the baseline is linted only once for the same commit."""
+    git_repo.add({"a.py": "1\n"}, commit="Initial commit")
+    cmdlines = [["python", "-c", "print('a.py:1: message')"]]
+    baseline_cache = LocalCacheStorage(str(tmp_path))
+    first = get_baseline(
+        cmdlines, git_repo.root, {Path("a.py")}, "HEAD", cache=baseline_cache
+    )
+
+    with patch.object(
+        baseline_module, "_get_messages_from_linters_for_baseline"
+    ) as lint_baseline:
+        second = get_baseline(
+            cmdlines, git_repo.root, {Path("a.py")}, "HEAD", cache=baseline_cache
+        )
+
+    lint_baseline.assert_not_called()
+    expect = {MessageLocation(Path("a.py"), 1): [LinterMessage("python", "message")]}
+    assert dict(first) == dict(second) == expect
+
+
+def test_main_warm_stats_gc(git_repo, cache_dir, monkeypatch, capsys):
+    """``graylint cache warm``, ``stats`` and ``gc`` manage the cache directory."""
+    git_repo.add({"a.py": "1\n"}, commit="Initial commit")
+    linter = "python -c \"print('a.py:1: message')\""
+    monkeypatch.chdir(git_repo.root)
+
+    warm_result = main(["cache", "warm", "--rev", "HEAD", "-L", linter, "a.py"])
+    main(["cache", "stats"])
+    stats_output = capsys.readouterr().out
+    main(["cache", "gc", "--max-size", "0"])
+    gc_output = capsys.readouterr().out
+
+    assert warm_result == 0
+    assert f"Cache location: {cache_dir}\nEntries: 1\n" in stats_output
+    assert gc_output.startswith("Removed 1 entries, freed ")
+    assert not LocalCacheStorage(str(cache_dir)).entries()
+
+
+@pytest.mark.parametrize("command", ["stats", "gc"])
+def test_main_not_supported_by_backend(command, capsys):
+    """Backends which can't list entries give an error for ``stats`` and ``gc``."""
+    with pytest.raises(SystemExit) as exc_info:
+        main(
+            [
+                "cache",
+                command,
+                "--cache-backend=http",
+                "--cache-location=http://localhost:1",
+            ]
+        )
+
+    assert exc_info.value.code == 2  # noqa: PLR2004
+    assert capsys.readouterr().err.endswith(
+        f"graylint cache {command} isn't supported by the http cache backend\n"
+    )
+
+
+def test_main_warm_used_by_cache_option(git_repo, cache_dir, monkeypatch, capsys):
+    """A baseline warmed with ``graylint cache warm`` is used by ``--cache``."""
+    git_repo.add({"a.py": "1\n"}, commit="Initial commit")
+    git_repo.root.joinpath("a.py").write_text("1\n2\n")
+    linter = "python -c \"print('a.py:1: message')\""
+    monkeypatch.chdir(git_repo.root)
+    main(["cache", "warm", "-r", "HEAD", "-L", linter, "a.py"])
+
+    with patch.object(
+        baseline_module, "_get_messages_from_linters_for_baseline"
+    ) as lint_baseline:
+        result = main(["--cache", "-L", linter, "a.py"])
+
+    lint_baseline.assert_not_called()
+    assert result == 0
+    assert capsys.readouterr().out == ""
+    assert len(LocalCacheStorage(str(cache_dir)).entries()) == 1
@@ -0,0 +1,148 @@
+"""Unit tests for `graylint.cache_storage.http`, using an in-process HTTP server."""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import threading
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import pytest
+
+from graylint.baseline import BaselineMetadata, load_baseline, save_baseline
+from graylint.cache_storage.http import HttpCacheStorage
+from graylint.linting import LinterMessage, MessageLocation
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+BASELINE = {MessageLocation(Path("a.py"), 1): [LinterMessage("mypy", "first")]}
+METADATA = BaselineMetadata("0123abc", [["mypy"]], ["mypy 1.0"])
+
+
+class CacheServer(ThreadingHTTPServer):
+    """A content-addressed HTTP cache server storing entries in memory."""
+
+    def __init__(self) -> None:
+        """Listen on a free port on the loopback interface."""
+        super().__init__(("127.0.0.1", 0), CacheRequestHandler)
+        self.store: dict[str, bytes] = {}
+
+    @property
+    def url(self) -> str:
+        """The base URL of the server."""
+        host, port = self.server_address[:2]
+        return f"http://{host!s}:{port}"
+
+
+class CacheRequestHandler(BaseHTTPRequestHandler):
+    """Handle ``GET`` and ``PUT`` requests for ``/ac/<key>`` and ``/cas/<sha256>``."""
+
+    server: CacheServer
+
+    def do_GET(self) -> None:  # pylint: disable=invalid-name
+        """Respond with a stored entry, or 404 if it doesn't exist."""
+        content = self.server.store.get(self.path.lstrip("/"))
+        if content is None:
+            self.send_error(HTTPStatus.NOT_FOUND)
+            return
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def do_PUT(self) -> None:  # pylint: disable=invalid-name
+        """Store an entry, verifying the hash of content-addressed entries."""
+        path = self.path.lstrip("/")
+        content = self.rfile.read(int(self.headers["Content-Length"]))
+        kind, _, key = path.partition("/")
+        if kind == "cas" and hashlib.sha256(content).hexdigest() != key:
+            self.send_error(HTTPStatus.BAD_REQUEST)
+            return
+        self.server.store[path] = content
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, format: str, *args: object) -> None:  # noqa: A002
+        """Don't log requests to standard error."""
+
+
+@pytest.fixture
+def cache_server() -> Iterator[CacheServer]:
+    """Run an in-memory HTTP cache server in a background thread."""
+    server = CacheServer()
+    thread = threading.Thread(
+        target=server.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True
+    )
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    thread.join()
+
+
+def test_put_and_get(cache_server):
+    """An entry is stored content-addressed on the server and read back."""
+    storage = HttpCacheStorage(cache_server.url)
+
+    storage.put("abcd", lambda path: save_baseline(path, METADATA, BASELINE))
+    result = storage.get("abcd", lambda path: dict(load_baseline(path, METADATA)))
+
+    assert result == BASELINE
+    content_hash = cache_server.store["ac/abcd"].decode("ascii")
+    assert hashlib.sha256(cache_server.store[f"cas/{content_hash}"]).hexdigest() == (
+        content_hash
+    )
+
+
+def test_get_missing(cache_server):
+    """A key not on the server is a cache miss."""
+    storage = HttpCacheStorage(f"{cache_server.url}/")
+
+    result = storage.get("abcd", Path.read_bytes)
+
+    assert result is None
+
+
+def test_get_corrupted(cache_server, caplog):
+    """An entry whose content doesn't match its hash is ignored."""
+    storage = HttpCacheStorage(cache_server.url)
+    storage.put("abcd", lambda path: path.write_bytes(b"content"))
+    content_hash = cache_server.store["ac/abcd"].decode("ascii")
+    cache_server.store[f"cas/{content_hash}"] = b"tampered"
+
+    result = storage.get("abcd", Path.read_bytes)
+
+    assert result is None
+    assert "Ignoring corrupted cache entry abcd" in caplog.text
+
+
+def test_get_invalid_hash(cache_server, caplog):
+    """An entry whose stored content hash isn't ASCII is a cache miss."""
+    storage = HttpCacheStorage(cache_server.url)
+    cache_server.store["ac/abcd"] = b"\xff\xfe"
+
+    result = storage.get("abcd", Path.read_bytes)
+
+    assert result is None
+    assert "Ignoring invalid content hash for cache entry abcd" in caplog.text
+
+
+def test_server_unavailable(cache_server, caplog):
+    """Errors in talking to the server are logged and treated as cache misses."""
+    url = cache_server.url
+    cache_server.shutdown()
+    cache_server.server_close()
+    storage = HttpCacheStorage(url)
+    caplog.set_level(logging.WARNING)
+
+    storage.put("abcd", lambda path: path.write_bytes(b"content"))
+    result = storage.get("abcd", Path.read_bytes)
+
+    assert result is None
+    assert f"Unable to store abcd in {url}" in caplog.text
+    assert f"Unable to read abcd from {url}" in caplog.text
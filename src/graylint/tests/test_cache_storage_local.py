@@ -0,0 +1,123 @@
+"""Unit tests for `graylint.cache_storage.local`."""
+
+# pylint: disable=use-dict-literal
+
+from __future__ import annotations
+
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from darkgraylib.utils import WINDOWS
+from graylint.baseline import BaselineMetadata, load_baseline, save_baseline
+from graylint.cache_storage.local import LocalCacheStorage, get_cache_dir
+from graylint.linting import LinterMessage, MessageLocation
+
+BASELINE = {MessageLocation(Path("a.py"), 1): [LinterMessage("mypy", "first")]}
+METADATA = BaselineMetadata("0123abc", [["mypy"]], ["mypy 1.0"])
+DAY = 24 * 60 * 60
+
+
+def _put(baseline_cache: LocalCacheStorage, key: str, size: int = 0) -> None:
+    """Store a cache entry with the given number of bytes of content."""
+    baseline_cache.put(key, lambda path: path.write_bytes(b"x" * size))
+
+
+@pytest.mark.kwparametrize(
+    dict(environ={"GRAYLINT_CACHE_DIR": "/cache/gl"}, expect="/cache/gl"),
+    dict(environ={"XDG_CACHE_HOME": "/xdg"}, expect="/xdg/graylint"),
+    dict(environ={}, expect="{home}/.cache/graylint"),
+)
+@pytest.mark.skipif(WINDOWS, reason="Windows uses the local application data directory")
+def test_get_cache_dir(monkeypatch, environ, expect):
+    """The cache directory is configurable and defaults to the user cache directory."""
+    for name in ["GRAYLINT_CACHE_DIR", "XDG_CACHE_HOME"]:
+        monkeypatch.delenv(name, raising=False)
+    for name, value in environ.items():
+        monkeypatch.setenv(name, value)
+
+    result = get_cache_dir()
+
+    assert result == Path(expect.format(home=Path.home()))
+
+
+def test_put_and_get(tmp_path):
+    """A stored baseline is read back from the cache, and missing keys return None."""
+    baseline_cache = LocalCacheStorage(str(tmp_path))
+    baseline_cache.put("abcd", lambda path: save_baseline(path, METADATA, BASELINE))
+
+    result = baseline_cache.get("abcd", lambda path: load_baseline(path, METADATA))
+    missing = baseline_cache.get("efgh", lambda path: load_baseline(path, METADATA))
+
+    assert dict(result or {}) == BASELINE
+    assert missing is None
+    assert [entry.key for entry in baseline_cache.entries()] == ["abcd"]
+
+
+def test_put_failure_leaves_no_entry(tmp_path):
+    """An entry isn't stored, and no temporary file is left, if writing fails."""
+    baseline_cache = LocalCacheStorage(str(tmp_path))
+
+    def write(path: Path) -> None:
+        path.write_bytes(b"partial")
+        message = "disk full"
+        raise OSError(message)
+
+    with pytest.raises(OSError, match="disk full"):
+        baseline_cache.put("abcd", write)
+
+    assert baseline_cache.get("abcd", Path.read_bytes) is None
+    assert not list((tmp_path / "baselines").glob("*/*"))
+
+
+def test_get_marks_entry_used(tmp_path):
+    """Reading an entry makes it the most recently used one."""
+    baseline_cache = LocalCacheStorage(str(tmp_path))
+    for key in ["aaaa", "bbbb"]:
+        _put(baseline_cache, key)
+    os.utime(tmp_path / "baselines/aa/aaaa", (0, time.time() - DAY))
+
+    baseline_cache.get("aaaa", Path.read_bytes)
+
+    assert [entry.key for entry in baseline_cache.entries()] == ["bbbb", "aaaa"]
+
+
+@pytest.mark.kwparametrize(
+    dict(max_size=1000, max_age=10 * DAY, expect_kept=["cccc", "bbbb", "aaaa"]),
+    dict(max_size=1000, max_age=2.5 * DAY, expect_kept=["bbbb", "aaaa"]),
+    dict(max_size=250, max_age=10 * DAY, expect_kept=["bbbb", "aaaa"]),
+    dict(max_size=199, max_age=10 * DAY, expect_kept=["aaaa"]),
+    dict(max_size=0, max_age=10 * DAY, expect_kept=[]),
+)
+def test_gc(tmp_path, max_size, max_age, expect_kept):
+    """Entries are removed by age, and least recently used first to fit the size."""
+    baseline_cache = LocalCacheStorage(str(tmp_path))
+    now = time.time()
+    for days_ago, key in enumerate(["aaaa", "bbbb", "cccc"], start=1):
+        _put(baseline_cache, key, size=100)
+        os.utime(tmp_path / f"baselines/{key[:2]}/{key}", (0, now - days_ago * DAY))
+
+    removed = baseline_cache.gc(max_size, max_age)
+
+    kept = [entry.key for entry in baseline_cache.entries()]
+    assert kept == expect_kept
+    assert len(removed) == 3 - len(expect_kept)
+
+
+def test_concurrent_put_and_get(tmp_path):
+    """Concurrent writers and readers of the same entry only see complete entries."""
+    baseline_cache = LocalCacheStorage(str(tmp_path))
+    contents = [bytes([index]) * 100_000 for index in range(8)]
+
+    def put_and_get(content: bytes) -> bytes | None:
+        baseline_cache.put("abcd", lambda path: path.write_bytes(content))
+        return baseline_cache.get("abcd", Path.read_bytes)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(put_and_get, contents * 4))
+
+    assert all(result in contents for result in results)
+    assert len(baseline_cache.entries()) == 1
@@ -6,6 +6,7 @@
 from __future__ import annotations
 
 import os
+from argparse import ArgumentError
 from pathlib import Path
 from typing import TYPE_CHECKING, Literal
 from unittest.mock import patch
@@ -15,8 +16,17 @@ import pytest
 from darkgraylib.command_line import parse_command_line
 from darkgraylib.testtools.helpers import raises_if_exception
 from darkgraylib.utils import WINDOWS
-from graylint.command_line import OutputSpec, make_argument_parser, shlex_split
+from graylint.command_line import (
+    LinterOutputSpec,
+    OutputSpec,
+    make_argument_parser,
+    parse_linter_limit_args,
+    shlex_split,
+    validate_linter_output_specs,
+    validate_revision_args,
+)
 from graylint.config import GraylintConfig
+from graylint.limits import LinterLimits
 from graylint.output.destination import OutputDestination
 
 if TYPE_CHECKING:
@@ -74,6 +84,97 @@ def test_shlex_split(cmdline, expect):
     assert result == expect
 
 
+@pytest.mark.kwparametrize(
+    dict(value="mypy=mypy.txt", expect=LinterOutputSpec("mypy", Path("mypy.txt"))),
+    dict(value="mypy=-", expect=LinterOutputSpec("mypy", Path("-"))),
+    dict(value="a=b=c", expect=LinterOutputSpec("a", Path("b=c"))),
+    dict(value="mypy.txt", expect=ValueError("Expected LINTER=PATH")),
+    dict(value="=mypy.txt", expect=ValueError("Expected LINTER=PATH")),
+    dict(value="mypy=", expect=ValueError("Expected LINTER=PATH")),
+)
+def test_linter_output_spec_parse(value, expect):
+    """``LinterOutputSpec.parse()`` splits the linter name and the path."""
+    with raises_if_exception(expect):
+        result = LinterOutputSpec.parse(value)
+
+        assert result == expect
+
+
+@pytest.mark.kwparametrize(
+    dict(paths=[], expect=None),
+    dict(paths=["a.txt", "-", "b.txt"], expect=None),
+    dict(paths=["-", "a.txt", "-"], expect=ArgumentError),
+)
+def test_validate_linter_output_specs(paths, expect):
+    """At most one linter output can be read from standard input."""
+    specs = [LinterOutputSpec("linter", Path(path)) for path in paths]
+
+    with raises_if_exception(expect):
+        validate_linter_output_specs(specs)
+
+
+@pytest.mark.kwparametrize(
+    dict(argv=["--each-commit", "."], expect=None),
+    dict(argv=["--max-messages=1", "."], expect=None),
+    dict(
+        argv=["--each-commit", "--fail-fast", "--load-baseline=x", "."],
+        expect=ArgumentError,
+    ),
+    dict(argv=["-r", "main", "-r", "release", "."], expect=None),
+    dict(argv=["-r", "main", "-r", "rel", "--fail-fast", "."], expect=ArgumentError),
+    dict(argv=["-r", "main", "-r", "rel", "--each-commit", "."], expect=ArgumentError),
+    dict(argv=["--each-commit", "--cache", "."], expect=ArgumentError),
+    dict(argv=["--time-budget=10s", "-r", "main", "."], expect=None),
+    dict(argv=["--time-budget=10s", "--staged", "."], expect=ArgumentError),
+    dict(argv=["--time-budget=10s", "--each-commit", "."], expect=ArgumentError),
+    dict(argv=["-r", "main", "-r", "rel", "--staged", "."], expect=ArgumentError),
+    dict(argv=["-r", "main", "--staged", "."], expect=None),
+)
+def test_validate_revision_args(argv, expect):
+    """Multiple baselines can't be combined with saved outputs or baselines."""
+    args = make_argument_parser(require_src=True).parse_args(argv)
+
+    with raises_if_exception(expect):
+        validate_revision_args(args)
+
+
+@pytest.mark.kwparametrize(
+    dict(argv=["."], expect_revision="HEAD", expect_revisions=[]),
+    dict(argv=["-r", "main", "."], expect_revision="main", expect_revisions=["main"]),
+    dict(
+        argv=["-r", "main...", "--revision=v1.0...", "."],
+        expect_revision="main...",
+        expect_revisions=["main...", "v1.0..."],
+    ),
+)
+def test_revision_option(argv, expect_revision, expect_revisions):
+    """The ``-r`` / ``--revision`` option can be repeated."""
+    args = make_argument_parser(require_src=True).parse_args(argv)
+
+    assert args.revision == expect_revision
+    assert args.revisions == expect_revisions
+
+
+@pytest.mark.kwparametrize(
+    dict(
+        timeouts=["60", "mypy=120"],
+        expect={"": LinterLimits(timeout=60.0), "mypy": LinterLimits(timeout=120.0)},
+    ),
+    dict(memory_limits=["pylint=2G"], expect={"pylint": LinterLimits(memory=2**31)}),
+    dict(cpu_limits=["mypy=1.5"], expect=ArgumentError),
+    dict(memory_limits=["lots"], expect=ArgumentError),
+    timeouts=[],
+    cpu_limits=[],
+    memory_limits=[],
+)
+def test_parse_linter_limit_args(timeouts, cpu_limits, memory_limits, expect):
+    """Invalid linter limits are reported as command line errors."""
+    with raises_if_exception(expect):
+        result = parse_linter_limit_args(timeouts, cpu_limits, memory_limits)
+
+        assert result == expect
+
+
 @pytest.mark.kwparametrize(
     dict(require_src=False, expect=[]),
     dict(require_src=True, expect=SystemExit),
@@ -106,6 +207,30 @@ def test_make_argument_parser(require_src, expect):
         expect_config=("lint", ["flake8", "mypy"]),
         expect_modified=("lint", ["flake8", "mypy"]),
     ),
+    dict(
+        argv=["--max-messages", "5", "."],
+        expect_value=("max_messages", 5),
+        expect_config=("max_messages", 5),
+        expect_modified=("max_messages", 5),
+    ),
+    dict(
+        argv=["--fail-fast", "."],
+        expect_value=("max_messages", 1),
+        expect_config=("max_messages", 1),
+        expect_modified=("max_messages", 1),
+    ),
+    dict(
+        argv=["--timeout", "60", "--timeout", "mypy=300", "."],
+        expect_value=("timeout", ["60", "mypy=300"]),
+        expect_config=("timeout", ["60", "mypy=300"]),
+        expect_modified=("timeout", ["60", "mypy=300"]),
+    ),
+    dict(
+        argv=["--memory-limit", "pylint=2G", "."],
+        expect_value=("memory_limit", ["pylint=2G"]),
+        expect_config=("memory_limit", ["pylint=2G"]),
+        expect_modified=("memory_limit", ["pylint=2G"]),
+    ),
     dict(
         argv=["-o", "gnu", "."],
         expect_value=(
@@ -0,0 +1,151 @@
+"""Unit tests for `graylint.commits`."""
+
+# pylint: disable=use-dict-literal
+
+from __future__ import annotations
+
+from pathlib import Path
+from textwrap import dedent
+
+import pytest
+
+from darkgraylib.git import WORKTREE, RevisionRange
+from graylint import commits, linting
+from graylint.command_line import OutputSpec
+from graylint.profiles import load_linter_profiles
+
+LINTER_SCRIPT = dedent(
+    """
+    import sys
+    with open({log!r}, "a") as log:
+        print(" ".join(sys.argv[1:]), file=log)
+    for path in sys.argv[1:]:
+        with open(path) as f:
+            for linenum, line in enumerate(f, 1):
+                if "bad" in line:
+                    print(f"{{path}}:{{linenum}}: {{line.strip()}}")
+    """
+)
+
+
+@pytest.fixture
+def commits_repo(git_repo):
+    """Git repository with three commits after the initial one and a modified file."""
+    git_repo.add({"a.py": "ok\n", "b.py": "bad 1\n"}, commit="Initial commit")
+    hashes = [git_repo.get_hash()]
+    git_repo.add({"a.py": "ok\nbad 2\n"}, commit="Add bad line to a.py")
+    hashes.append(git_repo.get_hash())
+    git_repo.add({"b.py": "bad 1\nok\n"}, commit="Add good line to b.py")
+    hashes.append(git_repo.get_hash())
+    git_repo.add({"b.py": "bad 3\nok\n"}, commit="Modify bad line in b.py")
+    hashes.append(git_repo.get_hash())
+    git_repo.root.joinpath("a.py").write_text("bad 4\nbad 2\n")
+    git_repo.hashes = hashes
+    return git_repo
+
+
+@pytest.mark.kwparametrize(
+    dict(rev1=0, rev2=WORKTREE, expect=[0, 1, 2, 3, WORKTREE]),
+    dict(rev1=1, rev2=3, expect=[1, 2, 3]),
+    dict(rev1=3, rev2=3, expect=[3]),
+)
+def test_list_revisions(commits_repo, rev1, rev2, expect):
+    """Revisions from ``rev1`` up to ``rev2`` are listed oldest first."""
+    hashes = commits_repo.hashes
+    revrange = RevisionRange(hashes[rev1], rev2 if rev2 == WORKTREE else hashes[rev2])
+
+    result = commits.list_revisions(commits_repo.root, revrange)
+
+    assert result == [rev if rev == WORKTREE else hashes[rev] for rev in expect]
+
+
+@pytest.mark.kwparametrize(
+    dict(rev1=0, rev2=1, expect={"a.py"}),
+    dict(rev1=0, rev2=3, expect={"a.py", "b.py"}),
+    dict(rev1=3, rev2=WORKTREE, expect={"a.py", "c.py"}),
+)
+def test_get_changed_paths(commits_repo, rev1, rev2, expect):
+    """Changed files between commits or the working tree are found."""
+    commits_repo.root.joinpath("c.py").write_text("untracked\n")
+    hashes = commits_repo.hashes
+    revrange = RevisionRange(hashes[rev1], rev2 if rev2 == WORKTREE else hashes[rev2])
+
+    result = linting.get_changed_paths(commits_repo.root, revrange, {Path()})
+
+    assert result == {Path(path) for path in expect}
+
+
+@pytest.mark.parametrize("per_file", [False, True])
+def test_run_linters_for_each_commit(commits_repo, tmp_path, capsys, per_file):
+    """Each commit is linted once, and new messages are tagged with the commit."""
+    log = tmp_path / "linter.log"
+    hashes = commits_repo.hashes
+    cmdline = ["python", "-c", LINTER_SCRIPT.format(log=str(log))]
+    load_linter_profiles({"python": {"per-file": per_file}})
+
+    result = commits.run_linters_for_each_commit(
+        [cmdline],
+        commits_repo.root,
+        {Path("a.py"), Path("b.py")},
+        RevisionRange(hashes[0], WORKTREE),
+        [OutputSpec("gnu")],
+    )
+
+    assert result == 3
+    assert capsys.readouterr().out.splitlines() == [
+        "",
+        f"a.py:2: bad 2 [python@{hashes[1][:7]}]",
+        "",
+        f"b.py:1: bad 3 [python@{hashes[3][:7]}]",
+        "",
+        "a.py:1: bad 4 [python@WORKTREE]",
+    ]
+    expect_linted = (
+        ["a.py b.py", "a.py", "b.py", "b.py", "a.py"] if per_file else 5 * ["a.py b.py"]
+    )
+    assert log.read_text().splitlines() == expect_linted
+
+
+CONFIG_LINTER_SCRIPT = dedent(
+    """
+    import sys
+    with open({log!r}, "a") as log:
+        print(" ".join(sys.argv[1:]), file=log)
+    with open("lint.cfg") as f:
+        word = f.read().strip()
+    for path in sys.argv[1:]:
+        with open(path) as f:
+            for linenum, line in enumerate(f, 1):
+                if word in line:
+                    print(f"{{path}}:{{linenum}}: {{line.strip()}}")
+    """
+)
+
+
+def test_run_linters_for_each_commit_config_changed(git_repo, tmp_path, capsys):
+    """All files are re-linted with a linter whose configuration changed in a commit."""
+    log = tmp_path / "linter.log"
+    git_repo.add(
+        {"lint.cfg": "bad\n", "src/a.py": "ok\nfoo\n", "src/b.py": "ok\n"},
+        commit="Initial commit",
+    )
+    rev1 = git_repo.get_hash()
+    git_repo.add({"lint.cfg": "foo\n"}, commit="Change configuration")
+    rev2 = git_repo.get_hash()
+    cmdline = ["python", "-c", CONFIG_LINTER_SCRIPT.format(log=str(log))]
+    load_linter_profiles({"python": {"per-file": True, "config-files": ["lint.cfg"]}})
+
+    result = commits.run_linters_for_each_commit(
+        [cmdline],
+        git_repo.root,
+        {Path("src/a.py"), Path("src/b.py")},
+        RevisionRange(rev1, rev2),
+        [OutputSpec("gnu")],
+    )
+
+    assert result == 1
+    assert capsys.readouterr().out.splitlines() == [
+        "",
+        f"src/a.py:2: foo [python@{rev2[:7]}]",
+    ]
+    assert log.read_text().splitlines() == 2 * ["src/a.py src/b.py"]
@@ -0,0 +1,194 @@
+"""Unit tests for `graylint.coverage_data`."""
+
+# pylint: disable=use-dict-literal
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+from textwrap import dedent
+from unittest.mock import patch
+
+import pytest
+
+from darkgraylib.git import RevisionRange
+from graylint import coverage_data, linting
+from graylint.command_line import LinterOutputSpec, OutputSpec
+from graylint.coverage_data import is_coverage_data, iter_uncovered_lines
+from graylint.linting import LinterMessage, MessageLocation
+
+coverage = pytest.importorskip("coverage")
+
+SOURCE = dedent(
+    """\
+    def covered():
+        return 1
+
+    def uncovered(
+        value,
+    ):
+        if value:
+            return 2
+        return 3
+
+    def excluded():  # pragma: no cover
+        return 4
+    """
+)
+
+
+def write_coverage_data(path: Path, lines: dict[Path, list[int]]) -> Path:
+    """Write a coverage.py data file with executed lines for files."""
+    data = coverage.CoverageData(basename=str(path))
+    data.add_lines(
+        {str(file_path.resolve()): linenums for file_path, linenums in lines.items()}
+    )
+    data.write()
+    return path
+
+
+def test_is_coverage_data(tmp_path):
+    """Coverage data files are told apart from text linter output."""
+    data_file = write_coverage_data(tmp_path / ".coverage", {tmp_path / "a.py": [1]})
+    (tmp_path / "output.txt").write_text("a.py:1: no coverage: x = 1\n")
+
+    assert is_coverage_data(data_file)
+    assert not is_coverage_data(tmp_path / "output.txt")
+    assert not is_coverage_data(Path("-"))
+    assert not is_coverage_data(tmp_path / "missing")
+
+
+@pytest.mark.kwparametrize(
+    dict(paths=None, expect_files={"a.py", "sub/b.py"}),
+    dict(paths={Path()}, expect_files={"a.py", "sub/b.py"}),
+    dict(paths={Path("sub")}, expect_files={"sub/b.py"}),
+    dict(paths={Path("a.py")}, expect_files={"a.py"}),
+    dict(paths={Path("c.py")}, expect_files=set()),
+)
+def test_iter_uncovered_lines(tmp_path, paths, expect_files):
+    """Statements not executed are reported, skipping excluded ones and other files."""
+    root = tmp_path / "repo"
+    (root / "sub").mkdir(parents=True)
+    (root / "a.py").write_text(SOURCE)
+    (root / "sub" / "b.py").write_text(SOURCE)
+    (tmp_path / "outside.py").write_text(SOURCE)
+    data_file = write_coverage_data(
+        tmp_path / ".coverage",
+        {
+            root / "a.py": [1, 2, 4],
+            root / "sub" / "b.py": [1, 2, 4],
+            tmp_path / "outside.py": [1],
+        },
+    )
+
+    result = list(iter_uncovered_lines(data_file, root, paths))
+
+    assert result == [
+        (Path(path), linenum, f"no coverage: {text}")
+        for path in sorted(expect_files)
+        for linenum, text in [(7, "if value:"), (8, "return 2"), (9, "return 3")]
+    ]
+
+
+def test_iter_uncovered_lines_outside_root(tmp_path, caplog):
+    """Files measured outside the root are skipped with a warning."""
+    root = tmp_path / "repo"
+    root.mkdir()
+    (tmp_path / "outside.py").write_text(SOURCE)
+    data_file = write_coverage_data(
+        tmp_path / ".coverage", {tmp_path / "outside.py": [1]}
+    )
+
+    result = list(iter_uncovered_lines(data_file, root))
+
+    assert not result
+    assert "Ignoring coverage data for 1 files outside" in caplog.text
+    assert "relative_files = true" in caplog.text
+
+
+def test_iter_uncovered_lines_outside_file(tmp_path):
+    """Line numbers outside the source file are skipped."""
+    (tmp_path / "a.py").write_text(SOURCE)
+    data_file = write_coverage_data(tmp_path / ".coverage", {tmp_path / "a.py": [1]})
+
+    with patch.object(
+        coverage_data, "_get_uncovered_linenums", return_value=[0, 9, 13, 99]
+    ):
+        result = list(iter_uncovered_lines(data_file, tmp_path))
+
+    assert result == [(Path("a.py"), 9, "no coverage: return 3")]
+
+
+@pytest.mark.kwparametrize(
+    dict(patcher=patch.dict(sys.modules, {"coverage.parser": None})),
+    dict(
+        patcher=patch(
+            "coverage.parser.PythonParser.parse_source",
+            side_effect=AttributeError("parse_source"),
+        )
+    ),
+)
+def test_iter_uncovered_lines_unsupported_coverage(tmp_path, caplog, patcher):
+    """An incompatible coverage.py source code parser gives a warning."""
+    (tmp_path / "a.py").write_text(SOURCE)
+    data_file = write_coverage_data(tmp_path / ".coverage", {tmp_path / "a.py": [1]})
+
+    with patcher:
+        result = list(iter_uncovered_lines(data_file, tmp_path))
+
+    assert not result
+    assert "Supported versions are >=7.0,<8." in caplog.text
+
+
+def test_read_linter_output_matches_text(tmp_path):
+    """Coverage data gives the same messages as ``cov_to_lint.py`` style output."""
+    (tmp_path / "a.py").write_text(SOURCE)
+    data_file = write_coverage_data(tmp_path / ".coverage", {tmp_path / "a.py": [1]})
+    (tmp_path / "cov.txt").write_text(
+        "a.py:2:  no coverage:     return 1\n"
+        "a.py:4:  no coverage: def uncovered(\n"
+        "a.py:7:  no coverage:     if value:\n"
+        "a.py:8:  no coverage:         return 2\n"
+        "a.py:9:  no coverage:     return 3\n"
+    )
+
+    result = linting.read_linter_output("coverage", data_file, tmp_path)
+
+    text_result = linting.read_linter_output("coverage", tmp_path / "cov.txt", tmp_path)
+    assert {
+        location: linting.normalize_whitespace(message)
+        for location, message in text_result.items()
+    } == result
+    assert result[MessageLocation(Path("a.py"), 2)] == LinterMessage(
+        "coverage", "no coverage: return 1"
+    )
+
+
+def test_run_linters_coverage(git_repo, tmp_path, capsys):
+    """Coverage data for both revisions is compared using each revision's source."""
+    git_repo.add({"a.py": SOURCE}, commit="Initial commit")
+    write_coverage_data(
+        tmp_path / "baseline.coverage", {git_repo.root / "a.py": [1, 2]}
+    )
+    git_repo.root.joinpath("a.py").write_text(f"import os\n{SOURCE}")
+    write_coverage_data(
+        tmp_path / "rev2.coverage", {git_repo.root / "a.py": [2, 3, 5, 8, 9]}
+    )
+
+    result = linting.run_linters(
+        [],
+        git_repo.root,
+        {Path("a.py")},
+        RevisionRange("HEAD", ":WORKTREE:"),
+        [OutputSpec("gnu")],
+        linter_outputs=[LinterOutputSpec("coverage", tmp_path / "rev2.coverage")],
+        baseline_linter_outputs=[
+            LinterOutputSpec("coverage", tmp_path / "baseline.coverage")
+        ],
+    )
+
+    assert result == 1
+    assert capsys.readouterr().out.splitlines() == [
+        "",
+        "a.py:1: no coverage: import os [coverage]",
+    ]
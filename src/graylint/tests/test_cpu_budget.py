@@ -0,0 +1,203 @@
+"""Unit tests for `graylint.cpu_budget`."""
+
+# pylint: disable=protected-access,use-dict-literal
+
+from __future__ import annotations
+
+import os
+import shutil
+from pathlib import Path
+from typing import TYPE_CHECKING
+from unittest.mock import Mock, patch
+
+import pytest
+
+from darkgraylib.git import WORKTREE, RevisionRange
+from graylint import cpu_budget, linting
+from graylint.command_line import OutputSpec
+from graylint.cpu_budget import (
+    BACKGROUND_NICENESS,
+    CpuBudget,
+    get_available_cpus,
+    get_background_prefix,
+    get_cpu_budget,
+    set_cpu_budget,
+)
+from graylint.profiles import load_linter_profiles
+
+if TYPE_CHECKING:
+    from graylint.linting import LinterMessage, MessageLocation
+
+CPUS = 3
+
+
+@pytest.mark.kwparametrize(
+    dict(cpu_max="max 100000\n", expect=8),
+    dict(cpu_max="250000 100000\n", expect=2),
+    dict(cpu_max="50000 100000\n", expect=1),
+    dict(cfs_quota="-1\n", cfs_period="100000\n", expect=8),
+    dict(cfs_quota="300000\n", cfs_period="100000\n", expect=3),
+    dict(expect=8),
+    cpu_max=None,
+    cfs_quota=None,
+    cfs_period=None,
+)
+def test_get_available_cpus(tmp_path, cpu_max, cfs_quota, cfs_period, expect):
+    """The cgroup v2 or v1 CPU quota limits the number of available cores."""
+    for name, content in [
+        ("cpu.max", cpu_max),
+        ("cpu/cpu.cfs_quota_us", cfs_quota),
+        ("cpu/cpu.cfs_period_us", cfs_period),
+    ]:
+        if content is not None:
+            tmp_path.joinpath(name).parent.mkdir(exist_ok=True)
+            tmp_path.joinpath(name).write_text(content)
+    get_available_cpus.cache_clear()
+
+    with (
+        patch.multiple(
+            cpu_budget,
+            CGROUP_V2_CPU_MAX=tmp_path / "cpu.max",
+            CGROUP_V1_CPU_DIR=tmp_path / "cpu",
+        ),
+        patch("os.sched_getaffinity", return_value=set(range(8))),
+    ):
+        result = get_available_cpus()
+
+    get_available_cpus.cache_clear()
+    assert result == expect
+
+
+def test_set_cpu_budget():
+    """A zero CPU budget means all available cores."""
+    set_cpu_budget(CPUS)
+    assert get_cpu_budget().cpus == CPUS
+
+    set_cpu_budget(0)
+    assert get_cpu_budget().cpus == get_available_cpus()
+
+
+def test_cpu_budget_share():
+    """The budget is shared between open lanes, and closed lanes give up their share."""
+    budget = CpuBudget(5)
+    shares = [budget.share()]
+    with budget.lane() as first_lane, budget.lane(background=True) as second_lane:
+        shares.append(budget.share())
+        shares.append(second_lane.run(budget.share))
+        shares.append(first_lane.run(lambda: budget.background))
+        shares.append(budget.share())
+        first_lane.close()
+    shares.append(budget.share())
+
+    assert shares == [5, 2, 2, False, 5, 5]
+
+
+def test_cpu_budget_background_lane():
+    """Only functions run in a background lane see the ``background`` flag."""
+    budget = CpuBudget(2)
+    with budget.lane(background=True) as lane:
+        result = lane.run(lambda: budget.background)
+
+    assert result is True
+    assert budget.background is False
+
+
+@pytest.mark.kwparametrize(
+    dict(cmdline=["pylint"], expect_cmdline=["pylint", "--jobs=3"]),
+    dict(cmdline=["pylint", "-j", "0"], expect_cmdline=["pylint", "-j", "0"]),
+    dict(cmdline=["pylint", "--jobs=1"], expect_cmdline=["pylint", "--jobs=1"]),
+    dict(cmdline=["pylint", "-jx"], expect_cmdline=["pylint", "-jx", "--jobs=3"]),
+    dict(cmdline=["pylint"], cpus=1, expect_cmdline=["pylint"]),
+    dict(
+        cmdline=["ruff"],
+        expect_cmdline=["ruff", "check", "--output-format=concise"],
+        expect_env={"RAYON_NUM_THREADS": "3"},
+    ),
+    dict(
+        cmdline=["ruff"],
+        env={"RAYON_NUM_THREADS": "1"},
+        expect_cmdline=["ruff", "check", "--output-format=concise"],
+        expect_env={"RAYON_NUM_THREADS": "1"},
+    ),
+    dict(cmdline=["mypy"], expect_cmdline=["mypy"]),
+    cpus=CPUS,
+    env={},
+    expect_env={},
+)
+def test_run_linter_jobs(cmdline, cpus, env, expect_cmdline, expect_env):
+    """Linter subprocesses get their share of the CPU budget as a jobs option."""
+    set_cpu_budget(cpus)
+    load_linter_profiles({"pylint": {"jobs-option": "--jobs"}})
+
+    with patch.object(linting, "_check_linter_output") as check_linter_output:
+        linting.run_linter(cmdline, Path(), set(), env, limits=Mock())
+
+    [call] = check_linter_output.call_args_list
+    assert call.args[0] == expect_cmdline
+    assert call.args[3] == expect_env
+
+
+@pytest.mark.kwparametrize(
+    dict(commands={}, expect=[]),
+    dict(commands={"nice": "/bin/nice"}, expect=["/bin/nice", "-n", "10"]),
+    dict(
+        commands={"nice": "/bin/nice", "ionice": "/bin/ionice"},
+        expect=["/bin/nice", "-n", "10", "/bin/ionice", "-c", "3", "-t"],
+    ),
+)
+def test_get_background_prefix(commands, expect):
+    """Linters are run through ``nice`` and ``ionice`` if they're available."""
+    get_background_prefix.cache_clear()
+    try:
+        with patch("shutil.which", side_effect=commands.get):
+            result = get_background_prefix()
+    finally:
+        get_background_prefix.cache_clear()
+
+    assert result == expect
+
+
+@pytest.mark.skipif(
+    not shutil.which("nice") or not shutil.which("ionice"),
+    reason="Requires the nice and ionice commands",
+)
+def test_run_linter_background_priority(tmp_path):
+    """Linters in the background lane run with a lower CPU and I/O priority."""
+    script = "import os, subprocess; print(os.nice(0)); subprocess.run(['ionice'])"
+    set_cpu_budget(CPUS)
+
+    def read_output() -> str:
+        with linting._check_linter_output(
+            ["python", "-c", script], tmp_path, set(), dict(os.environ)
+        ) as stdout:
+            return stdout.read()
+
+    with get_cpu_budget().lane(background=True) as lane:
+        result = lane.run(read_output)
+
+    niceness = min(19, os.nice(0) + BACKGROUND_NICENESS)
+    assert result == f"{niceness}\nidle\n"
+
+
+def test_run_linters_background_baseline(git_repo):
+    """The baseline is linted in a background lane, and ``rev2`` in the foreground."""
+    git_repo.add({"a.py": ""}, commit="Initial commit")
+    git_repo.root.joinpath("a.py").write_text("x = 1\n")
+    background = {}
+
+    def run_linter(
+        _cmdline: list[str], root: Path, *_args: object, **_kwargs: object
+    ) -> dict[MessageLocation, LinterMessage]:
+        background[root == git_repo.root] = get_cpu_budget().background
+        return {}
+
+    with patch.object(linting, "run_linter", side_effect=run_linter):
+        linting.run_linters(
+            [["mylint"]],
+            git_repo.root,
+            {Path("a.py")},
+            RevisionRange("HEAD", WORKTREE),
+            [OutputSpec("gnu")],
+        )
+
+    assert background == {True: False, False: True}
@@ -0,0 +1,85 @@
+"""Unit tests for `graylint.dmypy`."""
+
+# pylint: disable=protected-access,use-dict-literal
+
+from __future__ import annotations
+
+import shutil
+from unittest.mock import patch
+
+import pytest
+
+from graylint import dmypy
+from graylint.__main__ import main
+from graylint.dmypy import get_status_file, make_dmypy_command, stop_daemons
+
+requires_dmypy = pytest.mark.skipif(
+    not shutil.which("dmypy"), reason="The Mypy daemon isn't installed"
+)
+
+
+@pytest.mark.kwparametrize(
+    dict(cmdline=["dmypy"], expect=["run", "--"]),
+    dict(cmdline=["dmypy", "--strict"], expect=["run", "--", "--strict"]),
+    dict(cmdline=["dmypy", "check"], expect=["check"]),
+    dict(
+        cmdline=["dmypy", "run", "--timeout", "60", "--", "--strict"],
+        expect=["run", "--timeout", "60", "--", "--strict"],
+    ),
+)
+def test_make_dmypy_command(tmp_path, cmdline, expect):
+    """A check request is sent to the daemon for the tree being linted."""
+    result = make_dmypy_command(cmdline, tmp_path)
+
+    status_file = get_status_file(tmp_path)
+    assert result == ["dmypy", "--status-file", str(status_file), *expect]
+    assert status_file.parent.is_dir()
+    assert status_file in dmypy._used_status_files
+    stop_daemons()
+
+
+def test_get_status_file(tmp_path):
+    """Each tree gets a daemon of its own."""
+    first = get_status_file(tmp_path / "first")
+    second = get_status_file(tmp_path / "second")
+
+    assert first != second
+    assert first == get_status_file(tmp_path / "first")
+
+
+@requires_dmypy
+@pytest.mark.kwparametrize(
+    dict(options=[], expect_running=False),
+    dict(options=["--keep-daemons"], expect_running=True),
+)
+def test_main_dmypy(git_repo, monkeypatch, capsys, options, expect_running):
+    """Mypy daemons check both trees, and are stopped unless asked to keep them."""
+    git_repo.add({"a.py": "x: int = 'a'\n"}, commit="Initial commit")
+    git_repo.root.joinpath("a.py").write_text("x: int = 'a'\ny: str = 1\n")
+    monkeypatch.chdir(git_repo.root)
+
+    result = main(["-L", "dmypy", *options, "a.py"])
+
+    output = capsys.readouterr().out.splitlines()
+    assert result == 1
+    assert [line.split(": error:")[0] for line in output if line] == ["a.py:2"]
+    status_files = list(get_status_file(git_repo.root).parent.glob("*.json"))
+    assert len(status_files) == (2 if expect_running else 0)
+    dmypy._used_status_files.update(dict.fromkeys(status_files, git_repo.root))
+    stop_daemons()
+
+
+def test_stop_daemons_keep(tmp_path):
+    """Kept daemons are only left running for trees which still exist."""
+    for name in ["kept", "deleted"]:
+        (tmp_path / name).mkdir()
+        make_dmypy_command(["dmypy"], tmp_path / name)
+        get_status_file(tmp_path / name).touch()
+    (tmp_path / "deleted").rmdir()
+
+    with patch.object(dmypy, "run") as run:
+        stop_daemons(keep_daemons=True)
+
+    [call] = run.call_args_list
+    assert call.args[0][2] == str(get_status_file(tmp_path / "deleted"))
+    assert not dmypy._used_status_files
@@ -0,0 +1,175 @@
+"""Unit tests for `graylint.durations`."""
+
+# pylint: disable=protected-access,use-dict-literal
+
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING
+from unittest.mock import patch
+
+import pytest
+
+from graylint import linting
+from graylint.cpu_budget import set_cpu_budget
+from graylint.durations import (
+    DurationHistory,
+    duration_history,
+    get_duration_history,
+    split_by_cost,
+)
+from graylint.linter import workers
+from graylint.linting import LinterMessage, MessageLocation
+
+if TYPE_CHECKING:
+    from collections.abc import Collection
+
+FAST_SECONDS = 1.0
+SLOW_SECONDS = 5.0
+
+
+def test_duration_history_decaying_average(tmp_path):
+    """Linter durations are averaged with more weight on recent runs, and saved."""
+    with duration_history(tmp_path) as history:
+        assert get_duration_history() is history
+        history.record_linter(["mypy", "--strict"], 10.0)
+        history.record_linter(["mypy", "--strict"], 20.0)
+        history.record_shard("flake8", ["a.py", "b.py"], 4.0)
+
+    with duration_history(tmp_path) as history:
+        result = (
+            history.expected_linter_duration(["mypy", "--strict"]),
+            history.expected_linter_duration(["mypy"]),
+            history.expected_file_costs("flake8", ["a.py", "c.py"]),
+            history.expected_file_costs("pylint", ["a.py"]),
+        )
+
+    assert result == (13.0, None, [2.0, 2.0], [1.0])
+    assert get_duration_history().path is None
+
+
+def test_duration_history_invalid_file(tmp_path):
+    """An unreadable history file is ignored."""
+    path = tmp_path / "durations.json"
+    path.write_text('{"linters": ')
+
+    history = DurationHistory(path)
+
+    assert history.linters == {}
+
+
+def test_duration_history_concurrent_save(tmp_path):
+    """Histories saved at the same time don't share a temporary file."""
+    path = tmp_path / "durations.json"
+    histories = [DurationHistory(path) for _ in range(8)]
+    for seconds, history in enumerate(histories):
+        history.record_linter(["mypy"], float(seconds))
+
+    with ThreadPoolExecutor(8) as pool:
+        list(pool.map(DurationHistory.save, histories))
+
+    assert DurationHistory(path).expected_linter_duration(["mypy"]) in range(8)
+    assert [child.name for child in tmp_path.iterdir()] == ["durations.json"]
+
+
+def test_order_longest_first():
+    """Linters with no recorded duration come first, then the slowest ones."""
+    history = DurationHistory()
+    history.record_linter(["flake8"], 1.0)
+    history.record_linter(["mypy"], 5.0)
+    history.record_linter(["ruff"], 0.0)
+
+    result = history.order_longest_first(
+        [["ruff"], ["flake8"], ["pylint"], ["mypy"], ["pydocstyle"]]
+    )
+
+    assert result == [2, 4, 3, 1, 0]
+
+
+@pytest.mark.kwparametrize(
+    dict(costs=[1.0, 1.0, 1.0, 1.0], shard_count=2, expect=[["a", "c"], ["b", "d"]]),
+    dict(costs=[1.0, 1.0, 1.0, 9.0], shard_count=2, expect=[["d"], ["a", "b", "c"]]),
+    dict(costs=[3.0, 1.0, 1.0, 1.0], shard_count=3, expect=[["a"], ["b", "d"], ["c"]]),
+    dict(costs=[1.0, 2.0, 3.0, 4.0], shard_count=1, expect=[["a", "b", "c", "d"]]),
+    dict(
+        costs=[1.0, 2.0, 3.0, 4.0], shard_count=5, expect=[["d"], ["c"], ["b"], ["a"]]
+    ),
+)
+def test_split_by_cost(costs, shard_count, expect):
+    """Shards get about the same total cost, and no shard is empty."""
+    result = split_by_cost(["a", "b", "c", "d"], costs, shard_count)
+
+    assert result == expect
+
+
+def test_make_shards(tmp_path):
+    """In-process linters split files between workers by their recorded cost."""
+    set_cpu_budget(2)
+    with duration_history(tmp_path) as history:
+        history.record_shard("flake8", ["big.py"], 10.0)
+        history.record_shard("flake8", ["a.py", "b.py"], 2.0)
+
+        result = workers._make_shards("flake8", ["a.py", "b.py", "big.py", "new.py"])
+
+    assert result == [["big.py"], ["a.py", "b.py", "new.py"]]
+
+
+def test_get_messages_from_linters_longest_first(tmp_path):
+    """The slowest linter is run first, but messages are in the order of linters."""
+    calls = []
+
+    def run_linter(
+        cmdline: list[str], *_args: object, **_kwargs: object
+    ) -> dict[MessageLocation, LinterMessage]:
+        calls.append(cmdline[0])
+        return {MessageLocation(Path("a.py"), 1): LinterMessage(cmdline[0], "msg")}
+
+    with (
+        duration_history(tmp_path) as history,
+        patch.object(linting, "run_linter", side_effect=run_linter),
+    ):
+        history.record_linter(["fast"], FAST_SECONDS)
+        history.record_linter(["slow"], SLOW_SECONDS)
+        result = linting._get_messages_from_linters(
+            [["fast"], ["slow"]], tmp_path, set(), {}
+        )
+        fast_duration = history.expected_linter_duration(["fast"])
+        slow_duration = history.expected_linter_duration(["slow"])
+
+    assert calls == ["slow", "fast"]
+    assert [message.linter for message in result[MessageLocation(Path("a.py"), 1)]] == [
+        "fast",
+        "slow",
+    ]
+    assert fast_duration is not None
+    assert fast_duration < FAST_SECONDS
+    assert slow_duration is not None
+    assert slow_duration < SLOW_SECONDS
+
+
+def test_run_adapter_records_shards(tmp_path):
+    """The wall time of each shard of an in-process linter is recorded per file."""
+    shards: list[Collection[str]] = []
+
+    def lint_in_worker(
+        _name: str, _args: list[str], _root: Path, paths: list[str], _env: object
+    ) -> tuple[list[object], float]:
+        shards.append(paths)
+        return [], 3.0 * len(paths)
+
+    set_cpu_budget(2)
+    with (
+        duration_history(tmp_path) as history,
+        ThreadPoolExecutor(1) as pool,
+        patch.object(workers, "_lint_in_worker", side_effect=lint_in_worker),
+        patch.object(workers, "_get_pool", return_value=pool),
+    ):
+        workers.run_adapter(
+            "flake8", [], tmp_path, ["a.py", "b.py", "c.py"], env={}, shardable=True
+        )
+
+        result = history.expected_file_costs("flake8", ["a.py", "b.py", "c.py"])
+
+    assert shards == [["a.py", "c.py"], ["b.py"]]
+    assert result == [3.0, 3.0, 3.0]
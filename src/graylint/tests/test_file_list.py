@@ -0,0 +1,113 @@
+"""Unit tests for `graylint.file_list`."""
+
+# pylint: disable=use-dict-literal
+
+from __future__ import annotations
+
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from darkgraylib.git import WORKTREE, RevisionRange
+from graylint import linting
+from graylint.command_line import OutputSpec
+from graylint.file_list import expand_paths
+from graylint.staged import INDEX
+
+
+@pytest.fixture
+def files_repo(git_repo):
+    """Git repository with ignored, generated and untracked files."""
+    git_repo.add(
+        {
+            ".gitignore": ".venv/\nbuild/\n",
+            ".gitattributes": (
+                "src/generated.py linguist-generated\n"
+                "src/vendor/** graylint-skip\n"
+                "src/kept.py -linguist-generated\n"
+            ),
+            "setup.cfg": "",
+            "src/a.py": "",
+            "src/[b].py": "",
+            "src/kept.py": "",
+            "src/notes.txt": "",
+            "src/generated.py": "",
+            "src/vendor/lib.py": "",
+            "tests/test_a.py": "",
+        },
+        commit="Initial commit",
+    )
+    git_repo.add({"src/staged.py": ""})
+    for path in ["src/new.py", ".venv/lib/site.py", "build/lib/src/a.py"]:
+        git_repo.root.joinpath(path).parent.mkdir(parents=True, exist_ok=True)
+        git_repo.root.joinpath(path).write_text("")
+    git_repo.root.joinpath("tests/test_a.py").unlink()
+    return git_repo
+
+
+@pytest.mark.kwparametrize(
+    dict(
+        paths={"."},
+        revision=WORKTREE,
+        expect={"src/a.py", "src/[b].py", "src/kept.py", "src/new.py", "src/staged.py"},
+    ),
+    dict(
+        paths={"."},
+        revision=INDEX,
+        expect={
+            "src/a.py",
+            "src/[b].py",
+            "src/kept.py",
+            "src/staged.py",
+            "tests/test_a.py",
+        },
+    ),
+    dict(
+        paths={"."},
+        revision="HEAD",
+        expect={"src/a.py", "src/[b].py", "src/kept.py", "tests/test_a.py"},
+    ),
+    dict(
+        paths={"src/[b].py", "setup.cfg", "tests"},
+        revision="HEAD",
+        expect={"src/[b].py", "setup.cfg", "tests/test_a.py"},
+    ),
+    dict(paths={"src/vendor"}, revision=WORKTREE, expect=set()),
+    dict(paths={"build"}, revision=WORKTREE, expect=set()),
+)
+def test_expand_paths(files_repo, paths, revision, expect):
+    """Directories are expanded to Python files not ignored or skipped by attributes."""
+    result = expand_paths(files_repo.root, {Path(path) for path in paths}, revision)
+
+    assert result == {Path(path) for path in expect}
+
+
+def test_run_linters_expand_directories(files_repo):
+    """Linters get the same files in both revisions, except for files added later."""
+    with patch.object(linting, "run_linter", return_value={}) as run_linter:
+        linting.run_linters(
+            [["mypy"]],
+            files_repo.root,
+            {Path("src")},
+            RevisionRange("HEAD", WORKTREE),
+            [OutputSpec("gnu")],
+            expand_directories=True,
+        )
+
+    linted_paths = {
+        "rev2" if call.args[1] == files_repo.root else "baseline": {
+            str(path) for path in call.args[2]
+        }
+        for call in run_linter.call_args_list
+    }
+    assert linted_paths == {
+        "rev2": {
+            "src/a.py",
+            "src/[b].py",
+            "src/kept.py",
+            "src/new.py",
+            "src/staged.py",
+        },
+        "baseline": {"src/a.py", "src/[b].py", "src/kept.py"},
+    }
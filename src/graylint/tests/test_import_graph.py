@@ -0,0 +1,167 @@
+"""Unit tests for `graylint.import_graph`."""
+
+# pylint: disable=protected-access,use-dict-literal
+
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from hashlib import sha1
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from darkgraylib.git import WORKTREE, RevisionRange
+from graylint import import_graph, linting
+from graylint.command_line import OutputSpec
+from graylint.import_graph import (
+    build_reverse_graph,
+    find_importers,
+    get_blob_hashes,
+    get_imports,
+)
+from graylint.staged import INDEX
+
+PACKAGE = {
+    "src/pkg/__init__.py": "",
+    "src/pkg/a.py": "A = 1\n",
+    "src/pkg/b.py": "from . import a\n",
+    "src/pkg/c.py": "from pkg.b import B\n",
+    "src/pkg/sub/__init__.py": "from ..c import *\n",
+    "tests/test_sub.py": "import pkg.sub\n",
+    "tests/test_unrelated.py": "import os\n",
+    "README.txt": "import pkg.a\n",
+}
+
+
+@pytest.fixture
+def package_repo(git_repo):
+    """Git repository with a package in a ``src`` layout, and tests importing it."""
+    git_repo.add(PACKAGE, commit="Initial commit")
+    return git_repo
+
+
+@pytest.mark.kwparametrize(
+    dict(revision="HEAD", expect={"a.py": "a1", "b.py": "b1", "d.py": "d1"}),
+    dict(revision=INDEX, expect={"a.py": "a1", "b.py": "b2", "d.py": "d1"}),
+    dict(revision=WORKTREE, expect={"a.py": "a2", "b.py": "b2", "c.py": "c1"}),
+)
+def test_get_blob_hashes(git_repo, revision, expect):
+    """Blob hashes of Python files match the content in each revision."""
+    git_repo.add({"a.py": "a1\n", "b.py": "b1\n", "d.py": "d1\n", "e.txt": "e\n"})
+    git_repo.add({}, commit="Initial commit")
+    git_repo.add({"b.py": "b2\n"})
+    git_repo.root.joinpath("a.py").write_text("a2\n")
+    git_repo.root.joinpath("c.py").write_text("c1\n")
+    git_repo.root.joinpath("d.py").unlink()
+    contents = {
+        sha1(
+            f"blob {len(text) + 1}\0{text}\n".encode(), usedforsecurity=False
+        ).hexdigest()
+        for text in expect.values()
+    }
+
+    result = get_blob_hashes(git_repo.root, revision)
+
+    assert set(result) == {Path(path) for path in expect}
+    assert set(result.values()) == contents
+
+
+def test_build_reverse_graph(package_repo):
+    """Absolute and relative imports of modules and packages are found."""
+    result = build_reverse_graph(package_repo.root, "HEAD")
+
+    assert {
+        str(imported): sorted(str(path) for path in importers)
+        for imported, importers in result.items()
+    } == {
+        "src/pkg/__init__.py": [
+            "src/pkg/b.py",
+            "src/pkg/c.py",
+            "src/pkg/sub/__init__.py",
+            "tests/test_sub.py",
+        ],
+        "src/pkg/a.py": ["src/pkg/b.py"],
+        "src/pkg/b.py": ["src/pkg/c.py"],
+        "src/pkg/c.py": ["src/pkg/sub/__init__.py"],
+        "src/pkg/sub/__init__.py": ["tests/test_sub.py"],
+    }
+
+
+def test_get_imports_cached(package_repo):
+    """Files are parsed only once, and changed files are parsed again."""
+    blobs = get_blob_hashes(package_repo.root, WORKTREE)
+    first = get_imports(package_repo.root, WORKTREE, blobs)
+    package_repo.root.joinpath("src/pkg/a.py").write_text("import sys\n")
+    blobs = get_blob_hashes(package_repo.root, WORKTREE)
+
+    with patch.object(
+        import_graph, "parse_imports", wraps=import_graph.parse_imports
+    ) as parse_imports:
+        second = get_imports(package_repo.root, WORKTREE, blobs)
+
+    parse_imports.assert_called_once_with(b"import sys\n")
+    assert first[Path("src/pkg/a.py")] == []
+    assert second == {**first, Path("src/pkg/a.py"): [(0, "sys", [])]}
+
+
+def test_save_cache_concurrent(tmp_path):
+    """Caches saved at the same time don't share a temporary file."""
+    path = tmp_path / "imports.json"
+    caches: list[dict[str, list[import_graph.ImportRecord]]] = [
+        {f"blob{number}": [(0, "os", [])]} for number in range(8)
+    ]
+
+    with ThreadPoolExecutor(8) as pool:
+        list(pool.map(lambda cache: import_graph._save_cache(path, cache, []), caches))
+
+    assert import_graph._load_cache(path) in caches
+    assert [child.name for child in tmp_path.iterdir()] == ["imports.json"]
+
+
+@pytest.mark.kwparametrize(
+    dict(depth=0, expect=set()),
+    dict(depth=1, expect={"src/pkg/b.py"}),
+    dict(depth=2, expect={"src/pkg/b.py", "src/pkg/c.py"}),
+    dict(
+        depth=10,
+        expect={
+            "src/pkg/b.py",
+            "src/pkg/c.py",
+            "src/pkg/sub/__init__.py",
+            "tests/test_sub.py",
+        },
+    ),
+)
+def test_find_importers(package_repo, depth, expect):
+    """Importers are found through the given number of import levels."""
+    graph = build_reverse_graph(package_repo.root, "HEAD")
+
+    result = find_importers(graph, [Path("src/pkg/a.py")], depth)
+
+    assert result == {Path(path) for path in expect}
+
+
+@pytest.mark.kwparametrize(
+    dict(paths={Path()}, depth=1, expect={"src/pkg/a.py", "src/pkg/b.py"}),
+    dict(paths={Path("tests")}, depth=1, expect=set()),
+    dict(paths={Path("tests")}, depth=4, expect={"tests/test_sub.py"}),
+)
+def test_run_linters_import_depth(package_repo, paths, depth, expect):
+    """Both revisions are linted only for changed files and importers in ``paths``."""
+    package_repo.root.joinpath("src/pkg/a.py").write_text("A = 2\n")
+
+    with patch.object(linting, "run_linter", return_value={}) as run_linter:
+        linting.run_linters(
+            [["mypy"]],
+            package_repo.root,
+            paths,
+            RevisionRange("HEAD", WORKTREE),
+            [OutputSpec("gnu")],
+            import_depth=depth,
+        )
+
+    linted_paths = [
+        {str(path) for path in call.args[2]} for call in run_linter.call_args_list
+    ]
+    assert linted_paths == ([expect, expect] if expect else [])
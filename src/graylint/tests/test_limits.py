@@ -0,0 +1,139 @@
+"""Unit tests for `graylint.limits`."""
+
+# pylint: disable=use-dict-literal
+
+from __future__ import annotations
+
+import signal
+import sys
+from subprocess import Popen  # nosec
+
+import pytest
+
+from darkgraylib.testtools.helpers import raises_if_exception
+from darkgraylib.utils import WINDOWS
+from graylint.limits import (
+    LinterLimits,
+    get_linter_limits,
+    parse_duration,
+    parse_linter_limits,
+)
+
+
+@pytest.mark.kwparametrize(
+    dict(expect={}),
+    dict(timeouts=["60"], expect={"": LinterLimits(timeout=60.0)}),
+    dict(
+        timeouts=[60, "mypy=300", "mypy=600"],
+        cpu_limits=["pylint=120"],
+        memory_limits=["512M", "pylint=2G"],
+        expect={
+            "": LinterLimits(timeout=60.0, memory=512 * 1024**2),
+            "mypy": LinterLimits(timeout=600.0),
+            "pylint": LinterLimits(cpu_time=120, memory=2 * 1024**3),
+        },
+    ),
+    dict(
+        memory_limits=["/usr/bin/mypy=1000"],
+        expect={"/usr/bin/mypy": LinterLimits(memory=1000)},
+    ),
+    dict(
+        timeouts=["30s", "mypy=10m", "pylint=1.5"],
+        expect={
+            "": LinterLimits(timeout=30.0),
+            "mypy": LinterLimits(timeout=600.0),
+            "pylint": LinterLimits(timeout=1.5),
+        },
+    ),
+    dict(timeouts=["mypy=soon"], expect=ValueError("Invalid duration 'soon'")),
+    dict(memory_limits=["lots"], expect=ValueError("Invalid memory size 'lots'")),
+    timeouts=[],
+    cpu_limits=[],
+    memory_limits=[],
+)
+def test_parse_linter_limits(timeouts, cpu_limits, memory_limits, expect):
+    """Limits are parsed for all linters and for individual linters."""
+    with raises_if_exception(expect):
+        result = parse_linter_limits(timeouts, cpu_limits, memory_limits)
+
+        assert result == expect
+
+
+@pytest.mark.kwparametrize(
+    dict(value="10", expect=10.0),
+    dict(value=" 2.5s ", expect=2.5),
+    dict(value="500ms", expect=0.5),
+    dict(value="2M", expect=120.0),
+    dict(value="1h", expect=3600.0),
+    dict(value="10 days", expect=ValueError("Invalid duration '10 days'")),
+    dict(value="-1s", expect=ValueError("Invalid duration '-1s'")),
+)
+def test_parse_duration(value, expect):
+    """Durations are parsed with an optional unit, defaulting to seconds."""
+    with raises_if_exception(expect):
+        result = parse_duration(value)
+
+        assert result == expect
+
+
+@pytest.mark.kwparametrize(
+    dict(linter="pylint", expect=LinterLimits(timeout=60, memory=100)),
+    dict(linter="mypy", expect=LinterLimits(timeout=300, cpu_time=10, memory=100)),
+    dict(
+        linter="/venv/bin/mypy",
+        expect=LinterLimits(timeout=300, cpu_time=10, memory=100),
+    ),
+)
+def test_get_linter_limits(linter, expect):
+    """Limits for a linter override the limits for all linters."""
+    limits = {
+        "": LinterLimits(timeout=60, memory=100),
+        "mypy": LinterLimits(timeout=300, cpu_time=10),
+    }
+
+    result = get_linter_limits(limits, linter)
+
+    assert result == expect
+
+
+@pytest.mark.skipif(WINDOWS, reason="No SIGXCPU on Windows")
+@pytest.mark.kwparametrize(
+    dict(limits=LinterLimits(), returncode=-signal.SIGXCPU, expect=None),
+    dict(
+        limits=LinterLimits(cpu_time=5),
+        returncode=-signal.SIGXCPU,
+        expect="exceeded the CPU time limit of 5 seconds",
+    ),
+    dict(limits=LinterLimits(cpu_time=5), returncode=1, expect=None),
+    dict(
+        limits=LinterLimits(memory=1024),
+        returncode=-signal.SIGSEGV,
+        expect=(
+            f"was terminated by signal {int(signal.SIGSEGV)}, possibly by exceeding"
+            " the memory limit of 1024 bytes"
+        ),
+    ),
+    dict(limits=LinterLimits(memory=1024), returncode=1, expect=None),
+)
+def test_linter_limits_describe_exit(limits, returncode, expect):
+    """Exit statuses caused by exceeded limits are explained."""
+    result = limits.describe_exit(returncode)
+
+    assert result == expect
+
+
+@pytest.mark.skipif(sys.platform != "linux", reason="prlimit() is only on Linux")
+def test_linter_limits_apply():
+    """CPU time and memory limits are set on a running subprocess."""
+    # pylint: disable=import-outside-toplevel
+    import resource  # noqa: PLC0415  # not available on Windows
+
+    with Popen([sys.executable, "-c", "input()"], stdin=-1) as process:
+        LinterLimits(cpu_time=30, memory=2**32).apply(process.pid)
+
+        cpu = resource.prlimit(process.pid, resource.RLIMIT_CPU)
+        memory = resource.prlimit(process.pid, resource.RLIMIT_AS)
+        process.communicate(b"\n")
+
+    assert cpu == (30, 30)
+    assert memory == (2**32, 2**32)
@@ -0,0 +1,185 @@
+"""Unit tests for in-process linter adapters in `graylint.linter`."""
+
+# pylint: disable=use-dict-literal
+
+from __future__ import annotations
+
+import logging
+import os
+import shutil
+import sys
+from importlib.util import find_spec
+from pathlib import Path
+from subprocess import PIPE, run  # nosec
+from typing import TYPE_CHECKING
+from unittest.mock import patch
+
+import pytest
+
+from graylint import linting
+from graylint.limits import LinterLimits
+from graylint.linter import workers
+from graylint.linter.base import AdapterMessage
+from graylint.linter.flake8 import Flake8Adapter
+from graylint.linter.plugin_helpers import get_linter_adapter
+from graylint.linter.pycodestyle import PycodestyleAdapter
+from graylint.linter.pylint import PylintAdapter
+from graylint.linter.workers import run_adapter, shutdown_workers
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+SOURCE = "import os\nx=1\ndef f( a ):\n    return a\n"
+
+
+@pytest.fixture
+def linter_workers() -> Iterator[None]:
+    """Stop linter worker processes started by a test."""
+    yield
+    shutdown_workers()
+
+
+@pytest.fixture
+def source_tree(tmp_path):
+    """Create a tree with Python files to lint."""
+    (tmp_path / "a.py").write_text(SOURCE)
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "sub" / "b.py").write_text("y  = 2\n")
+    (tmp_path / "sub" / "c.txt").write_text("y  = 2\n")
+    return tmp_path
+
+
+@pytest.mark.kwparametrize(
+    dict(name="pylint", expect=PylintAdapter),
+    dict(name="flake8", expect=Flake8Adapter),
+    dict(name="mypy", expect=None),
+    dict(name="/usr/bin/pylint", expect=None),
+)
+def test_get_linter_adapter(name, expect):
+    """Adapters are found by the linter command name."""
+    if expect and not find_spec(name):
+        pytest.skip(f"{name} isn't installed")
+
+    result = get_linter_adapter(name)
+
+    if expect:
+        assert isinstance(result, expect)
+    else:
+        assert result is None
+
+
+def test_get_linter_adapter_other_environment(tmp_path):
+    """No adapter is used if the linter command is from another environment."""
+    get_linter_adapter.cache_clear()
+    try:
+        with patch.object(shutil, "which", return_value=str(tmp_path / "pylint")):
+            result = get_linter_adapter("pylint")
+    finally:
+        get_linter_adapter.cache_clear()
+
+    assert result is None
+
+
+@pytest.mark.usefixtures("linter_workers")
+@pytest.mark.kwparametrize(
+    dict(cmdline=["pylint"]),
+    dict(cmdline=["pylint", "--disable=invalid-name"]),
+    dict(cmdline=["flake8"]),
+    dict(cmdline=["flake8", "--select=E2"]),
+    dict(cmdline=["pycodestyle"]),
+    dict(cmdline=["pycodestyle", "--ignore=E225"]),
+)
+def test_run_linter_in_process(source_tree, cmdline):
+    """Linters run in-process give the same messages as linter subprocesses."""
+    if not get_linter_adapter(cmdline[0]):
+        pytest.skip(f"{cmdline[0]} isn't installed")
+    env = dict(os.environ)
+
+    result = linting.run_linter(cmdline, source_tree, {Path("a.py"), Path("sub")}, env)
+
+    with patch.object(linting, "get_linter_adapter", return_value=None):
+        expect = linting.run_linter(
+            cmdline, source_tree, {Path("a.py"), Path("sub")}, env
+        )
+    assert result
+    assert result == expect
+
+
+@pytest.mark.kwparametrize(
+    dict(args=[]),
+    dict(args=["--ignore=E225"]),
+    dict(args=["--max-line-length", "10"]),
+    dict(args=["--exclude", "a.py"]),
+)
+def test_pycodestyle_adapter_options(source_tree, monkeypatch, args):
+    """Options given to the pycodestyle adapter aren't linted as files."""
+    if not find_spec("pycodestyle"):
+        pytest.skip("pycodestyle isn't installed")
+    monkeypatch.chdir(source_tree)
+    expect = run(  # noqa: S603  # nosec
+        [sys.executable, "-m", "pycodestyle", *args, "a.py", "sub"],
+        stdout=PIPE,
+        encoding="utf-8",
+        check=False,
+    ).stdout.splitlines()
+
+    result = PycodestyleAdapter().run(args, ["a.py", "sub"])
+
+    assert sorted(
+        f"{message.path}:{message.line}:{message.column}: {message.description}"
+        for message in result
+    ) == sorted(expect)
+
+
+@pytest.mark.usefixtures("linter_workers")
+def test_run_adapter_reuses_workers(source_tree):
+    """The same worker processes are used for all runs, with their own environment."""
+    if not get_linter_adapter("pycodestyle"):
+        pytest.skip("pycodestyle isn't installed")
+    env = {**os.environ, "GRAYLINT_REV_COMMIT": "WORKTREE"}
+
+    first = run_adapter("pycodestyle", [], source_tree, ["a.py"], env=env)
+    pool = workers._pools[workers.get_worker_count()]  # pylint: disable=W0212
+    second = run_adapter(
+        "pycodestyle", [], source_tree, ["a.py", "sub/b.py"], env=env, shardable=True
+    )
+
+    assert workers._pools == {workers.get_worker_count(): pool}  # pylint: disable=W0212
+    assert first == second[:-1]
+    assert second[-1] == AdapterMessage(
+        "sub/b.py", 1, 2, "E221 multiple spaces before operator"
+    )
+    shutdown_workers()
+    assert not workers._pools  # pylint: disable=protected-access
+
+
+@pytest.mark.usefixtures("linter_workers")
+def test_run_linter_falls_back_to_subprocess(source_tree, caplog):
+    """A linter failing in-process, e.g. on an invalid option, runs as a subprocess."""
+    if not get_linter_adapter("pylint"):
+        pytest.skip("Pylint isn't installed")
+    caplog.set_level(logging.WARNING)
+
+    with patch.object(linting, "_check_linter_output") as check_linter_output:
+        linting.run_linter(["pylint", "--bogus"], source_tree, {Path("a.py")}, {})
+
+    assert "pylint exited with 32 when run in-process" in caplog.text
+    check_linter_output.assert_called_once()
+
+
+@pytest.mark.kwparametrize(
+    dict(limits=None, expect_subprocess=False),
+    dict(limits=LinterLimits(), expect_subprocess=False),
+    dict(limits=LinterLimits(timeout=60), expect_subprocess=True),
+)
+def test_run_linter_limits(source_tree, limits, expect_subprocess):
+    """Linters with time or resource limits are always run as subprocesses."""
+    with (
+        patch.object(linting, "get_linter_adapter", return_value=PylintAdapter()),
+        patch.object(linting, "run_adapter", return_value=[]) as adapter,
+        patch.object(linting, "_check_linter_output") as subprocess,
+    ):
+        linting.run_linter(["pylint"], source_tree, {Path("a.py")}, {}, limits=limits)
+
+    assert subprocess.called == expect_subprocess
+    assert adapter.called != expect_subprocess
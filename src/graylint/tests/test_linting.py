@@ -6,6 +6,9 @@
 from __future__ import annotations
 
 import os
+import sys
+import time
+from io import StringIO
 from pathlib import Path
 from subprocess import PIPE, Popen  # nosec
 from textwrap import dedent
@@ -15,12 +18,12 @@ from unittest.mock import patch
 
 import pytest
 
-from darkgraylib.git import WORKTREE, RevisionRange
+from darkgraylib.git import RevisionRange, git_check_output_lines, git_rev_parse
 from darkgraylib.testtools.git_repo_plugin import GitRepoFixture
-from darkgraylib.testtools.helpers import raises_if_exception
 from darkgraylib.utils import WINDOWS
 from graylint import linting
-from graylint.command_line import OutputSpec, shlex_split
+from graylint.command_line import LinterOutputSpec, OutputSpec, shlex_split
+from graylint.limits import LinterLimitError, LinterLimits
 from graylint.linting import (
     DiffLineMapping,
     LinterMessage,
@@ -33,6 +36,7 @@ if TYPE_CHECKING:
 
 SKIP_ON_WINDOWS = [pytest.mark.skip] if WINDOWS else []
 SKIP_ON_UNIX = [] if WINDOWS else [pytest.mark.skip]
+SKIP_UNLESS_LINUX = [] if sys.platform == "linux" else [pytest.mark.skip]
 
 
 @pytest.mark.kwparametrize(
@@ -172,16 +176,6 @@ def test_parse_linter_line(parse_linter_line_repo, monkeypatch, line, expect):
     assert result == (MessageLocation(*expect[:3]), LinterMessage("linter", expect[3]))
 
 
-@pytest.mark.kwparametrize(
-    dict(rev2="master", expect=NotImplementedError),
-    dict(rev2=WORKTREE, expect=None),
-)
-def test_require_rev2_worktree(rev2, expect):
-    """``_require_rev2_worktree`` raises an exception if rev2 is not ``WORKTREE``"""
-    with raises_if_exception(expect):
-        linting._require_rev2_worktree(rev2)
-
-
 @pytest.mark.kwparametrize(
     dict(cmdline="echo", expect=["first.py the  2nd.py\n"]),
     dict(cmdline="echo words before", expect=["words before first.py the  2nd.py\n"]),
@@ -352,18 +346,49 @@ def test_run_linters(
     assert logs == repo.expand_root(expect_log)
 
 
-def test_run_linters_non_worktree():
-    """``run_linters()`` doesn't support linting commits, only the worktree"""
-    with pytest.raises(NotImplementedError):
-        linting.run_linters(
-            [["dummy-linter"]],
-            Path("/dummy"),
-            {Path("dummy.py")},
-            RevisionRange.parse_with_common_ancestor(
-                "..HEAD", Path("dummy cwd"), stdin_mode=False
-            ),
-            [OutputSpec("gnu")],
-        )
+LINE_PRINTER_CMD = [
+    "python",
+    "-c",
+    dedent(
+        """
+        import sys
+        for path in sys.argv[1:]:
+            with open(path) as f:
+                for linenum, line in enumerate(f, 1):
+                    print(f"{path}:{linenum}: {line.strip()}")
+        """
+    ),
+]
+
+
+def test_run_linters_commit_range(git_repo, capsys):
+    """``run_linters()`` lints two commits without touching the working tree"""
+    git_repo.add({"a.py": "1\n2\n3\n"}, commit="Initial commit")
+    first = git_repo.get_hash()
+    git_repo.add({"a.py": "1\nchanged\n3\n"}, commit="Change line 2")
+    second = git_repo.get_hash()
+    git_repo.root.joinpath("a.py").write_text("uncommitted\n")
+
+    result = linting.run_linters(
+        [LINE_PRINTER_CMD],
+        git_repo.root,
+        {Path("a.py")},
+        RevisionRange(first, second),
+        [OutputSpec("gnu")],
+    )
+
+    assert result == 1
+    assert capsys.readouterr().out.splitlines() == [
+        "",
+        "a.py:2: changed [python]",
+    ]
+    assert git_repo.root.joinpath("a.py").read_text() == "uncommitted\n"
+    worktrees = git_check_output_lines(["worktree", "list"], git_repo.root)
+    # Besides the main worktree, only the stable ``baseline`` and ``rev2`` worktrees
+    assert [Path(line.split()[0]).parent.name for line in worktrees[1:]] == [
+        "baseline",
+        "rev2",
+    ]
 
 
 @pytest.fixture(scope="module")
@@ -467,6 +492,167 @@ def test_run_linters_line_separation(simple_test_repo, make_temp_copy, capsys):
     )
 
 
+def test_read_linter_output(simple_test_repo, tmp_path, monkeypatch):
+    """Saved linter output is read from a file and parsed like linter output."""
+    monkeypatch.chdir(simple_test_repo.root)
+    output_path = tmp_path / "mypy.txt"
+    output_path.write_text(
+        "__init__.py:1: first\nnot a message\n__init__.py:4:2: second\n"
+    )
+
+    result = linting.read_linter_output("mypy", output_path, simple_test_repo.root)
+
+    assert result == {
+        MessageLocation(Path("__init__.py"), 1): LinterMessage("mypy", "first"),
+        MessageLocation(Path("__init__.py"), 4, 2): LinterMessage("mypy", "second"),
+    }
+
+
+def test_read_linter_output_stdin(simple_test_repo, monkeypatch):
+    """Saved linter output is read from standard input given ``-`` as the path."""
+    monkeypatch.chdir(simple_test_repo.root)
+    monkeypatch.setattr("sys.stdin", StringIO("__init__.py:1: from stdin\n"))
+
+    result = linting.read_linter_output("mypy", Path("-"), simple_test_repo.root)
+
+    assert result == {
+        MessageLocation(Path("__init__.py"), 1): LinterMessage("mypy", "from stdin")
+    }
+
+
+@pytest.mark.kwparametrize(
+    dict(
+        baseline_output=None,
+        expect=[
+            "",
+            "__init__.py:1: on a modified line [mypy]",
+            "",
+            "__init__.py:4: on an unmodified line [mypy]",
+        ],
+    ),
+    dict(
+        baseline_output="__init__.py:1: on a modified line\n",
+        expect=[
+            "",
+            "__init__.py:1: on a modified line [mypy]",
+            "",
+            "__init__.py:4: on an unmodified line [mypy]",
+        ],
+    ),
+    dict(
+        baseline_output="__init__.py:4: on an unmodified line\n",
+        expect=["", "__init__.py:1: on a modified line [mypy]"],
+    ),
+)
+def test_run_linters_linter_outputs(
+    simple_test_repo, tmp_path, monkeypatch, capsys, baseline_output, expect
+):
+    """Saved linter outputs are filtered against baseline outputs without linting."""
+    monkeypatch.chdir(simple_test_repo.root)
+    (tmp_path / "mypy.txt").write_text(
+        "__init__.py:1: on a modified line\n__init__.py:4: on an unmodified line\n"
+    )
+    baseline_linter_outputs = []
+    if baseline_output is not None:
+        (tmp_path / "mypy-baseline.txt").write_text(baseline_output)
+        baseline_linter_outputs.append(
+            LinterOutputSpec("mypy", tmp_path / "mypy-baseline.txt")
+        )
+
+    with patch.object(linting, "stable_worktree") as clone:
+        result = linting.run_linters(
+            [],
+            simple_test_repo.root,
+            {Path("__init__.py")},
+            RevisionRange("HEAD", ":WORKTREE:"),
+            [OutputSpec("gnu")],
+            linter_outputs=[LinterOutputSpec("mypy", tmp_path / "mypy.txt")],
+            baseline_linter_outputs=baseline_linter_outputs,
+        )
+
+    clone.assert_not_called()
+    assert result == len(expect) // 2
+    assert capsys.readouterr().out.splitlines() == expect
+
+
+SLOW_LINTER_CMD = [
+    "python",
+    "-c",
+    dedent(
+        """
+        import sys, time
+        print("__init__.py:4: unchanged message on an unmodified line", flush=True)
+        print("__init__.py:1: first new message", flush=True)
+        print("__init__.py:2: second new message", flush=True)
+        time.sleep(60)
+        print("__init__.py:3: third new message", flush=True)
+        """
+    ),
+]
+
+
+@pytest.mark.kwparametrize(
+    dict(
+        max_messages=1,
+        expect=["", "__init__.py:1: first new message [python]"],
+    ),
+    dict(
+        max_messages=2,
+        expect=[
+            "",
+            "__init__.py:1: first new message [python]",
+            "__init__.py:2: second new message [python]",
+        ],
+    ),
+)
+def test_run_linters_max_messages(
+    simple_test_repo, make_temp_copy, monkeypatch, capsys, max_messages, expect
+):
+    """Linting stops and linters are terminated at the maximum number of messages."""
+    with make_temp_copy(simple_test_repo.root) as root:
+        monkeypatch.chdir(root)
+        never_run_marker = root / "never-run"
+        start = time.perf_counter()
+
+        result = linting.run_linters(
+            [SLOW_LINTER_CMD, ["touch", str(never_run_marker)]],
+            root,
+            {Path("__init__.py")},
+            RevisionRange("HEAD", ":WORKTREE:"),
+            [OutputSpec("gnu")],
+            # the baseline has the same message on the unmodified line 4
+            get_baseline=lambda *_: {
+                MessageLocation(Path("__init__.py"), 4): [
+                    LinterMessage("python", "unchanged message on an unmodified line")
+                ]
+            },
+            max_messages=max_messages,
+        )
+
+        assert time.perf_counter() - start < 30
+        assert not never_run_marker.exists()
+    assert result == max_messages
+    assert capsys.readouterr().out.splitlines() == expect
+
+
+def test_run_linters_max_messages_not_reached(simple_test_repo, capsys):
+    """All new messages are shown if there are fewer than the maximum."""
+    result = linting.run_linters(
+        [["echo", "__init__.py:1: new message"]],
+        simple_test_repo.root,
+        {Path("__init__.py")},
+        RevisionRange("HEAD", ":WORKTREE:"),
+        [OutputSpec("gnu")],
+        max_messages=5,
+    )
+
+    assert result == 1
+    assert capsys.readouterr().out.splitlines() == [
+        "",
+        "__init__.py:1: new message __init__.py [echo]",
+    ]
+
+
 def test_run_linters_stdin():
     """`linting.run_linters` raises a `NotImplementeError` on ``--stdin-filename``"""
     with pytest.raises(
@@ -677,3 +863,63 @@ def test_transform_linter_command(cmdline, expect):
     else:
         result = linting._transform_linter_command(cmdline)
         assert result == expect
+
+
+@pytest.mark.kwparametrize(
+    dict(
+        action="time.sleep(60)",
+        linter_limits={"": LinterLimits(timeout=0.5)},
+        expect="Linter python timed out after 0.5 seconds when linting revision ",
+    ),
+    dict(
+        action="while True: pass",
+        linter_limits={"python": LinterLimits(cpu_time=1)},
+        expect="Linter python exceeded the CPU time limit of 1 seconds when linting",
+        marks=SKIP_UNLESS_LINUX,
+    ),
+)
+@pytest.mark.parametrize("revision", ["baseline", "WORKTREE"])
+def test_run_linters_limits(simple_test_repo, action, linter_limits, expect, revision):
+    """A linter exceeding its limits in either revision stops linting with an error."""
+    head = git_rev_parse("HEAD", simple_test_repo.root)[:7]
+    rev_commit = "WORKTREE" if revision == "WORKTREE" else head
+    script = dedent(
+        f"""
+        import os, time
+        if os.environ["GRAYLINT_REV_COMMIT"] == "{rev_commit}":
+            {action}
+        """
+    )
+    start = time.perf_counter()
+
+    with pytest.raises(LinterLimitError) as exc_info:
+        linting.run_linters(
+            [["python", "-c", script]],
+            simple_test_repo.root,
+            {Path("__init__.py")},
+            RevisionRange("HEAD", ":WORKTREE:"),
+            [OutputSpec("gnu")],
+            linter_limits=linter_limits,
+        )
+
+    assert time.perf_counter() - start < 30
+    assert str(exc_info.value).startswith(expect)
+    assert str(exc_info.value).endswith(rev_commit)
+
+
+def test_run_linters_within_limits(simple_test_repo, capsys):
+    """Linters finishing within their limits work normally."""
+    result = linting.run_linters(
+        [["echo", "__init__.py:1: new message"]],
+        simple_test_repo.root,
+        {Path("__init__.py")},
+        RevisionRange("HEAD", ":WORKTREE:"),
+        [OutputSpec("gnu")],
+        linter_limits={"echo": LinterLimits(timeout=30, cpu_time=30, memory=2**32)},
+    )
+
+    assert result == 1
+    assert capsys.readouterr().out.splitlines() == [
+        "",
+        "__init__.py:1: new message __init__.py [echo]",
+    ]
@@ -0,0 +1,212 @@
+"""Unit tests for `graylint.lsp`, using a tiny fake language server."""
+
+# pylint: disable=protected-access,use-dict-literal
+
+from __future__ import annotations
+
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from textwrap import dedent
+from typing import TYPE_CHECKING
+from unittest.mock import patch
+
+import pytest
+
+from darkgraylib.git import RevisionRange
+from graylint import linting, lsp
+from graylint.command_line import OutputSpec
+from graylint.linting import LinterMessage, MessageLocation
+from graylint.lsp import (
+    LanguageServer,
+    LanguageServerError,
+    get_language_server,
+    shutdown_language_servers,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+# A language server which reports each ``ERROR`` in a Python file as a diagnostic
+FAKE_SERVER = dedent(
+    """
+    import json, sys
+
+    def read():
+        length = None
+        while True:
+            line = sys.stdin.buffer.readline()
+            if not line:
+                sys.exit(0)
+            if line == b"\\r\\n":
+                break
+            length = int(line.split(b":")[1])
+        return json.loads(sys.stdin.buffer.read(length))
+
+    def send(message):
+        body = json.dumps({"jsonrpc": "2.0", **message}).encode()
+        sys.stdout.buffer.write(b"Content-Length: %d\\r\\n\\r\\n" % len(body) + body)
+        sys.stdout.buffer.flush()
+
+    def publish(document, text):
+        diagnostics = [
+            {
+                "range": {
+                    "start": {"line": linenum, "character": line.index("ERROR")},
+                    "end": {"line": linenum, "character": line.index("ERROR") + 5},
+                },
+                "code": "E1",
+                "source": "fake",
+                "message": f"ERROR found in version {document['version']}",
+            }
+            for linenum, line in enumerate(text.splitlines())
+            if "ERROR" in line
+        ]
+        params = {"uri": document["uri"], "version": document["version"]}
+        send(
+            {
+                "method": "textDocument/publishDiagnostics",
+                "params": {**params, "diagnostics": diagnostics},
+            }
+        )
+
+    while True:
+        message = read()
+        method = message.get("method")
+        params = message.get("params")
+        if method == "initialize":
+            send({"id": message["id"], "result": {"capabilities": {}}})
+        elif method == "initialized":
+            send(
+                {
+                    "id": "config",
+                    "method": "workspace/configuration",
+                    "params": {"items": [{"section": "fake"}]},
+                }
+            )
+        elif method == "textDocument/didOpen":
+            publish(params["textDocument"], params["textDocument"]["text"])
+        elif method == "textDocument/didChange":
+            publish(params["textDocument"], params["contentChanges"][0]["text"])
+        elif method == "shutdown":
+            send({"id": message["id"], "result": None})
+        elif method == "exit":
+            sys.exit(0)
+    """
+)
+FAKE_SERVER_CMD = [sys.executable, "-c", FAKE_SERVER]
+
+
+@pytest.fixture
+def language_servers() -> Iterator[None]:
+    """Shut down language servers started by a test."""
+    yield
+    shutdown_language_servers()
+
+
+@pytest.mark.usefixtures("language_servers")
+def test_diagnose(tmp_path):
+    """Diagnostics are collected, and changed files are sent to the server again."""
+    (tmp_path / "a.py").write_text("ok\nx = ERROR\n")
+    (tmp_path / "b.py").write_text("ERROR\n")
+    server = get_language_server(FAKE_SERVER_CMD, tmp_path)
+
+    first = server.diagnose([Path("a.py"), Path("b.py")])
+    (tmp_path / "b.py").write_text("ok\n")
+    second = server.diagnose([Path("a.py"), Path("b.py")])
+
+    assert get_language_server(FAKE_SERVER_CMD, tmp_path) is server
+    assert [d["message"] for d in first[Path("a.py")]] == ["ERROR found in version 1"]
+    assert first[Path("a.py")][0]["range"]["start"] == {"line": 1, "character": 4}
+    assert second[Path("a.py")] == first[Path("a.py")]
+    assert second[Path("b.py")] == []
+
+
+def test_server_exits(tmp_path):
+    """An error is raised if the server exits instead of responding."""
+    with pytest.raises(LanguageServerError, match="No response to initialize"):
+        LanguageServer([sys.executable, "-c", "pass"], tmp_path)
+
+
+@pytest.mark.usefixtures("language_servers")
+def test_run_linter(tmp_path):
+    """``lsp`` command lines are run through a language server kept for the tree."""
+    (tmp_path / "pkg").mkdir()
+    (tmp_path / "pkg" / "a.py").write_text("ERROR\n")
+    (tmp_path / "pkg" / "a.txt").write_text("ERROR\n")
+    (tmp_path / ".hidden").mkdir()
+    (tmp_path / ".hidden" / "b.py").write_text("ERROR\n")
+
+    result = linting.run_linter(["lsp", *FAKE_SERVER_CMD], tmp_path, {Path()}, env={})
+
+    assert result == {
+        MessageLocation(Path("pkg/a.py"), 1, 1): LinterMessage(
+            "fake", "E1 ERROR found in version 1"
+        )
+    }
+
+
+@pytest.mark.usefixtures("language_servers")
+def test_run_linters(git_repo, capsys):
+    """Only diagnostics not present in the baseline are reported."""
+    git_repo.add({"a.py": "ERROR\nok\n"}, commit="Initial commit")
+    git_repo.root.joinpath("a.py").write_text("ERROR\nok\nx = ERROR\n")
+
+    result = linting.run_linters(
+        [["lsp", *FAKE_SERVER_CMD]],
+        git_repo.root,
+        {Path("a.py")},
+        RevisionRange("HEAD", ":WORKTREE:"),
+        [OutputSpec("gnu")],
+    )
+
+    assert result == 1
+    assert capsys.readouterr().out.splitlines() == [
+        "",
+        "a.py:3:5: E1 ERROR found in version 1 [fake]",
+    ]
+
+
+@pytest.mark.usefixtures("language_servers")
+def test_get_language_server_env(tmp_path):
+    """The language server is started with the environment given for the tree."""
+    cmdline = [
+        sys.executable,
+        "-c",
+        "import os\nassert os.environ['GRAYLINT_REV_COMMIT'] == 'abc1234'\n"
+        + FAKE_SERVER,
+    ]
+    env = {**os.environ, "GRAYLINT_REV_COMMIT": "abc1234"}
+
+    server = get_language_server(cmdline, tmp_path, env=env)
+
+    assert server.diagnose([]) == {}
+
+
+def test_get_language_server_parallel(tmp_path):
+    """Language servers for different trees are started in parallel."""
+    barrier = threading.Barrier(2, timeout=5)
+
+    class SlowServer:  # pylint: disable=too-few-public-methods
+        """A server which initializes only once both servers are being started."""
+
+        def __init__(self, *_args: object) -> None:
+            barrier.wait()
+
+    with (
+        patch.object(lsp, "LanguageServer", SlowServer),
+        ThreadPoolExecutor(2) as pool,
+    ):
+        futures = [
+            pool.submit(get_language_server, ["server"], tmp_path / name)
+            for name in ["baseline", "rev2"]
+        ]
+        servers = [future.result() for future in futures]
+        same = get_language_server(["server"], tmp_path / "rev2")
+    lsp._servers.clear()
+    lsp._server_locks.clear()
+
+    assert servers[0] is not servers[1]
+    assert same is servers[1]
@@ -3,7 +3,10 @@
 # pylint: disable=no-member,redefined-outer-name
 
 import os
+import sys
 from contextlib import nullcontext
+from subprocess import run  # nosec
+from textwrap import dedent
 from unittest.mock import Mock, patch
 
 import pytest
@@ -19,7 +22,7 @@ from graylint.__main__ import main, main_with_error_handling
 )
 def test_main_retval(numfails, expect_retval):
     """main() return value is correct based on linter results."""
-    with patch("graylint.__main__.run_linters", Mock(return_value=numfails)):
+    with patch("graylint.linting.run_linters", Mock(return_value=numfails)):
         # end of test setup
 
         retval = main(["a.py"])
@@ -71,3 +74,41 @@ def test_main(
 
         assert retval == expect_retval
     assert capsys.readouterr().out == expect_output
+
+
+VERSION_STARTUP_SCRIPT = dedent(
+    """
+    import sys
+    from time import perf_counter
+
+    start = perf_counter()
+    from graylint.__main__ import main_with_error_handling
+
+    try:
+        main_with_error_handling(["--version"])
+    except SystemExit:
+        pass
+    print(perf_counter() - start, file=sys.stderr)
+    print(" ".join(sorted(sys.modules)), file=sys.stderr)
+    """
+)
+
+
+def test_version_startup_time():
+    """``graylint --version`` doesn't import the linting engine and starts quickly."""
+    result = run(  # noqa: S603  # nosec
+        [sys.executable, "-c", VERSION_STARTUP_SCRIPT],
+        capture_output=True,
+        encoding="utf-8",
+        check=True,
+    )
+
+    elapsed_str, modules_str = result.stderr.splitlines()[-2:]
+    modules = set(modules_str.split())
+    assert "graylint.linting" not in modules
+    assert "darkgraylib.highlighting" not in modules
+    assert "darkgraylib.git" not in modules
+    assert "pygments" not in modules
+    # A generous budget to avoid flakiness on slow CI runners. Importing the linting
+    # engine and syntax highlighting up front used to take several times longer.
+    assert float(elapsed_str) < 1.0
@@ -0,0 +1,74 @@
+"""Unit tests for `graylint.multibaseline`."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from textwrap import dedent
+
+import pytest
+
+from darkgraylib.git import WORKTREE, RevisionRange
+from graylint.command_line import OutputSpec
+from graylint.multibaseline import run_linters_for_baselines
+
+LINTER_SCRIPT = dedent(
+    """
+    import os, sys
+    with open({log!r}, "a") as log:
+        print(os.environ["GRAYLINT_REV_COMMIT"], file=log)
+    for path in sys.argv[1:]:
+        with open(path) as f:
+            for linenum, line in enumerate(f, 1):
+                if "bad" in line:
+                    print(f"{{path}}:{{linenum}}: {{line.strip()}}")
+    """
+)
+
+
+def test_run_linters_for_baselines(git_repo, tmp_path, capsys):
+    """The working tree is linted once and compared to each baseline separately."""
+    git_repo.add({"a.py": "bad 1\nok\n"}, commit="Initial commit")
+    git_repo.create_tag("old")
+    git_repo.add({"a.py": "bad 1\nbad 2\n"}, commit="Second commit")
+    git_repo.root.joinpath("a.py").write_text("bad 1\nbad 2\nbad 3\n")
+    log = tmp_path / "linter.log"
+
+    result = run_linters_for_baselines(
+        [["python", "-c", LINTER_SCRIPT.format(log=str(log))]],
+        git_repo.root,
+        {Path("a.py")},
+        {
+            "HEAD": RevisionRange("HEAD", WORKTREE),
+            "old": RevisionRange("old", WORKTREE),
+        },
+        [OutputSpec("gnu")],
+    )
+
+    assert result == 3  # noqa: PLR2004
+    assert capsys.readouterr().out.splitlines() == [
+        "",
+        "a.py:3: bad 3 [python@HEAD]",
+        "",
+        "a.py:2: bad 2 [python@old]",
+        "a.py:3: bad 3 [python@old]",
+    ]
+    assert sorted(log.read_text().splitlines()) == sorted(
+        [git_repo.get_hash()[:7], git_repo.get_hash("old")[:7], "WORKTREE"]
+    )
+
+
+def test_run_linters_for_baselines_different_rev2(git_repo):
+    """All baselines must be compared to the same revision."""
+    git_repo.add({"a.py": "1\n"}, commit="Initial commit")
+
+    with pytest.raises(ValueError, match="must be compared to the same revision"):
+        run_linters_for_baselines(
+            [["echo"]],
+            git_repo.root,
+            {Path("a.py")},
+            {
+                "HEAD": RevisionRange("HEAD", WORKTREE),
+                "HEAD..HEAD": RevisionRange("HEAD", "HEAD"),
+            },
+            [OutputSpec("gnu")],
+        )
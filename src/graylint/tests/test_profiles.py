@@ -0,0 +1,139 @@
+"""Unit tests for `graylint.profiles`."""
+
+# pylint: disable=protected-access,use-dict-literal
+
+from __future__ import annotations
+
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import pytest
+
+from darkgraylib.config import ConfigurationError
+from darkgraylib.git import WORKTREE, RevisionRange
+from graylint import linting
+from graylint.command_line import OutputSpec
+from graylint.profiles import (
+    LinterProfile,
+    get_cache_env_vars,
+    get_linter_profile,
+    load_linter_profiles,
+)
+
+
+@pytest.mark.kwparametrize(
+    dict(cmdline=["ruff"], expect_per_file=True, expect_subcommand="check"),
+    dict(cmdline=["/usr/bin/flake8", "--max-line-length=88"], expect_per_file=True),
+    dict(cmdline=["mypy", "--strict"], expect_per_file=False),
+    dict(cmdline=["mylint"], expect_per_file=False),
+    dict(
+        cmdline=["ruff"],
+        config={"ruff": {"per-file": False}},
+        expect_per_file=False,
+        expect_subcommand="check",
+    ),
+    dict(
+        cmdline=["mylint"],
+        config={"mylint": {"per_file": True, "subcommand": "lint"}},
+        expect_per_file=True,
+        expect_subcommand="lint",
+    ),
+    config={},
+    expect_subcommand=None,
+)
+def test_get_linter_profile(cmdline, config, expect_per_file, expect_subcommand):
+    """Configured profile fields override built-in ones, and others are kept."""
+    load_linter_profiles(config)
+
+    result = get_linter_profile(cmdline)
+
+    assert result.per_file == expect_per_file
+    assert result.subcommand == expect_subcommand
+
+
+@pytest.mark.kwparametrize(
+    dict(options={"bogus": True}),
+    dict(options={"per-file": "yes"}),
+    dict(options={"config-files": "setup.cfg"}),
+    dict(options={"jobs-option": ["--jobs"]}),
+)
+def test_load_linter_profiles_invalid(options):
+    """Unknown profile options and values of the wrong type are rejected."""
+    with pytest.raises(ConfigurationError, match="Invalid linter profile option"):
+        load_linter_profiles({"mylint": options})
+
+
+def test_load_linter_profiles_replaces_earlier():
+    """Profiles configured earlier are dropped when profiles are loaded again."""
+    load_linter_profiles({"mylint": {"config-files": ["mylint.toml"]}})
+    load_linter_profiles({"mypy": {"jobs-option": "--jobs"}})
+
+    assert get_linter_profile(["mylint"]) == LinterProfile()
+    assert get_linter_profile(["mypy"]).jobs_option == "--jobs"
+
+
+def test_get_cache_env_vars():
+    """Cache environment variables of built-in and configured profiles are returned."""
+    load_linter_profiles({"mylint": {"cache-env-var": "MYLINT_CACHE"}})
+
+    result = get_cache_env_vars()
+
+    assert result == {
+        "MYLINT_CACHE": "mylint",
+        "MYPY_CACHE_DIR": "mypy",
+        "PYLINTHOME": "pylint",
+        "RUFF_CACHE_DIR": "ruff",
+    }
+
+
+def test_transform_linter_command_profile():
+    """The subcommand and output options of a configured profile are added."""
+    load_linter_profiles(
+        {"mylint": {"subcommand": "check", "output-options": ["--format=text", "-q"]}}
+    )
+
+    result = linting._transform_linter_command(["mylint", "-q"])
+
+    assert result == ["mylint", "check", "-q", "--format=text"]
+
+
+@pytest.mark.kwparametrize(
+    dict(per_file=True, expect={"a.py"}),
+    dict(per_file=False, expect={"."}),
+    dict(per_file=True, changed_config=True, expect={"."}),
+    dict(per_file=True, get_baseline=Mock(return_value={}), expect={"."}),
+    changed_config=False,
+    get_baseline=None,
+)
+def test_run_linters_per_file_scope(
+    git_repo, per_file, changed_config, get_baseline, expect
+):
+    """Only changed files are linted if all linters are per-file linters.
+
+    The scope isn't narrowed for a saved, loaded or cached baseline, so the baseline
+    covers all files to lint.
+
+    """
+    git_repo.add({"a.py": "", "b.py": "", "mylint.cfg": ""}, commit="Initial commit")
+    git_repo.root.joinpath("a.py").write_text("x = 1\n")
+    if changed_config:
+        git_repo.root.joinpath("mylint.cfg").write_text("[mylint]\n")
+    load_linter_profiles(
+        {"mylint": {"per-file": per_file, "config-files": ["mylint.cfg"]}}
+    )
+
+    with patch.object(linting, "run_linter", return_value={}) as run_linter:
+        linting.run_linters(
+            [["mylint"]],
+            git_repo.root,
+            {Path()},
+            RevisionRange("HEAD", WORKTREE),
+            [OutputSpec("gnu")],
+            get_baseline=get_baseline,
+        )
+
+    assert [
+        {str(path) for path in call.args[2]} for call in run_linter.call_args_list
+    ] == [expect] * (1 if get_baseline else 2)
+    if get_baseline:
+        assert {str(path) for path in get_baseline.call_args.args[2]} == expect
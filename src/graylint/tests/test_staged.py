@@ -0,0 +1,138 @@
+"""Unit tests for `graylint.staged`."""
+
+# pylint: disable=protected-access,use-dict-literal
+
+from __future__ import annotations
+
+from argparse import ArgumentError
+from pathlib import Path
+from textwrap import dedent
+
+import pytest
+
+from darkgraylib.git import WORKTREE, RevisionRange, git_check_output_lines
+from darkgraylib.testtools.helpers import raises_if_exception
+from graylint import linting
+from graylint.command_line import OutputSpec
+from graylint.staged import (
+    INDEX,
+    git_checkout_index,
+    git_get_content_in_index,
+    make_staged_revrange,
+)
+
+LINTER_SCRIPT = dedent(
+    """
+    import sys
+    for path in sys.argv[1:]:
+        with open(path) as f:
+            for linenum, line in enumerate(f, 1):
+                if "bad" in line:
+                    print(f"{path}:{linenum}: {line.strip()}")
+    """
+)
+
+
+@pytest.fixture
+def staged_repo(git_repo):
+    """Git repository with committed, staged and unstaged changes."""
+    git_repo.add(
+        {"a.py": "bad 1\nok\n", "b.py": "b\n", "sub/setup.cfg": "[flake8]\n"},
+        commit="Initial commit",
+    )
+    git_repo.root.joinpath("a.py").write_text("bad 1\nbad 2\nok\n")
+    git_repo._run("add", "a.py")
+    git_repo.root.joinpath("a.py").write_text("bad 1\nbad 2\nbad 3 unstaged\nok\n")
+    return git_repo
+
+
+@pytest.mark.kwparametrize(
+    dict(revrange=RevisionRange("HEAD", WORKTREE), expect=RevisionRange("HEAD", INDEX)),
+    dict(revrange=RevisionRange("main", "HEAD"), expect=ArgumentError),
+)
+def test_make_staged_revrange(revrange, expect):
+    """Only revision ranges ending in the working tree can be used in staged mode."""
+    with raises_if_exception(expect):
+        result = make_staged_revrange(revrange)
+
+        assert result == expect
+
+
+@pytest.mark.kwparametrize(
+    dict(revision=INDEX),
+    dict(revision="HEAD", expect="bad 1\nok\n"),
+    dict(
+        revision=INDEX,
+        options=dict(config_files={"setup.cfg"}),
+        expect_files=["a.py", "sub"],
+    ),
+    dict(
+        revision="HEAD",
+        options=dict(whole_tree=True),
+        expect="bad 1\nok\n",
+        expect_files=["a.py", "b.py", "sub"],
+    ),
+    options={},
+    expect="bad 1\nbad 2\nok\n",
+    expect_files=["a.py"],
+)
+def test_git_checkout_index(staged_repo, revision, options, expect, expect_files):
+    """Only requested files are written, and the index is left untouched."""
+    with git_checkout_index(
+        staged_repo.root, [Path("a.py")], revision, **options
+    ) as scratch:
+        assert sorted(path.name for path in scratch.iterdir()) == expect_files
+        assert scratch.joinpath("a.py").read_text() == expect
+        assert scratch.joinpath("sub/setup.cfg").exists() == ("sub" in expect_files)
+
+    assert not scratch.exists()
+    assert git_check_output_lines(
+        ["diff", "--cached", "--name-only"], staged_repo.root
+    ) == ["a.py"]
+    assert staged_repo.root.joinpath("a.py").read_text().count("unstaged") == 1
+
+
+@pytest.mark.kwparametrize(
+    dict(path="a.py", expect=("bad 1", "bad 2", "ok")),
+    dict(path="missing.py", expect=()),
+)
+def test_git_get_content_in_index(staged_repo, path, expect):
+    """Staged content of a file is read from the Git index."""
+    result = git_get_content_in_index(Path(path), staged_repo.root)
+
+    assert result.lines == expect
+
+
+def test_run_linters_staged(staged_repo, capsys):
+    """Only messages new in the staged version are shown, ignoring unstaged changes."""
+    result = linting.run_linters(
+        [["python", "-c", LINTER_SCRIPT]],
+        staged_repo.root,
+        {Path("a.py")},
+        RevisionRange("HEAD", INDEX),
+        [OutputSpec("gnu")],
+    )
+
+    assert result == 1
+    assert capsys.readouterr().out.splitlines() == ["", "a.py:2: bad 2 [python]"]
+
+
+def test_run_linters_staged_config_file(git_repo, capsys):
+    """Linter configuration from the index applies to staged files, too."""
+    git_repo.add(
+        {"setup.cfg": "[flake8]\nmax-line-length = 120\n", "a.py": "x = 1\n"},
+        commit="Initial commit",
+    )
+    git_repo.root.joinpath("a.py").write_text(f"x = 1\ny = '{'y' * 94}'\n")
+    git_repo._run("add", "a.py")
+
+    result = linting.run_linters(
+        [["flake8"]],
+        git_repo.root,
+        {Path("a.py")},
+        RevisionRange("HEAD", INDEX),
+        [OutputSpec("gnu")],
+    )
+
+    assert result == 0
+    assert capsys.readouterr().out == ""
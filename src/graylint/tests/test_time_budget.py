@@ -0,0 +1,210 @@
+"""Unit tests for `graylint.time_budget`."""
+
+# pylint: disable=use-dict-literal
+
+from __future__ import annotations
+
+from pathlib import Path
+from textwrap import dedent
+from unittest.mock import patch
+
+import pytest
+
+from darkgraylib.git import WORKTREE, RevisionRange
+from graylint import time_budget
+from graylint.__main__ import main
+from graylint.command_line import OutputSpec
+from graylint.cpu_budget import set_cpu_budget
+from graylint.limits import LinterLimitError, LinterLimits
+from graylint.profiles import load_linter_profiles
+from graylint.time_budget import (
+    EXIT_CODE_TIME_BUDGET_EXPIRED,
+    TimeBudget,
+    count_modified_lines,
+    prioritize_paths,
+    run_linters_within_time_budget,
+)
+
+LINTER_SCRIPT = dedent(
+    """
+    import sys, time
+    with open({log!r}, "a") as log:
+        print(" ".join(sys.argv[1:]), file=log)
+    time.sleep({sleep})
+    for path in sys.argv[1:]:
+        with open(path) as f:
+            for linenum, line in enumerate(f, 1):
+                if "bad" in line:
+                    print(f"{{path}}:{{linenum}}: {{line.strip()}}")
+    """
+)
+
+
+@pytest.fixture
+def budget_repo(git_repo):
+    """Git repository with files with different numbers of modified lines."""
+    git_repo.add(
+        {"a.py": "ok\n", "b.py": "bad\n", "c.py": "ok\n", "d.py": "ok\n"},
+        commit="Initial commit",
+    )
+    git_repo.root.joinpath("a.py").write_text("bad\n")
+    git_repo.root.joinpath("b.py").write_text("bad\nbad\nbad\n")
+    git_repo.root.joinpath("e.py").write_text("bad\nbad\nbad\nbad\n")
+    return git_repo
+
+
+def test_count_modified_lines(budget_repo):
+    """Added and deleted lines are counted, and all lines of untracked files."""
+    result = count_modified_lines(
+        budget_repo.root,
+        RevisionRange("HEAD", WORKTREE),
+        {Path("a.py"), Path("b.py"), Path("c.py"), Path("e.py")},
+    )
+
+    assert result == {Path("a.py"): 2, Path("b.py"): 2, Path("e.py"): 4}
+
+
+def test_prioritize_paths(budget_repo):
+    """Files with most modified lines come first, then unchanged files."""
+    result = prioritize_paths(
+        budget_repo.root,
+        RevisionRange("HEAD", WORKTREE),
+        {Path("a.py"), Path("b.py"), Path("c.py"), Path("d.py"), Path("e.py")},
+    )
+
+    assert result == [Path(name) for name in ["e.py", "a.py", "b.py", "c.py", "d.py"]]
+
+
+@pytest.mark.kwparametrize(
+    dict(limits={}, expect=LinterLimits(timeout=10.0)),
+    dict(
+        limits={"mypy": LinterLimits(timeout=5.0, cpu_time=3)},
+        expect=LinterLimits(timeout=5.0, cpu_time=3),
+    ),
+    dict(limits={"": LinterLimits(timeout=60.0)}, expect=LinterLimits(timeout=10.0)),
+)
+def test_time_budget_limit(limits, expect):
+    """Linters get a timeout at the deadline unless they have a shorter one."""
+    with patch.object(TimeBudget, "remaining", return_value=10.0):
+        result = TimeBudget(10.0).limit(limits, [["mypy", "src"]])
+
+    assert result == {"mypy": expect}
+
+
+@pytest.mark.kwparametrize(
+    dict(error=LinterLimitError("", "mypy", 10.0), expect=True),
+    dict(
+        error=LinterLimitError("", "mypy", 5.0),
+        limits={"mypy": LinterLimits(timeout=5.0)},
+        expect=False,
+    ),
+    dict(
+        error=LinterLimitError("", "/usr/bin/mypy", 10.0),
+        limits={"mypy": LinterLimits(timeout=60.0)},
+        expect=True,
+    ),
+    dict(error=LinterLimitError("", "mypy"), expect=False),
+    limits={},
+)
+def test_time_budget_stopped(error, limits, expect):
+    """A timeout is blamed on the budget only if the linter's own timeout is later."""
+    result = TimeBudget(10.0).stopped(error, limits)
+
+    assert result == expect
+
+
+def _run_linter_script(
+    root: Path,
+    log: Path,
+    *,
+    seconds: float,
+    sleep: int = 0,
+    linter_limits: dict[str, LinterLimits] | None = None,
+) -> tuple[int, dict[str, list[Path]]]:
+    """Run the fake per-file linter on ``root`` within a time budget."""
+    load_linter_profiles({"python": {"per-file": True}})
+    set_cpu_budget(1)
+    return run_linters_within_time_budget(
+        [["python", "-c", LINTER_SCRIPT.format(log=str(log), sleep=sleep)]],
+        root,
+        {Path()},
+        RevisionRange("HEAD", WORKTREE),
+        [OutputSpec("gnu")],
+        time_budget=seconds,
+        linter_limits=linter_limits,
+    )
+
+
+def test_run_linters_within_time_budget(budget_repo, tmp_path, capsys):
+    """Changed files are linted most modified first, in batches of growing size."""
+    log = tmp_path / "linter.log"
+
+    result = _run_linter_script(budget_repo.root, log, seconds=60.0)
+
+    assert sorted(set(log.read_text().splitlines()), key=len) == ["e.py", "a.py b.py"]
+    output = capsys.readouterr().out.splitlines()
+    assert [line.split(" [python")[0] for line in output if line] == [
+        "e.py:1: bad",
+        "e.py:2: bad",
+        "e.py:3: bad",
+        "e.py:4: bad",
+        "a.py:1: bad",
+        "b.py:2: bad",
+        "b.py:3: bad",
+    ]
+    assert result == (7, {})
+
+
+@pytest.mark.kwparametrize(
+    dict(seconds=0.0, sleep=0, expect_calls=[]),
+    dict(seconds=1.0, sleep=5, expect_calls=["e.py"]),
+)
+def test_run_linters_within_time_budget_expired(
+    budget_repo, tmp_path, seconds, sleep, expect_calls
+):
+    """Files not linted when the time budget runs out are reported as unchecked."""
+    log = tmp_path / "linter.log"
+    log.touch()
+
+    result = _run_linter_script(budget_repo.root, log, seconds=seconds, sleep=sleep)
+
+    assert log.read_text().splitlines() == expect_calls
+    assert result == (0, {"python": [Path("a.py"), Path("b.py"), Path("e.py")]})
+
+
+def test_run_linters_within_time_budget_linter_timeout(budget_repo, tmp_path):
+    """A linter exceeding its own timeout is an error, not an expired budget."""
+    with pytest.raises(LinterLimitError, match=r"timed out after 0\.5 seconds"):
+        _run_linter_script(
+            budget_repo.root,
+            tmp_path / "linter.log",
+            seconds=60.0,
+            sleep=5,
+            linter_limits={"python": LinterLimits(timeout=0.5)},
+        )
+
+
+@pytest.mark.kwparametrize(
+    dict(result=(0, {"mypy": [Path("a.py")]}), expect=EXIT_CODE_TIME_BUDGET_EXPIRED),
+    dict(result=(2, {"mypy": [Path("a.py")]}), expect=1),
+    dict(result=(2, {}), expect=1),
+    dict(result=(0, {}), expect=0),
+)
+def test_main_time_budget_expired(tmp_path, result, expect):
+    """New messages take precedence over files not checked when the budget ran out."""
+    with patch.object(
+        time_budget, "run_linters_within_time_budget", return_value=result
+    ) as run_linters:
+        retval = main(["--time-budget=5s", "-L", "mypy", str(tmp_path)])
+
+    assert run_linters.call_args.kwargs["time_budget"] == 5.0  # noqa: PLR2004
+    assert retval == expect
+
+
+def test_run_linters_within_time_budget_no_checkout(budget_repo, tmp_path):
+    """Revisions aren't checked out if the time budget has already run out."""
+    with patch.object(time_budget, "stable_worktree") as stable_worktree:
+        result = _run_linter_script(budget_repo.root, tmp_path / "log", seconds=0.0)
+
+    stable_worktree.assert_not_called()
+    assert result == (0, {"python": [Path("a.py"), Path("b.py"), Path("e.py")]})
@@ -0,0 +1,155 @@
+"""Unit tests for `graylint.workdirs`."""
+
+# pylint: disable=protected-access,use-dict-literal
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from darkgraylib.git import git_check_output_lines
+from graylint import linting
+from graylint.linting import make_linter_env
+from graylint.workdirs import (
+    BASELINE,
+    REV2,
+    get_linter_cache_env,
+    get_repo_cache_dir,
+    is_stable_worktree,
+    stable_worktree,
+)
+
+
+@pytest.mark.kwparametrize(
+    dict(environ={}, expect={"MYPY_CACHE_DIR", "RUFF_CACHE_DIR", "PYLINTHOME"}),
+    dict(environ={"MYPY_CACHE_DIR": "/mine"}, expect={"RUFF_CACHE_DIR", "PYLINTHOME"}),
+)
+def test_get_linter_cache_env(tmp_path, environ, expect):
+    """Linter cache directories are per repository and role, unless set by the user."""
+    with patch.dict(os.environ, environ):
+        for name in ["MYPY_CACHE_DIR", "RUFF_CACHE_DIR", "PYLINTHOME"]:
+            if name not in environ:
+                os.environ.pop(name, None)
+
+        result = get_linter_cache_env(tmp_path, BASELINE)
+
+    assert set(result) == expect
+    for path in result.values():
+        assert Path(path).parent == get_repo_cache_dir(tmp_path) / "linters/baseline"
+
+
+def test_make_linter_env_cache_role(tmp_path):
+    """Stable linter cache directories are used only when a role is given."""
+    with patch.dict(os.environ, {}):
+        os.environ.pop("MYPY_CACHE_DIR", None)
+
+        with_role = make_linter_env(tmp_path, "0123456789", REV2)
+        without_role = make_linter_env(tmp_path, "WORKTREE")
+
+    assert with_role["MYPY_CACHE_DIR"].endswith(str(Path("linters", "rev2", "mypy")))
+    assert "MYPY_CACHE_DIR" not in without_role
+    assert with_role["GRAYLINT_REV_COMMIT"] == "0123456"
+
+
+def test_stable_worktree_reused(git_repo):
+    """The same worktree is updated in place, keeping unchanged files untouched."""
+    git_repo.add({"a.py": "a\n", "b.py": "b1\n"}, commit="Initial commit")
+    first = git_repo.get_hash()
+    git_repo.add({"b.py": "b2\n"}, commit="Change b.py")
+    with stable_worktree(git_repo.root, first, BASELINE) as path:
+        (path / "untracked.txt").touch()
+        a_mtime = (path / "a.py").stat().st_mtime_ns
+
+    with stable_worktree(git_repo.root, "HEAD", BASELINE) as second_path:
+        b_content = (second_path / "b.py").read_text()
+
+    assert second_path == path
+    assert b_content == "b2\n"
+    assert (path / "a.py").stat().st_mtime_ns == a_mtime
+    assert not (path / "untracked.txt").exists()
+    assert path.parent.parent == get_repo_cache_dir(git_repo.root) / "trees"
+
+
+def test_stable_worktree_recreated(git_repo):
+    """A stable worktree which was removed is created again."""
+    git_repo.add({"a.py": "a\n"}, commit="Initial commit")
+    with stable_worktree(git_repo.root, "HEAD", BASELINE) as path:
+        pass
+    git_check_output_lines(["worktree", "remove", "--force", str(path)], git_repo.root)
+
+    with stable_worktree(git_repo.root, "HEAD", BASELINE) as second_path:
+        content = (second_path / "a.py").read_text()
+
+    assert second_path == path
+    assert content == "a\n"
+
+
+def test_stable_worktree_in_use(git_repo):
+    """A temporary worktree is used if the stable one for the role is in use."""
+    git_repo.add({"a.py": "a\n"}, commit="Initial commit")
+
+    with (
+        stable_worktree(git_repo.root, "HEAD", BASELINE) as path,
+        stable_worktree(git_repo.root, "HEAD", BASELINE) as other_path,
+        stable_worktree(git_repo.root, "HEAD", REV2) as rev2_path,
+    ):
+        other_content = (other_path / "a.py").read_text()
+
+    assert other_path != path
+    assert rev2_path.parent.name == REV2
+    assert other_content == "a\n"
+    assert not other_path.exists()
+    assert path.exists()
+
+
+@pytest.mark.parametrize("value", ["0", "1"])
+def test_stable_worktree_temporary_requested(git_repo, monkeypatch, value):
+    """``GRAYLINT_TEMPORARY_WORKTREES=1`` leaves no worktree in the repository."""
+    git_repo.add({"a.py": "a\n"}, commit="Initial commit")
+    monkeypatch.setenv("GRAYLINT_TEMPORARY_WORKTREES", value)
+
+    with stable_worktree(git_repo.root, "HEAD", BASELINE) as path:
+        content = (path / "a.py").read_text()
+
+    worktrees = git_check_output_lines(["worktree", "list"], git_repo.root)
+    assert content == "a\n"
+    assert is_stable_worktree(git_repo.root, path) == (value == "0")
+    assert len(worktrees) == (1 if value == "1" else 2)
+
+
+def test_temporary_worktree_own_linter_caches(git_repo):
+    """Linters don't use the stable cache directories in a temporary worktree."""
+    git_repo.add({"a.py": "a\n"}, commit="Initial commit")
+    envs = []
+
+    def get_messages(
+        _cmdlines: object,
+        root: Path,
+        _paths: object,
+        env: dict[str, str],
+        *_args: object,
+        **_kwargs: object,
+    ) -> dict[object, object]:
+        envs.append((is_stable_worktree(git_repo.root, root), env.get("PYLINTHOME")))
+        return {}
+
+    with (
+        patch.dict(os.environ, {}),
+        patch.object(linting, "_get_messages_from_linters", side_effect=get_messages),
+    ):
+        os.environ.pop("PYLINTHOME", None)
+        with stable_worktree(git_repo.root, "HEAD", BASELINE):
+            linting._get_messages_from_linters_for_baseline(
+                [["pylint"]], git_repo.root, {Path("a.py")}, "HEAD"
+            )
+        linting._get_messages_from_linters_for_baseline(
+            [["pylint"]], git_repo.root, {Path("a.py")}, "HEAD"
+        )
+
+    assert envs == [
+        (False, None),
+        (True, str(get_repo_cache_dir(git_repo.root) / "linters/baseline/pylint")),
+    ]
@@ -0,0 +1,395 @@
+"""Lint the most relevant files first, and stop when a time budget runs out.
+
+With ``--time-budget``, Graylint gives a partial answer quickly instead of waiting for
+a full lint of a big set of files:
+
+- Per-file linters are run first, and only on files changed since the baseline, or on
+  all files if a linter configuration file has changed. Files with the most modified
+  lines are linted first, in batches which grow from one file per core. New messages
+  are written out after each batch.
+- Linters which check code across files are run next on all files, with the remaining
+  time as their timeout.
+- When the budget runs out, the running linters are stopped, and files and linters
+  which weren't checked are reported. Graylint then exits with
+  `EXIT_CODE_TIME_BUDGET_EXPIRED`, unless new messages were found in the files which
+  were checked, which makes it exit with status 1 as usual.
+
+Every linter gets a timeout at the deadline, so linters are always run as subprocesses
+which can be stopped, and in-process linter adapters aren't used.
+
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from contextlib import ExitStack
+from functools import partial
+from pathlib import Path
+from typing import TYPE_CHECKING, TypeVar
+
+from darkgraylib.git import (
+    WORKTREE,
+    git_check_output_lines,
+    git_get_root,
+    git_rev_parse,
+)
+from graylint.cpu_budget import get_cpu_budget
+from graylint.limits import LinterLimitError, LinterLimits, get_linter_limits
+from graylint.linting import (
+    _create_line_mapping,
+    _get_messages_from_linters,
+    _select_paths,
+    get_changed_paths,
+    lint_baseline_in_background,
+    make_linter_env,
+    normalize_whitespace,
+    output_new_linter_messages,
+)
+from graylint.output.plugin_helpers import create_output_plugins
+from graylint.profiles import get_linter_profile
+from graylint.workdirs import BASELINE, REV2, is_stable_worktree, stable_worktree
+
+if TYPE_CHECKING:
+    from collections.abc import Collection, Mapping, Sequence
+
+    from darkgraylib.git import RevisionRange
+    from graylint.command_line import OutputSpec
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Exit code when the time budget ran out before all files were linted
+EXIT_CODE_TIME_BUDGET_EXPIRED = 5
+
+
+class TimeBudget:
+    """A deadline for the whole Graylint run."""
+
+    def __init__(self, seconds: float) -> None:
+        """Start counting down the time budget.
+
+        :param seconds: The time budget in seconds
+
+        """
+        self.seconds = seconds
+        self.deadline = time.monotonic() + seconds
+
+    def remaining(self) -> float:
+        """Return the time left in the budget.
+
+        :return: Seconds until the deadline, or zero if it has passed
+
+        """
+        return max(0.0, self.deadline - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        """``True`` if the deadline has passed."""
+        return self.remaining() == 0.0
+
+    def stopped(
+        self,
+        error: LinterLimitError,
+        linter_limits: Mapping[str, LinterLimits] | None,
+    ) -> bool:
+        """Check whether a linter was stopped at the deadline of the budget.
+
+        :param error: The error raised for the linter which exceeded its limits
+        :param linter_limits: Time and resource limits by linter name, as given by the
+                              user
+        :return: ``True`` if the linter timed out at the deadline, or ``False`` if it
+                 exceeded a limit of its own
+
+        """
+        if error.timeout is None:
+            return False
+        own_timeout = get_linter_limits(linter_limits or {}, error.linter).timeout
+        return own_timeout is None or own_timeout > error.timeout
+
+    def limit(
+        self,
+        linter_limits: Mapping[str, LinterLimits] | None,
+        linter_cmdlines: list[list[str]],
+    ) -> dict[str, LinterLimits]:
+        """Add a timeout at the deadline to the limits of the given linters.
+
+        :param linter_limits: Time and resource limits by linter name
+        :param linter_cmdlines: The command lines of linters to set a timeout for
+        :return: Limits by linter name, with a timeout no later than the deadline
+
+        """
+        remaining = self.remaining()
+        result = {}
+        for cmdline in linter_cmdlines:
+            limits = get_linter_limits(linter_limits or {}, cmdline[0])
+            timeout = min(remaining, limits.timeout or remaining)
+            result[cmdline[0]] = limits.override(LinterLimits(timeout=timeout))
+        return result
+
+
+def count_modified_lines(
+    root: Path, revrange: RevisionRange, paths: Collection[Path]
+) -> dict[Path, int]:
+    """Count added and deleted lines in each changed file.
+
+    :param root: The root of the Git repository
+    :param revrange: The revisions to compare
+    :param paths: The files to count modified lines in, relative to ``root``
+    :return: The number of modified lines in each changed file. Untracked files count
+             all their lines as modified.
+
+    """
+    if not paths:
+        return {}
+    revisions = [revrange.rev1]
+    if revrange.rev2 != WORKTREE:
+        revisions.append(revrange.rev2)
+    result = {}
+    for line in git_check_output_lines(
+        ["diff", "--numstat", "--no-renames", *revisions, "--", *map(str, paths)], root
+    ):
+        # <added> TAB <deleted> TAB <path>, with ``-`` for binary files
+        added, deleted, path_str = line.split("\t", 2)
+        result[Path(path_str)] = int(added.replace("-", "0")) + int(
+            deleted.replace("-", "0")
+        )
+    for path in get_changed_paths(root, revrange, paths) - result.keys():
+        if (root / path).is_file():
+            result[path] = len((root / path).read_bytes().splitlines())
+    return result
+
+
+def prioritize_paths(
+    root: Path, revrange: RevisionRange, paths: Collection[Path]
+) -> list[Path]:
+    """Order files to lint by relevance, most modified lines first.
+
+    :param root: The root of the Git repository
+    :param revrange: The revisions to compare
+    :param paths: The files to lint, relative to ``root``
+    :return: Changed files with most modified lines first, then unchanged files
+
+    """
+    modified = count_modified_lines(root, revrange, paths)
+    return sorted(paths, key=lambda path: (-modified.get(path, 0), path))
+
+
+def _make_batches(paths: list[T], first_size: int) -> list[list[T]]:
+    """Split files into batches which double in size, to get first results quickly.
+
+    >>> _make_batches(["a", "b", "c", "d", "e", "f", "g", "h"], 2)
+    [['a', 'b'], ['c', 'd', 'e', 'f'], ['g', 'h']]
+
+    :param paths: The files to split
+    :param first_size: The number of files in the first batch
+    :return: Batches of files
+
+    """
+    batches = []
+    size = first_size
+    while paths:
+        batches.append(paths[:size])
+        paths = paths[size:]
+        size *= 2
+    return batches
+
+
+def _report_unchecked(
+    unchecked: Mapping[str, Collection[Path]], seconds: float
+) -> None:
+    """Log the files each linter didn't check before the time budget ran out.
+
+    :param unchecked: Files not checked, by the name of the linter
+    :param seconds: The time budget in seconds
+
+    """
+    logger.warning(
+        "Time budget of %s seconds ran out before %s files were linted",
+        seconds,
+        len({path for paths in unchecked.values() for path in paths}),
+    )
+    for linter, paths in unchecked.items():
+        logger.warning(
+            "Not checked by %s: %s", linter, ", ".join(str(path) for path in paths)
+        )
+
+
+class _BudgetedRun:  # pylint: disable=too-few-public-methods
+    """Lint batches of files in both revisions and write out new messages."""
+
+    def __init__(
+        self,
+        stack: ExitStack,
+        git_root: Path,
+        revrange: RevisionRange,
+        output_spec: Sequence[OutputSpec],
+        budget: TimeBudget,
+    ) -> None:
+        """Check out the revisions and open the outputs for the duration of the run.
+
+        Nothing is checked out if the time budget has already run out.
+
+        :param stack: The exit stack to close worktrees and outputs with
+        :param git_root: The root of the Git repository
+        :param revrange: The Git revisions to compare
+        :param output_spec: The output formats and destinations for linter messages
+        :param budget: The time budget of the run
+
+        """
+        self.git_root = git_root
+        self.revrange = revrange
+        self.budget = budget
+        self.error_count = 0
+        self.outputs = stack.enter_context(create_output_plugins(output_spec))
+        self.roots: list[Path] = []
+        self.envs: list[dict[str, str]] = []
+        if budget.expired:
+            # Don't spend time on checking out revisions which won't be linted
+            return
+        self._check_out(stack, revrange.rev1, BASELINE)
+        if revrange.rev2 == WORKTREE:
+            self.roots.append(git_root)
+            self.envs.append(make_linter_env(git_root, WORKTREE))
+        else:
+            self._check_out(stack, revrange.rev2, REV2)
+
+    def _check_out(self, stack: ExitStack, revision: str, role: str) -> None:
+        """Check out a revision in a worktree for the duration of the run.
+
+        :param stack: The exit stack to close the worktree with
+        :param revision: The revision to check out
+        :param role: The revision role, ``baseline`` or ``rev2``
+
+        """
+        tree = stack.enter_context(stable_worktree(self.git_root, revision, role))
+        stable = is_stable_worktree(self.git_root, tree)
+        self.roots.append(tree)
+        self.envs.append(
+            make_linter_env(
+                self.git_root,
+                git_rev_parse(revision, self.git_root),
+                role if stable else None,
+            )
+        )
+
+    def lint(
+        self,
+        linter_cmdlines: list[list[str]],
+        paths: tuple[Collection[Path], Collection[Path]],
+        linter_limits: Mapping[str, LinterLimits] | None,
+    ) -> bool:
+        """Lint files in both revisions and write out new messages.
+
+        :param linter_cmdlines: The command lines for the linters to run
+        :param paths: Files to lint in the baseline and ``rev2``
+        :param linter_limits: Time and resource limits by linter name
+        :raises LinterLimitError: if a linter exceeded a limit other than the budget
+        :return: ``False`` if the time budget ran out before linting finished
+
+        """
+        if self.budget.expired:
+            return False
+        limits = self.budget.limit(linter_limits, linter_cmdlines)
+        try:
+            baseline, messages = lint_baseline_in_background(
+                # New files in a batch have no baseline to lint
+                partial(
+                    _get_messages_from_linters,
+                    linter_cmdlines,
+                    self.roots[0],
+                    paths[0],
+                    self.envs[0],
+                    normalize_whitespace,
+                    linter_limits=limits,
+                )
+                if paths[0]
+                else dict,
+                partial(
+                    _get_messages_from_linters,
+                    linter_cmdlines,
+                    self.roots[1],
+                    paths[1],
+                    self.envs[1],
+                    linter_limits=limits,
+                ),
+            )
+        except LinterLimitError as exc:
+            if not self.budget.stopped(exc, linter_limits):
+                raise
+            return False
+        files_with_messages = {location.path for location in messages}
+        self.error_count += output_new_linter_messages(
+            self.outputs,
+            baseline,
+            messages,
+            _create_line_mapping(self.git_root, files_with_messages, self.revrange),
+        )
+        return True
+
+
+def run_linters_within_time_budget(  # noqa: PLR0913
+    linter_cmdlines: list[list[str]],
+    root: Path,
+    paths: set[Path],
+    revrange: RevisionRange,
+    output_spec: Sequence[OutputSpec],
+    *,
+    time_budget: float,
+    linter_limits: Mapping[str, LinterLimits] | None = None,
+) -> tuple[int, dict[str, list[Path]]]:
+    """Lint the most relevant files first, and stop when the time budget runs out.
+
+    :param linter_cmdlines: The command lines for linter tools to run on the files
+    :param root: The root of the relative paths
+    :param paths: The files and directories to check, relative to ``root``
+    :param revrange: The Git revisions to compare
+    :param output_spec: The output formats and destinations for linter messages
+    :param time_budget: The time budget for the whole run in seconds
+    :param linter_limits: Time and resource limits by linter name
+    :raises ValueError: if ``root`` isn't in a Git repository
+    :return: The number of new linter messages, and the files not checked by each
+             linter because the time budget ran out
+
+    """
+    # pylint: disable=too-many-arguments,too-many-locals
+    budget = TimeBudget(time_budget)
+    git_root = git_get_root(root)
+    if not git_root:
+        message = f"--time-budget requires a Git repository, {root} isn't one"
+        raise ValueError(message)
+    git_paths = {(root / path).relative_to(git_root) for path in paths}
+    per_file = [cmd for cmd in linter_cmdlines if get_linter_profile(cmd).per_file]
+    unchecked: dict[str, list[Path]] = {}
+    with ExitStack() as stack:
+        run = _BudgetedRun(stack, git_root, revrange, output_spec, budget)
+        if per_file:
+            # Per-file linters only need to lint changed files, most modified first
+            rev2_paths, baseline_paths = _select_paths(
+                per_file,
+                git_root,
+                git_paths,
+                revrange,
+                import_depth=0,
+                expand_directories=True,
+            )
+            batches = _make_batches(
+                prioritize_paths(git_root, revrange, rev2_paths),
+                get_cpu_budget().cpus,
+            )
+            for index, batch in enumerate(batches):
+                if not run.lint(
+                    per_file, (baseline_paths & set(batch), batch), linter_limits
+                ):
+                    rest = sorted(path for later in batches[index:] for path in later)
+                    unchecked.update((cmdline[0], rest) for cmdline in per_file)
+                    break
+        for cmdline in linter_cmdlines:
+            if cmdline not in per_file and not run.lint(
+                [cmdline], (git_paths, git_paths), linter_limits
+            ):
+                unchecked[cmdline[0]] = sorted(git_paths)
+    if unchecked:
+        _report_unchecked(unchecked, time_budget)
+    return run.error_count, unchecked
@@ -0,0 +1,200 @@
+"""Stable working directories for linting revisions, so linter caches stay warm.
+
+Linters like Mypy, Ruff and Pylint keep caches keyed by the paths and modification
+times of checked files. If a revision were checked out into a new temporary directory on
+every run, the caches would never be hit, and the baseline would always be linted from
+scratch.
+
+Instead, each revision role (``baseline`` for ``rev1``, ``rev2`` for a committed
+``rev2``) gets a persistent Git worktree under the Graylint cache directory, separately
+for each repository. On later runs, the worktree is switched to the requested revision
+with ``git checkout``, which rewrites only files which differ, and linters are pointed
+to persistent cache directories for the same repository and role using environment
+variables like ``MYPY_CACHE_DIR``. Repeated baseline runs are then incremental.
+
+If the stable worktree for a role is in use by another Graylint process, or by another
+baseline in the same process, a temporary worktree is used as before. Linters then use
+their default cache directories inside the temporary worktree, since e.g. Mypy doesn't
+support concurrent runs sharing a cache directory.
+
+Stable worktrees are registered in the repository, so they show up in ``git worktree
+list``. Setting the ``GRAYLINT_TEMPORARY_WORKTREES`` environment variable to ``1``
+makes Graylint always use temporary worktrees instead.
+
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import shutil
+from contextlib import ExitStack, contextmanager
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import TYPE_CHECKING
+
+from darkgraylib.git import git_check_output_lines, git_clone_local, git_rev_parse
+from graylint.cache_storage.local import get_cache_dir, lock_file
+from graylint.profiles import get_cache_env_vars
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+logger = logging.getLogger(__name__)
+
+BASELINE = "baseline"
+REV2 = "rev2"
+
+TEMPORARY_WORKTREES_ENV = "GRAYLINT_TEMPORARY_WORKTREES"
+
+
+def get_repo_cache_dir(root: Path) -> Path:
+    """Return the cache directory for worktrees and linter caches of a repository.
+
+    :param root: The root of the Git repository
+    :return: A directory in the Graylint cache directory, named by a hash of ``root``
+
+    """
+    repo_hash = hashlib.sha256(str(root.resolve()).encode("utf-8")).hexdigest()
+    return get_cache_dir() / "repos" / repo_hash[:16]
+
+
+def get_linter_cache_env(root: Path, role: str) -> dict[str, str]:
+    """Return environment variables pointing linters to stable cache directories.
+
+    Cache directories already chosen by the user in the environment are left alone.
+
+    :param root: The root of the Git repository
+    :param role: The revision role, ``baseline`` or ``rev2``
+    :return: Linter cache directory environment variables
+
+    """
+    cache_dir = get_repo_cache_dir(root) / "linters" / role
+    return {
+        variable: str(cache_dir / linter)
+        for variable, linter in get_cache_env_vars().items()
+        if variable not in os.environ
+    }
+
+
+def _get_stable_worktree_path(root: Path, role: str) -> Path:
+    """Return the path of the stable worktree of a revision role.
+
+    :param root: The root of the Git repository
+    :param role: The revision role, ``baseline`` or ``rev2``
+    :return: The path of the worktree in the cache directory of the repository
+
+    """
+    return get_repo_cache_dir(root) / "trees" / role / root.name
+
+
+def is_stable_worktree(root: Path, path: Path) -> bool:
+    """Return ``True`` if a directory is one of the stable worktrees of a repository.
+
+    Temporary worktrees used when a stable worktree is in use are not stable, and must
+    not share the linter caches or daemons of the stable worktrees.
+
+    :param root: The root of the Git repository
+    :param path: The directory to check
+    :return: ``True`` if ``path`` is the stable worktree of a revision role
+
+    """
+    return any(
+        path == _get_stable_worktree_path(root, role) for role in (BASELINE, REV2)
+    )
+
+
+def _is_worktree_of(path: Path, root: Path) -> bool:
+    """Return ``True`` if a directory is a registered worktree of a Git repository.
+
+    :param path: The directory to check
+    :param root: The root of the Git repository
+    :return: ``True`` if ``path`` exists and is listed by ``git worktree list``
+
+    """
+    if not (path / ".git").is_file():
+        return False
+    lines = git_check_output_lines(
+        ["worktree", "list", "--porcelain"], root, exit_on_error=False
+    )
+    return f"worktree {path.resolve().as_posix()}" in lines
+
+
+def _update_worktree(root: Path, revision: str, path: Path) -> None:
+    """Check out a revision in a stable worktree, creating the worktree if needed.
+
+    :param root: The root of the Git repository
+    :param revision: The revision to check out
+    :param path: The path of the stable worktree
+
+    """
+    if _is_worktree_of(path, root):
+        logger.debug("Checking out %s in the stable worktree %s", revision, path)
+        # Revisions like ``HEAD`` must refer to the original repository's worktree
+        commit = git_rev_parse(revision, root)
+        git_check_output_lines(
+            ["checkout", "--quiet", "--force", "--detach", commit],
+            path,
+            exit_on_error=False,
+        )
+        git_check_output_lines(["clean", "-ffdxq"], path, exit_on_error=False)
+        return
+    logger.debug("Creating the stable worktree %s for %s", path, revision)
+    if path.exists():
+        shutil.rmtree(path)
+    git_check_output_lines(["worktree", "prune"], root, exit_on_error=False)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    git_check_output_lines(
+        ["worktree", "add", "--quiet", "--force", "--detach", str(path), revision],
+        root,
+        exit_on_error=False,
+    )
+
+
+@contextmanager
+def stable_worktree(root: Path, revision: str, role: str) -> Iterator[Path]:
+    """Check out a revision in a worktree which persists across Graylint runs.
+
+    :param root: The root of the Git repository
+    :param revision: The revision to check out
+    :param role: The revision role, ``baseline`` or ``rev2``
+    :return: A context manager which yields the root of the worktree
+
+    """
+    with ExitStack() as stack:
+        if _lock_stable_worktree(stack, root, role):
+            path = _get_stable_worktree_path(root, role)
+            _update_worktree(root, revision, path)
+            yield path
+        else:
+            tmpdir = stack.enter_context(TemporaryDirectory())
+            tmp_path = Path(tmpdir) / "revision" / root.name
+            yield stack.enter_context(git_clone_local(root, revision, tmp_path))
+
+
+def _lock_stable_worktree(stack: ExitStack, root: Path, role: str) -> bool:
+    """Try to reserve the stable worktree of a revision role for this process.
+
+    :param stack: The exit stack to release the lock with
+    :param root: The root of the Git repository
+    :param role: The revision role, ``baseline`` or ``rev2``
+    :return: ``True`` if the stable worktree can be used, or ``False`` if it's in use
+             or temporary worktrees were requested with ``GRAYLINT_TEMPORARY_WORKTREES``
+
+    """
+    if os.environ.get(TEMPORARY_WORKTREES_ENV, "0") != "0":
+        logger.debug(
+            "%s is set, using a temporary %s worktree", TEMPORARY_WORKTREES_ENV, role
+        )
+        return False
+    trees_dir = get_repo_cache_dir(root) / "trees"
+    trees_dir.mkdir(parents=True, exist_ok=True)
+    try:
+        stack.enter_context(
+            lock_file(trees_dir / f"{role}.lock", exclusive=True, blocking=False)
+        )
+    except OSError:
+        logger.debug("The stable %s worktree is in use, using a temporary one", role)
+        return False
+    return True